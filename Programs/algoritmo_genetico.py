@@ -1,6 +1,23 @@
 import numpy as np
 import pandas as pd
+import copy
+import heapq
+import json
+import math
+import os
 import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+from multiprocessing.managers import BaseManager
+
+from ingesta import leer_materias
+
+# Códigos enteros de las celdas especiales en las tablas codificadas
+VACIO = -1
+EXCESO = -2
+CAMBIO = -3
 
 def crear_tabla_vacia():
     """
@@ -12,12 +29,12 @@ def crear_tabla_vacia():
     - tabla_vacia (list): Una lista de listas que representa la tabla vacía.
     """
     # Lista de días de la semana
-    dias_semana = ["Lunes" "Martes" "Miércoles", "Jueves", "Viernes"]
+    dias_semana = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
 
     # Lista de horas del día
     horas_dia = [
         "07:00-08:00", "08:00-09:00", "09:00-10:00", "10:00-11:00", "11:00-12:00",
-        "12:00-13:00", "13:00-14:00" "14:00-15:00" "15:00-16:00", "16:00-17:00", "17:00-18:00"]
+        "12:00-13:00", "13:00-14:00", "14:00-15:00", "15:00-16:00", "16:00-17:00", "17:00-18:00"]
 
     # Crear una lista de listas con todas las celdas llenas de "VACIO"
     tabla_vacia = [["VACIO" for _ in range(len(dias_semana))] for _ in range(len(horas_dia))]
@@ -32,66 +49,92 @@ def crear_tabla_vacia():
     return tabla_vacia
 
 
+def etiquetar_columna(columna, vacio="VACIO", exceso="EXCESO", cambio="CAMBIO"):
+    """
+    Etiqueta las celdas de una columna (un día) según las reglas de 'etiquetar_cambios'.
+
+    Una clave con 3 o más repeticiones en la columna se etiqueta como exceso. Después, si ninguna repetición de una
+    clave está en la fila siguiente de la anterior, se conserva la primera y las demás se etiquetan como cambio. Las
+    etiquetas se aplican en el mismo orden que en 'etiquetar_cambios', por lo que el resultado es idéntico.
+
+    Args:
+    - columna (list): Los valores de la columna. Se modifica en el lugar.
+    - vacio: El valor que representa una celda vacía.
+    - exceso: El valor con el que se etiquetan los excesos.
+    - cambio: El valor con el que se etiquetan los cambios.
+
+    Returns:
+    - columna (list): La misma columna con las celdas etiquetadas.
+    """
+    celdas_unicas = {}  # Diccionario para almacenar celdas únicas y sus ubicaciones
+    for i, celda in enumerate(columna):
+        if celda != vacio:
+            if celda not in celdas_unicas:
+                celdas_unicas[celda] = [i]
+            else:
+                celdas_unicas[celda].append(i)
+
+    # Etiquetar como exceso si hay 3 o más repeticiones de una clave en la misma columna
+    for indices in celdas_unicas.values():
+        if len(indices) >= 3:
+            for i in indices:
+                columna[i] = exceso
+
+    # Mantener una y cambiar las demás solo si ninguna se repite en la fila siguiente
+    for indices in celdas_unicas.values():
+        if len(indices) > 1:
+            repeticion_en_fila_siguiente = False
+            for k in range(1, len(indices)):
+                if columna[indices[k]] == columna[indices[k - 1] + 1]:
+                    repeticion_en_fila_siguiente = True
+                    break
+
+            if not repeticion_en_fila_siguiente:
+                for i in indices[1:]:
+                    columna[i] = cambio
+
+    return columna
+
+
 def etiquetar_cambios(tabla):
     """
     Etiqueta las celdas de una tabla según ciertas condiciones.
 
+    Cada columna (excepto la primera) se etiqueta con 'etiquetar_columna': "EXCESO" para claves con 3 o más horas en
+    el día y "CAMBIO" para las horas repetidas que no están seguidas.
+
     Args:
     - tabla (list): Una lista de listas que representa la tabla.
 
     Returns:
     - tabla_modificada (list): Una nueva lista de listas que representa la tabla con celdas etiquetadas.
     """
+    # Trabajamos por columnas sobre listas, sin crear un DataFrame
+    columnas = [list(columna) for columna in zip(*tabla)]
+    for columna in columnas[1:]:
+        etiquetar_columna(columna)
+
+    # Convertir las columnas modificadas de nuevo a una tabla (lista de listas)
+    tabla_modificada = [list(fila) for fila in zip(*columnas)]
 
-    valores_repetidos = []  # Almacenar valores repetidos que ya se han etiquetado
+    return tabla_modificada
 
-    # Crear un DataFrame a partir de la tabla
-    df = pd.DataFrame(tabla)
 
-    # Recorrer cada columna del DataFrame (excepto la primera)
-    for col in df.columns[1:]:
-        celdas_columna = df[col]
-        celdas_unicas = {}  # Diccionario para almacenar celdas únicas y sus ubicaciones
+def etiquetar_codigos(codigos):
+    """
+    Etiqueta una tabla codificada con las mismas reglas que 'etiquetar_cambios'.
 
-        # Recorrer las celdas de la columna
-        for i, celda in enumerate(celdas_columna):
-            if celda != "VACIO":
-                if celda not in celdas_unicas:
-                    celdas_unicas[celda] = [i]
-                else:
-                    celdas_unicas[celda].append(i)
-
-        # Etiquetar como "EXCESO" si hay 3 o más repeticiones de una clave en la misma columna
-        for celda, indices in celdas_unicas.items():
-            if len(indices) >= 3:
-                for i in indices:
-                    df.at[i, col] = "EXCESO"
-
-        # Etiquetar celdas con múltiples repeticiones como "CAMBIO"
-        for celda, indices in celdas_unicas.items():
-            if len(indices) > 1:
-                # Verificar si la celda se repite en la fila siguiente
-                repeticion_en_fila_siguiente = False
-                for i in range(1, len(indices)):
-                    fila_idx = indices[i]
-                    fila_anterior_idx = indices[i - 1]
-                    if df.at[fila_idx, col] == df.at[fila_anterior_idx + 1, col]:
-                        repeticion_en_fila_siguiente = True
-                        break
-
-                # Mantener una y cambiar las demás a "CAMBIO" solo si no se repite en la fila siguiente
-                if not repeticion_en_fila_siguiente:
-                    for i in range(1, len(indices)):
-                        fila_idx = indices[i]
-                        fila_anterior_idx = indices[i - 1]
-                        if celda not in valores_repetidos:
-                            valores_repetidos.append(celda)
-                        df.at[fila_idx, col] = "CAMBIO"
-
-    # Convertir el DataFrame modificado de nuevo a una tabla (lista de listas)
-    tabla_modificada = df.values.tolist()
+    Args:
+    - codigos (ndarray): Arreglo de enteros de forma (horas, días), con VACIO en las celdas libres.
+
+    Returns:
+    - etiquetas (ndarray): Una copia del arreglo donde las celdas etiquetadas valen EXCESO o CAMBIO.
+    """
+    columnas = codigos.T.tolist()
+    for columna in columnas:
+        etiquetar_columna(columna, VACIO, EXCESO, CAMBIO)
+    return np.array(columnas, dtype=codigos.dtype).T
 
-    return tabla_modificada
 
 def duplicados(df):
     """
@@ -115,16 +158,20 @@ def duplicados(df):
         # Si no se encontraron duplicados, devolver el DataFrame original sin cambios
         return df
     
-def calcular_aptitud(tabla):
+def calcular_aptitud(tabla, cache=None):
     """
     Calcula la aptitud de una tabla considerando la cantidad de espacios llenos y vacíos, teniendo en cuenta las etiquetas "CAMBIO" y "EXCESO".
 
     Args:
     - tabla (list): Una lista de listas que representa la tabla a evaluar.
+    - cache (CacheAptitud): Si se da, los días ya etiquetados se toman de la caché (ver 'CacheAptitud.aptitud_tabla').
 
     Returns:
     - aptitud (int): El valor de aptitud calculado para la tabla.
     """
+    if cache is not None:
+        return cache.aptitud_tabla(tabla)
+
     # Inicializamos un contador de espacios llenos y espacios vacíos
     tabla = etiquetar_cambios(tabla)
     espacios_llenos = 0
@@ -144,99 +191,2215 @@ def calcular_aptitud(tabla):
         return espacios_llenos  # Si no hay celdas de "CAMBIO" ni "EXCESO", aptitud es el número de espacios llenos
 
 
-def crear_tabla_aleatoria(tabla_vacia, claves, claves_disponibles, horas_por_clave):
+def crear_generador(semilla=None):
+    """
+    Crea el generador aleatorio de numpy que usan las funciones de este módulo.
+
+    Args:
+    - semilla (int, SeedSequence o Generator): Semilla del generador. Un Generator se regresa sin cambios, para que
+      todas las funciones de una misma corrida compartan el mismo flujo. Si es None, cada generador es distinto.
+
+    Returns:
+    - generador (Generator): El generador aleatorio.
+    """
+    return np.random.default_rng(semilla)
+
+
+def derivar_semillas(semilla, cantidad):
+    """
+    Deriva semillas independientes a partir de una semilla, para procesos que se ejecutan en paralelo.
+
+    Las semillas se derivan con 'SeedSequence.spawn', por lo que los flujos aleatorios que generan no se traslapan y
+    dependen solo de 'semilla', no del número de procesos ni del orden en que terminan.
+
+    Args:
+    - semilla (int, SeedSequence o Generator): La semilla de la que se derivan. Si es None, cada ejecución es distinta.
+    - cantidad (int): Cantidad de semillas a derivar.
+
+    Returns:
+    - semillas (list): Lista de 'cantidad' objetos SeedSequence.
+    """
+    if isinstance(semilla, np.random.Generator):
+        semilla = semilla.bit_generator.seed_seq
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    return semilla.spawn(cantidad)
+
+
+def crear_tabla_aleatoria(tabla_vacia, claves, claves_disponibles, horas_por_clave, generador=None):
     """
     Crea una tabla aleatoria a partir de una tabla vacía, claves disponibles y horas asignadas por clave.
 
+    Las claves se colocan con 'construir_tabla_factible', que solo pone una clave donde no se generan celdas
+    "EXCESO" ni "CAMBIO", en lugar de llenar las celdas en orden con claves al azar.
+
     Args:
     - tabla_vacia (list): Una lista de listas que representa la tabla vacía.
     - claves (list): Una lista de todas las claves de las clases posibles.
     - claves_disponibles (list): Una lista de claves disponibles para insertar en la tabla.
     - horas_por_clave (dict): Un diccionario que mapea claves a la cantidad de horas asignadas.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
 
     Returns:
     - tabla (list): Una tabla aleatoria creada a partir de la tabla vacía y las claves disponibles.
     """
-    # Creamos una copia de la tabla vacía
-    tabla = [fila[:] for fila in tabla_vacia]
-    #Creamos un diccionario para llevar un registro de cuántas veces se ha insertado la clase
-    clave_count = {clave: 0 for clave in claves}
+    codificacion = Codificacion(tabla_vacia, claves, claves_disponibles, horas_por_clave)
+    return codificacion.decodificar(construir_tabla_factible(codificacion, generador))
+
+
+def tabla_a_dataframe(tabla):
+    """
+    Convierte una tabla (lista de listas) en un DataFrame usando la primera fila como encabezados.
+
+    Args:
+    - tabla (list): Una lista de listas que representa la tabla, con los días de la semana en la primera fila.
+
+    Returns:
+    - df (DataFrame): Un DataFrame con las horas del día en la primera columna y una columna por día.
+    """
+    df = pd.DataFrame(tabla[1:], columns=tabla[0])
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+class Codificacion:
+    def __init__(self, tabla_vacia, claves, claves_disponibles, horas_por_clave):
+        """
+        Constructor de la clase Codificacion.
+
+        Asigna a cada clave un entero pequeño para que una tabla se represente como un arreglo de enteros de forma
+        (horas, días), sin encabezados, y una población completa como un solo arreglo (población, horas, días).
+        Las celdas vacías se representan con VACIO (-1).
+
+        Args:
+            tabla_vacia (list): Una lista de listas que representa la tabla vacía.
+            claves (list): Una lista de todas las claves de las clases posibles.
+            claves_disponibles (list): Una lista de claves disponibles para insertar en la tabla.
+            horas_por_clave (dict): Un diccionario que mapea claves a la cantidad de horas asignadas.
+        """
+        self.tabla_vacia = tabla_vacia
+        self.claves = list(dict.fromkeys(list(claves) + list(claves_disponibles)))
+        self.indice = {clave: codigo for codigo, clave in enumerate(self.claves)}
+
+        # Solo las claves disponibles se insertan en la tabla
+        disponibles = set(claves_disponibles)
+        self.horas = np.array([int(horas_por_clave.get(clave, 0)) if clave in disponibles else 0
+                               for clave in self.claves], dtype=np.int64)
+
+        self.num_horas = len(tabla_vacia) - 1
+        self.num_dias = len(tabla_vacia[0]) - 1
+
+        # Encabezados y horas del día, que 'calcular_aptitud' también cuenta como espacios llenos
+        self.celdas_fijas = sum(1 for fila in tabla_vacia for celda in fila if celda != "VACIO")
+
+        # Aptitud de una tabla con todas las horas colocadas; cada clave cabe a lo más en dos horas por día
+        horas_colocables = int(np.minimum(self.horas, 2 * self.num_dias).sum())
+        self.aptitud_maxima = min(horas_colocables, self.num_horas * self.num_dias) + self.celdas_fijas
+
+    def codificar(self, tabla):
+        """
+        Convierte una tabla (lista de listas) en un arreglo de enteros de forma (horas, días).
+
+        Args:
+            tabla (list): Una lista de listas con encabezados, como la que regresa 'crear_tabla_aleatoria'.
+
+        Returns:
+            ndarray: El arreglo con el código de cada celda.
+        """
+        codigos = np.full((self.num_horas, self.num_dias), VACIO, dtype=np.int64)
+        for i, fila in enumerate(tabla[1:]):
+            for j, celda in enumerate(fila[1:]):
+                if celda != "VACIO":
+                    codigos[i, j] = self.indice[celda]
+        return codigos
+
+    def decodificar(self, codigos):
+        """
+        Convierte un arreglo de enteros de forma (horas, días) en una tabla (lista de listas) con encabezados.
+
+        Args:
+            codigos (ndarray): El arreglo con el código de cada celda.
+
+        Returns:
+            list: Una lista de listas con la misma forma que la tabla vacía.
+        """
+        tabla = [fila[:] for fila in self.tabla_vacia]
+        for i in range(self.num_horas):
+            for j in range(self.num_dias):
+                codigo = codigos[i, j]
+                tabla[i + 1][j + 1] = "VACIO" if codigo == VACIO else self.claves[codigo]
+        return tabla
+
+
+def contar_claves_por_dia(poblacion, num_claves):
+    """
+    Cuenta, para cada tabla de una población, cuántas veces aparece cada clave en cada día y cuántas veces aparece
+    en dos horas seguidas del mismo día.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - num_claves (int): Cantidad de claves de la codificación.
+
+    Returns:
+    - conteos (ndarray): Arreglo de forma (población, días, claves) con las horas de cada clave por día.
+    - pares (ndarray): Arreglo de forma (población, días, claves) con los pares de horas seguidas de cada clave.
+    """
+    num_tablas, _, num_dias = poblacion.shape
+    # Recorremos por días: (población, días, horas)
+    por_dia = poblacion.transpose(0, 2, 1)
+    base = (np.arange(num_tablas)[:, None, None] * num_dias + np.arange(num_dias)[None, :, None]) * num_claves
+    tam = num_tablas * num_dias * num_claves
+
+    ocupadas = por_dia != VACIO
+    conteos = np.bincount((base + por_dia)[ocupadas], minlength=tam)
+
+    # Una hora es "seguida" si la hora anterior del mismo día tiene la misma clave
+    seguidas = (por_dia[:, :, 1:] == por_dia[:, :, :-1]) & ocupadas[:, :, 1:]
+    pares = np.bincount((base + por_dia[:, :, 1:])[seguidas], minlength=tam)
+
+    forma = (num_tablas, num_dias, num_claves)
+    return conteos.reshape(forma), pares.reshape(forma)
+
+
+def componentes_aptitud(poblacion, codificacion):
+    """
+    Cuenta, para cada tabla de una población, lo que determina su aptitud con cualquiera de los pesos.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+
+    Returns:
+    - horas_colocadas (ndarray): Arreglo de forma (población,) con las celdas que no están vacías.
+    - celdas_exceso (ndarray): Las horas de las claves con 3 o más horas en un día.
+    - celdas_cambio (ndarray): Las claves con 2 horas no seguidas en un día.
+    """
+    conteos, pares = contar_claves_por_dia(poblacion, len(codificacion.claves))
+    celdas_exceso = np.where(conteos >= 3, conteos, 0).sum(axis=(1, 2))
+    celdas_cambio = ((conteos == 2) & (pares == 0)).sum(axis=(1, 2))
+    horas_colocadas = (poblacion != VACIO).sum(axis=(1, 2))
+    return horas_colocadas, celdas_exceso, celdas_cambio
+
+
+def calcular_aptitud_poblacion(poblacion, codificacion, cache=None):
+    """
+    Calcula la aptitud de todas las tablas de una población a la vez.
+
+    Aplica las mismas reglas que 'etiquetar_cambios' y da el mismo valor que 'calcular_aptitud': una clave con 3 o más
+    horas en un día es "EXCESO" y una clave con 2 horas no seguidas en un día es "CAMBIO". Si una tabla tiene alguna
+    de estas celdas su aptitud es cero; si no, es el número de espacios llenos (incluyendo los encabezados).
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - cache (CacheAptitud): Si se da, las tablas y columnas ya evaluadas se toman de la caché.
+
+    Returns:
+    - aptitudes (ndarray): Arreglo de forma (población,) con la aptitud de cada tabla.
+    """
+    if cache is not None:
+        horas_colocadas, celdas_exceso, celdas_cambio = cache.componentes(poblacion, codificacion)
+        return np.where((celdas_exceso > 0) | (celdas_cambio > 0), 0, horas_colocadas + codificacion.celdas_fijas)
+
+    conteos, pares = contar_claves_por_dia(poblacion, len(codificacion.claves))
+
+    exceso = (conteos >= 3).any(axis=(1, 2))
+    cambio = ((conteos == 2) & (pares == 0)).any(axis=(1, 2))
+    espacios_llenos = (poblacion != VACIO).sum(axis=(1, 2)) + codificacion.celdas_fijas
+
+    return np.where(exceso | cambio, 0, espacios_llenos)
+
+
+def contar_choques(poblacion, choques):
+    """
+    Cuenta los choques de cada tabla de una población con los horarios de otros semestres.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - choques (ndarray): Arreglo de forma (claves, horas, días) con los choques que produce cada clave en cada celda,
+      como el que regresa 'IndiceConflictos.matriz_choques'.
+
+    Returns:
+    - num_choques (ndarray): Arreglo de forma (población,) con los choques de cada tabla.
+    """
+    horas = np.arange(poblacion.shape[1])[:, None]
+    dias = np.arange(poblacion.shape[2])[None, :]
+    por_celda = choques[np.maximum(poblacion, 0), horas, dias]
+    return np.where(poblacion != VACIO, por_celda, 0).sum(axis=(1, 2))
+
+
+def calcular_aptitud_penalizada(poblacion, codificacion, peso_exceso=2, peso_cambio=2, choques=None,
+                                peso_choque=2, cache=None):
+    """
+    Calcula una aptitud graduada para todas las tablas de una población a la vez.
+
+    Las tablas sin celdas "EXCESO" ni "CAMBIO" tienen la misma aptitud que con 'calcular_aptitud_poblacion'. En lugar
+    de cero, las demás tienen el número de horas colocadas menos una penalización por cada celda "EXCESO" y por cada
+    celda "CAMBIO", de modo que una tabla casi factible vale más que una con muchos conflictos.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - peso_exceso (float): Penalización por cada celda "EXCESO" (horas de una clave con 3 o más horas en un día).
+    - peso_cambio (float): Penalización por cada celda "CAMBIO" (segunda hora no seguida de una clave en un día).
+    - choques (ndarray): Si se da, los choques de cada clave en cada celda con otros semestres (ver 'contar_choques').
+      Una tabla con choques no es factible.
+    - peso_choque (float): Penalización por cada choque con otros semestres.
+    - cache (CacheAptitud): Si se da, las tablas y columnas ya evaluadas se toman de la caché. Los choques siempre se
+      cuentan de nuevo.
+
+    Returns:
+    - aptitudes (ndarray): Arreglo de forma (población,) con la aptitud graduada de cada tabla.
+    - factibles (ndarray): Arreglo booleano que indica qué tablas no tienen celdas "EXCESO" ni "CAMBIO" ni choques.
+    """
+    if cache is not None:
+        horas_colocadas, celdas_exceso, celdas_cambio = cache.componentes(poblacion, codificacion)
+    else:
+        horas_colocadas, celdas_exceso, celdas_cambio = componentes_aptitud(poblacion, codificacion)
+    num_choques = contar_choques(poblacion, choques) if choques is not None else 0
+    factibles = (celdas_exceso == 0) & (celdas_cambio == 0) & (num_choques == 0)
+
+    aptitudes = np.where(factibles, horas_colocadas + codificacion.celdas_fijas,
+                         horas_colocadas - peso_exceso * celdas_exceso - peso_cambio * celdas_cambio
+                         - peso_choque * num_choques)
+    return aptitudes, factibles
+
+
+def evaluar_poblacion(poblacion, codificacion, aptitud="penalizada", peso_exceso=2, peso_cambio=2, choques=None,
+                      peso_choque=2, con_factibles=False, cache=None):
+    """
+    Evalúa una población con la función de aptitud elegida.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - aptitud (str): "binaria" (cero si hay algún conflicto, 'calcular_aptitud_poblacion') o "penalizada"
+      ('calcular_aptitud_penalizada').
+    - peso_exceso, peso_cambio (float): Penalizaciones para la aptitud "penalizada".
+    - choques (ndarray): Si se da, los choques de cada clave en cada celda con otros semestres. Con la aptitud
+      "binaria" una tabla con choques tiene aptitud cero; con la "penalizada" cada choque resta 'peso_choque'.
+    - peso_choque (float): Penalización por cada choque para la aptitud "penalizada".
+    - con_factibles (bool): Si es True, también se regresa qué tablas son factibles.
+    - cache (CacheAptitud): Si se da, las tablas y columnas ya evaluadas se toman de la caché.
+
+    Returns:
+    - aptitudes (ndarray): Arreglo de forma (población,) con la aptitud de cada tabla.
+    - factibles (ndarray): Solo si 'con_factibles' es True; arreglo booleano que indica qué tablas no tienen celdas
+      "EXCESO" ni "CAMBIO" ni choques.
+    """
+    if aptitud == "binaria":
+        aptitudes = calcular_aptitud_poblacion(poblacion, codificacion, cache)
+        if choques is not None:
+            aptitudes = np.where(contar_choques(poblacion, choques) > 0, 0, aptitudes)
+        # Una tabla factible siempre cuenta al menos los encabezados, así que solo las no factibles valen cero
+        return (aptitudes, aptitudes > 0) if con_factibles else aptitudes
+    if aptitud == "penalizada":
+        aptitudes, factibles = calcular_aptitud_penalizada(poblacion, codificacion, peso_exceso, peso_cambio, choques,
+                                                           peso_choque, cache)
+        return (aptitudes, factibles) if con_factibles else aptitudes
+    raise ValueError(f"Aptitud desconocida: {aptitud}")
+
+
+def mezclar_bits(valores):
+    """
+    Mezcla los bits de un arreglo de enteros sin signo de 64 bits (función splitmix64).
+
+    Da el mismo resultado en cualquier proceso, a diferencia de 'hash', por lo que sirve para huellas compartidas.
+
+    Args:
+    - valores (ndarray): Arreglo de tipo uint64.
+
+    Returns:
+    - mezclados (ndarray): Arreglo de la misma forma con los bits mezclados.
+    """
+    valores = valores + np.uint64(0x9E3779B97F4A7C15)
+    valores = (valores ^ (valores >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    valores = (valores ^ (valores >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return valores ^ (valores >> np.uint64(31))
+
+
+def huellas_poblacion(poblacion):
+    """
+    Calcula huellas de 64 bits de cada día y de cada tabla de una población, al estilo de Zobrist.
+
+    Cada celda aporta un número que depende de su hora y su código; la huella de un día es el XOR de sus celdas, así
+    que no depende del día en que está la columna, y la huella de la tabla combina las de sus días.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+
+    Returns:
+    - huellas_columnas (ndarray): Arreglo uint64 de forma (población, días).
+    - huellas_tablas (ndarray): Arreglo uint64 de forma (población,).
+    """
+    num_horas, num_dias = poblacion.shape[1:]
+    horas = np.arange(num_horas, dtype=np.uint64)[None, :, None] << np.uint64(32)
+    celdas = mezclar_bits(horas | (poblacion + 1).astype(np.uint64))
+    huellas_columnas = np.bitwise_xor.reduce(celdas, axis=1)
+
+    dias = np.arange(num_dias, dtype=np.uint64)[None, :] * np.uint64(0xD1B54A32D192ED03)
+    huellas_tablas = np.bitwise_xor.reduce(mezclar_bits(huellas_columnas ^ dias), axis=1)
+    return huellas_columnas, huellas_tablas
+
+
+class AlmacenLRU:
+    def __init__(self, tam_maximo=100000):
+        """
+        Constructor de la clase AlmacenLRU.
+
+        Diccionario de tamaño limitado: al llenarse se descarta la entrada usada hace más tiempo (LRU). Las búsquedas
+        y los guardados son por lotes para que, en un almacén compartido entre procesos, cada lote cueste una sola
+        comunicación.
+
+        Args:
+            tam_maximo (int): Cantidad máxima de entradas.
+        """
+        self.tam_maximo = tam_maximo
+        self.datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def buscar(self, llaves):
+        """
+        Regresa el valor guardado de cada llave, o None si no está, y marca las encontradas como usadas.
+        """
+        valores = []
+        for llave in llaves:
+            valor = self.datos.get(llave)
+            if valor is None:
+                self.fallos += 1
+            else:
+                self.aciertos += 1
+                self.datos.move_to_end(llave)
+            valores.append(valor)
+        return valores
+
+    def guardar(self, llaves, valores):
+        """
+        Guarda un lote de llaves con sus valores y descarta las entradas más viejas si se pasa del tamaño máximo.
+        """
+        for llave, valor in zip(llaves, valores):
+            self.datos[llave] = valor
+            self.datos.move_to_end(llave)
+        while len(self.datos) > self.tam_maximo:
+            self.datos.popitem(last=False)
+
+    def limpiar(self):
+        """
+        Borra todas las entradas y los contadores.
+        """
+        self.datos.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def estadisticas(self):
+        """
+        Regresa el tamaño actual y los aciertos y fallos de las búsquedas.
+        """
+        return {"entradas": len(self.datos), "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+class AdministradorCache(BaseManager):
+    """
+    Proceso servidor que guarda los almacenes de una caché compartida (ver 'crear_cache_compartida').
+    """
+
+
+AdministradorCache.register("AlmacenLRU", AlmacenLRU)
+
+
+class CacheAptitud:
+    def __init__(self, tam_maximo=100000, almacen_tablas=None, almacen_columnas=None, almacen_dias=None):
+        """
+        Constructor de la clase CacheAptitud.
+
+        Tabla de transposición delante de la evaluación de la aptitud: guarda, por la huella de 'huellas_poblacion',
+        las horas colocadas, las celdas "EXCESO" y las celdas "CAMBIO" de cada tabla evaluada. Como las etiquetas de
+        un día solo dependen del contenido de ese día, también guarda esos conteos por columna: una tabla nueva hecha
+        con días ya vistos (por ejemplo, un hijo del cruce por columnas) se evalúa sumando sus columnas. Los conteos no
+        dependen de los pesos, así que sirven para la aptitud "binaria" y la "penalizada"; los choques con otros
+        semestres no se guardan.
+
+        Los conteos solo dependen de qué celdas de un día tienen el mismo código, no de qué clave es cada código, así
+        que la caché sirve para cualquier codificación y no hace falta vaciarla al cambiar de semestre. Los días de
+        las tablas de listas de 'aptitud_tabla' se guardan aparte, en 'dias', porque su llave es el texto de las celdas.
+
+        Args:
+            tam_maximo (int): Cantidad máxima de entradas de cada almacén.
+            almacen_tablas (AlmacenLRU): Almacén para las tablas. Por omisión, uno nuevo en este proceso.
+            almacen_columnas (AlmacenLRU): Almacén para las columnas codificadas. Por omisión, uno nuevo en este proceso.
+            almacen_dias (AlmacenLRU): Almacén para los días de las tablas de listas. Por omisión, uno nuevo en este
+                proceso.
+        """
+        self.tablas = almacen_tablas if almacen_tablas is not None else AlmacenLRU(tam_maximo)
+        self.columnas = almacen_columnas if almacen_columnas is not None else AlmacenLRU(tam_maximo)
+        self.dias = almacen_dias if almacen_dias is not None else AlmacenLRU(tam_maximo)
+        self.administrador = None
+
+    def es_compartida(self):
+        """
+        Regresa True si los almacenes viven en un proceso servidor (ver 'crear_cache_compartida').
+        """
+        return not isinstance(self.tablas, AlmacenLRU)
+
+    def componentes(self, poblacion, codificacion):
+        """
+        Regresa los conteos de cada tabla, como 'componentes_aptitud', calculando solo las columnas que no están
+        guardadas.
+
+        Args:
+            poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+            codificacion (Codificacion): La codificación de las claves del semestre.
+
+        Returns:
+            tuple: Tres arreglos de forma (población,): horas colocadas, celdas "EXCESO" y celdas "CAMBIO".
+        """
+        huellas_columnas, huellas_tablas = huellas_poblacion(poblacion)
+        llaves_tablas = huellas_tablas.tolist()
+        resultado = np.zeros((len(poblacion), 3), dtype=np.int64)
+        faltantes = []
+        for k, valor in enumerate(self.tablas.buscar(llaves_tablas)):
+            if valor is None:
+                faltantes.append(k)
+            else:
+                resultado[k] = valor
+        if not faltantes:
+            return resultado[:, 0], resultado[:, 1], resultado[:, 2]
+
+        # Buscamos por separado cada día de las tablas que faltan y calculamos solo las columnas nuevas
+        num_dias = poblacion.shape[2]
+        llaves_columnas = huellas_columnas[faltantes].ravel().tolist()
+        por_columna = self.columnas.buscar(llaves_columnas)
+        nuevas = [n for n, valor in enumerate(por_columna) if valor is None]
+        if nuevas:
+            tablas_nuevas, dias_nuevos = np.divmod(nuevas, num_dias)
+            columnas = poblacion[np.array(faltantes)[tablas_nuevas], :, dias_nuevos]
+            conteos = np.stack(componentes_aptitud(columnas[:, :, None], codificacion), axis=1).tolist()
+            for n, valor in zip(nuevas, conteos):
+                por_columna[n] = valor
+            self.columnas.guardar([llaves_columnas[n] for n in nuevas], conteos)
+
+        sumas = np.array(por_columna, dtype=np.int64).reshape(len(faltantes), num_dias, 3).sum(axis=1)
+        resultado[faltantes] = sumas
+        self.tablas.guardar([llaves_tablas[k] for k in faltantes], sumas.tolist())
+        return resultado[:, 0], resultado[:, 1], resultado[:, 2]
+
+    def aptitud_tabla(self, tabla):
+        """
+        Calcula la aptitud de una tabla de listas con el mismo valor que 'calcular_aptitud', etiquetando solo los
+        días que no están guardados. Aquí la llave de cada día es la tupla de sus celdas.
+
+        Args:
+            tabla (list): Una lista de listas con encabezados.
+
+        Returns:
+            int: La aptitud de la tabla.
+        """
+        columnas = list(zip(*tabla))
+        por_columna = self.dias.buscar(columnas[1:])
+        nuevas = [n for n, valor in enumerate(por_columna) if valor is None]
+        for n in nuevas:
+            etiquetada = etiquetar_columna(list(columnas[n + 1]))
+            por_columna[n] = (sum(celda != "VACIO" for celda in etiquetada),
+                              sum(celda == "EXCESO" or celda == "CAMBIO" for celda in etiquetada))
+        if nuevas:
+            self.dias.guardar([columnas[n + 1] for n in nuevas], [por_columna[n] for n in nuevas])
+
+        if any(conflictos for _, conflictos in por_columna):
+            return 0
+        return sum(llenas for llenas, _ in por_columna) + sum(celda != "VACIO" for celda in columnas[0])
+
+    def estadisticas(self):
+        """
+        Regresa los aciertos, fallos y entradas de cada almacén.
+        """
+        return {"tablas": self.tablas.estadisticas(), "columnas": self.columnas.estadisticas(),
+                "dias": self.dias.estadisticas()}
+
+    def __getstate__(self):
+        # El administrador de una caché compartida se queda en el proceso que la creó; los almacenes compartidos se
+        # copian como referencias al proceso servidor
+        estado = self.__dict__.copy()
+        estado["administrador"] = None
+        return estado
+
+
+def crear_cache_compartida(tam_maximo=100000):
+    """
+    Crea una caché de aptitud cuyos almacenes viven en un proceso servidor, de modo que las islas y las corridas en
+    otros procesos comparten las tablas ya evaluadas.
+
+    Cada búsqueda o guardado es un lote por población, así que la comunicación se hace una vez por generación. El
+    servidor se detiene cuando la caché deja de usarse en el proceso que la creó.
+
+    Args:
+    - tam_maximo (int): Cantidad máxima de entradas de cada almacén.
+
+    Returns:
+    - cache (CacheAptitud): La caché compartida.
+    """
+    administrador = AdministradorCache()
+    administrador.start()
+    cache = CacheAptitud(tam_maximo, administrador.AlmacenLRU(tam_maximo), administrador.AlmacenLRU(tam_maximo),
+                         administrador.AlmacenLRU(tam_maximo))
+    cache.administrador = administrador
+    return cache
+
+
+class EstadoAptitud:
+    def __init__(self, tabla, codificacion):
+        """
+        Constructor de la clase EstadoAptitud.
+
+        Guarda una tabla codificada junto con las horas de cada clave por día, los pares de horas seguidas y el número
+        de excesos y cambios. Así, al intercambiar dos celdas solo se actualizan las claves de esas celdas, en lugar de
+        volver a etiquetar y contar toda la tabla.
+
+        Args:
+            tabla (ndarray): Arreglo de enteros de forma (horas, días). No se modifica; el estado guarda una copia.
+            codificacion (Codificacion): La codificación de las claves del semestre.
+        """
+        tabla = np.asarray(tabla)
+        self.codificacion = codificacion
+        self.celdas = tabla.tolist()
+        self.num_horas, self.num_dias = tabla.shape
+
+        conteos, pares = contar_claves_por_dia(tabla[None], len(codificacion.claves))
+        self.conteos = conteos[0].tolist()
+        self.pares = pares[0].tolist()
+        self.espacios_llenos = int((tabla != VACIO).sum())
+
+        # Número de (día, clave) con 3 o más horas y con 2 horas no seguidas
+        self.num_excesos = 0
+        self.num_cambios = 0
+        self.celdas_exceso = 0
+        for j in range(self.num_dias):
+            for codigo in range(len(codificacion.claves)):
+                self._sumar_estado(j, codigo, 1)
+
+    def _sumar_estado(self, j, codigo, signo):
+        """
+        Suma (o resta, con signo -1) la contribución de una clave en un día al número de excesos y cambios.
+        """
+        horas = self.conteos[j][codigo]
+        if horas >= 3:
+            self.num_excesos += signo
+            self.celdas_exceso += signo * horas
+        elif horas == 2 and self.pares[j][codigo] == 0:
+            self.num_cambios += signo
+
+    def _quitar(self, i, j):
+        """
+        Vacía la celda (i, j) y actualiza los conteos de su clave.
+        """
+        codigo = self.celdas[i][j]
+        if codigo == VACIO:
+            return
+        self._sumar_estado(j, codigo, -1)
+        self.conteos[j][codigo] -= 1
+        if i > 0 and self.celdas[i - 1][j] == codigo:
+            self.pares[j][codigo] -= 1
+        if i + 1 < self.num_horas and self.celdas[i + 1][j] == codigo:
+            self.pares[j][codigo] -= 1
+        self.celdas[i][j] = VACIO
+        self.espacios_llenos -= 1
+        self._sumar_estado(j, codigo, 1)
+
+    def _poner(self, i, j, codigo):
+        """
+        Coloca una clave en la celda vacía (i, j) y actualiza los conteos de esa clave.
+        """
+        if codigo == VACIO:
+            return
+        self._sumar_estado(j, codigo, -1)
+        self.conteos[j][codigo] += 1
+        if i > 0 and self.celdas[i - 1][j] == codigo:
+            self.pares[j][codigo] += 1
+        if i + 1 < self.num_horas and self.celdas[i + 1][j] == codigo:
+            self.pares[j][codigo] += 1
+        self.celdas[i][j] = codigo
+        self.espacios_llenos += 1
+        self._sumar_estado(j, codigo, 1)
+
+    @property
+    def aptitud(self):
+        """
+        La aptitud de la tabla actual, con el mismo valor que 'calcular_aptitud'.
+        """
+        if self.num_excesos or self.num_cambios:
+            return 0
+        return self.espacios_llenos + self.codificacion.celdas_fijas
+
+    def aptitud_penalizada(self, peso_exceso=2, peso_cambio=2):
+        """
+        La aptitud graduada de la tabla actual, con el mismo valor que 'calcular_aptitud_penalizada'.
+        """
+        if self.num_excesos or self.num_cambios:
+            return self.espacios_llenos - peso_exceso * self.celdas_exceso - peso_cambio * self.num_cambios
+        return self.espacios_llenos + self.codificacion.celdas_fijas
+
+    def intercambiar(self, i1, j1, i2, j2):
+        """
+        Intercambia el contenido de las celdas (i1, j1) y (i2, j2), que puede ser una celda vacía.
+
+        Args:
+            i1, j1 (int): Hora y día de la primera celda.
+            i2, j2 (int): Hora y día de la segunda celda.
+
+        Returns:
+            int: La aptitud de la tabla después del intercambio.
+        """
+        codigo1 = self.celdas[i1][j1]
+        codigo2 = self.celdas[i2][j2]
+        if codigo1 != codigo2:
+            self._quitar(i1, j1)
+            self._quitar(i2, j2)
+            self._poner(i1, j1, codigo2)
+            self._poner(i2, j2, codigo1)
+        return self.aptitud
+
+    def variacion_intercambio(self, i1, j1, i2, j2):
+        """
+        Calcula cuánto cambiaría la aptitud al intercambiar dos celdas, sin dejar la tabla modificada.
+
+        Args:
+            i1, j1 (int): Hora y día de la primera celda.
+            i2, j2 (int): Hora y día de la segunda celda.
+
+        Returns:
+            int: La aptitud después del intercambio menos la aptitud actual.
+        """
+        antes = self.aptitud
+        despues = self.intercambiar(i1, j1, i2, j2)
+        self.intercambiar(i1, j1, i2, j2)
+        return despues - antes
+
+    def tabla(self):
+        """
+        Regresa una copia de la tabla actual como arreglo de enteros de forma (horas, días).
+        """
+        return np.array(self.celdas, dtype=np.int64)
+
+
+def crear_poblacion_aleatoria(tam_poblacion, codificacion, generador=None):
+    """
+    Crea una población de tablas aleatorias ya codificadas.
+
+    Cada tabla lleva cada clave tantas veces como horas tiene asignadas, en orden aleatorio y llenando las celdas por
+    filas, como 'crear_tabla_aleatoria'. Si las horas no caben en la tabla, las sobrantes se descartan al azar.
+
+    Args:
+    - tam_poblacion (int): Cantidad de tablas a crear.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    """
+    generador = crear_generador(generador)
+    num_celdas = codificacion.num_horas * codificacion.num_dias
+    fichas = np.repeat(np.arange(len(codificacion.claves)), codificacion.horas)
+
+    # Cada fila es una permutación aleatoria de las horas de todas las claves
+    orden = np.argsort(generador.random((tam_poblacion, len(fichas))), axis=1)
+    mezcladas = fichas[orden][:, :num_celdas]
+
+    poblacion = np.full((tam_poblacion, num_celdas), VACIO, dtype=np.int64)
+    poblacion[:, :mezcladas.shape[1]] = mezcladas
+    return poblacion.reshape(tam_poblacion, codificacion.num_horas, codificacion.num_dias)
+
+
+def construir_tabla_factible(codificacion, generador=None):
+    """
+    Construye una tabla codificada colocando cada clave solo donde la tabla sigue siendo factible.
+
+    Las reglas de 'etiquetar_cambios' permiten, para cada clave y cada día, una hora o dos horas seguidas: 3 o más
+    horas son "EXCESO" y 2 horas separadas son "CAMBIO". Por eso cada clave se reparte en bloques de una o dos horas
+    seguidas, con a lo más un bloque por día, y cada bloque se coloca solo en horas libres de un día que la clave
+    todavía no usa. Las claves con más horas se colocan primero. Si un bloque de dos horas no cabe en ningún día, se
+    parte en dos bloques de una hora; las horas que aun así no caben se dejan fuera.
+
+    Args:
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - tabla (ndarray): Arreglo de enteros de forma (horas, días) sin celdas "EXCESO" ni "CAMBIO".
+    """
+    num_horas, num_dias = codificacion.num_horas, codificacion.num_dias
+
+    # Las listas pequeñas se barajan más rápido con 'random' que con numpy; su semilla sale del generador
+    azar = random.Random(int(crear_generador(generador).integers(2 ** 63)))
+    tabla = np.full((num_horas, num_dias), VACIO, dtype=np.int64)
+
+    # Horas libres de cada día; 'posicion' permite quitar una hora libre en O(1) intercambiándola con la última
+    libres = [list(range(num_horas)) for _ in range(num_dias)]
+    posicion = [list(range(num_horas)) for _ in range(num_dias)]
+
+    def ocupar(dia, hora):
+        lista = libres[dia]
+        lugar = posicion[dia][hora]
+        ultima = lista[-1]
+        lista[lugar] = ultima
+        posicion[dia][ultima] = lugar
+        lista.pop()
+        posicion[dia][hora] = -1
+
+    # Las claves con más horas van primero; las claves con las mismas horas, en orden aleatorio
+    codigos = [int(codigo) for codigo in np.flatnonzero(codificacion.horas > 0)]
+    azar.shuffle(codigos)
+    codigos.sort(key=lambda codigo: -codificacion.horas[codigo])
+
+    for codigo in codigos:
+        horas = int(codificacion.horas[codigo])
+
+        # Con b bloques hay horas - b bloques de dos horas, así que b va de ceil(horas / 2) a horas
+        minimo_bloques = min(-(-horas // 2), num_dias)
+        num_bloques = azar.randint(minimo_bloques, max(minimo_bloques, min(horas, num_dias)))
+        num_pares = min(horas - num_bloques, num_bloques)
+        pendientes = [2] * num_pares + [1] * (num_bloques - num_pares)
+
+        dias = list(range(num_dias))
+        azar.shuffle(dias)
+        while pendientes and dias:
+            tam = pendientes.pop(0)
+            for k, dia in enumerate(dias):
+                if tam == 1 and libres[dia]:
+                    inicio = azar.choice(libres[dia])
+                elif tam == 2:
+                    inicios = [hora for hora in libres[dia] if hora + 1 < num_horas and posicion[dia][hora + 1] >= 0]
+                    inicio = azar.choice(inicios) if inicios else None
+                else:
+                    inicio = None
+
+                if inicio is not None:
+                    for hora in range(inicio, inicio + tam):
+                        tabla[hora, dia] = codigo
+                        ocupar(dia, hora)
+                    dias.pop(k)
+                    break
+            else:
+                # El bloque de dos horas no cupo en ningún día: lo intentamos como dos horas sueltas
+                if tam == 2:
+                    pendientes += [1, 1]
+
+    return tabla
+
+
+def crear_poblacion_factible(tam_poblacion, codificacion, generador=None):
+    """
+    Crea una población de tablas codificadas sin celdas "EXCESO" ni "CAMBIO" con 'construir_tabla_factible'.
+
+    Args:
+    - tam_poblacion (int): Cantidad de tablas a crear.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    """
+    generador = crear_generador(generador)
+    poblacion = np.empty((tam_poblacion, codificacion.num_horas, codificacion.num_dias), dtype=np.int64)
+    for k in range(tam_poblacion):
+        poblacion[k] = construir_tabla_factible(codificacion, generador)
+    return poblacion
+
+
+def poblacion_desde_tabla(tabla_previa, tam_poblacion, codificacion, generador=None):
+    """
+    Crea una población a partir de la tabla de una corrida anterior, para reprogramar un semestre tras un cambio
+    pequeño (una clave con otras horas, una materia nueva o una que se quitó).
+
+    Las claves afectadas son las que ya no tienen las mismas horas que en la tabla previa y las que tenían celdas
+    "EXCESO" o "CAMBIO". Las celdas de las demás claves se quedan fijas; las celdas libres son las vacías y las de las
+    claves afectadas. A cada clave afectada se le quitan al azar las horas sobrantes y se le agregan las faltantes en
+    celdas vacías, como en 'reparar_tabla'. La primera tabla conserva el acomodo previo y en las demás se revuelve el
+    contenido de las celdas libres, así que toda la población coincide en las celdas fijas.
+
+    Antes se revisa que las claves afectadas quepan en las celdas libres: cada una necesita sus horas (a lo más dos
+    por día) en días con celdas libres, y entre todas no pueden pasar de las celdas libres. Si no caben, se liberan
+    también los días que las bloquean (primero los días donde una clave afectada no puede poner dos horas seguidas y
+    después los días con menos celdas libres), hasta que quepan o toda la tabla esté libre. La revisión no garantiza
+    que exista una tabla completa; 'ejecutar_algoritmo_genetico' repite la corrida desde cero si no la encuentra.
+
+    Args:
+    - tabla_previa (ndarray): La tabla anterior, codificada con la codificación actual (ver 'leer_tablas_csv').
+    - tam_poblacion (int): Cantidad de tablas a crear.
+    - codificacion (Codificacion): La codificación de las claves del semestre, ya con los cambios.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo.
+
+    Returns:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - celdas_libres (ndarray): Índices, en la tabla aplanada, de las celdas que se pueden cambiar.
+    """
+    generador = crear_generador(generador)
+    num_claves = len(codificacion.claves)
+    base = np.array(tabla_previa, dtype=np.int64)
+    plana = base.reshape(-1)
+
+    # Las claves que ya no tienen horas se quitan de la tabla
+    ocupadas = plana != VACIO
+    plana[ocupadas & (codificacion.horas[np.maximum(plana, 0)] == 0)] = VACIO
+    ocupadas = plana != VACIO
+
+    conteo = np.bincount(plana[ocupadas], minlength=num_claves)
+    conteos, pares = contar_claves_por_dia(base[None], num_claves)
+    con_conflictos = ((conteos[0] >= 3) | ((conteos[0] == 2) & (pares[0] == 0))).any(axis=0)
+    afectadas = (conteo != codificacion.horas) | con_conflictos
+
+    libres = ~ocupadas
+    libres[ocupadas] = afectadas[plana[ocupadas]]
+    libres = libres.reshape(base.shape)
+
+    pedidas = np.minimum(codificacion.horas, 2 * codificacion.num_dias)[afectadas]
+    fijas = base != VACIO
+    fijas[fijas] = ~afectadas[base[fijas]]
+    while not libres.all():
+        # Cada clave usa a lo más dos horas seguidas por día
+        capacidad = np.where((libres[1:] & libres[:-1]).any(axis=0), 2, libres.any(axis=0).astype(np.int64))
+        if (pedidas > capacidad.sum()).any():
+            dias = capacidad < 2
+        # Las celdas de claves fijas que quedan en días liberados siguen ocupadas por esas mismas claves
+        elif pedidas.sum() > (libres & ~fijas).sum():
+            disponibles = np.where(libres.all(axis=0), codificacion.num_horas + 1, libres.sum(axis=0))
+            dias = np.arange(codificacion.num_dias) == np.argmin(disponibles)
+        else:
+            break
+        libres[:, dias] = True
+    celdas_libres = np.flatnonzero(libres)
+
+    poblacion = np.repeat(base[None], tam_poblacion, axis=0)
+    for k in range(tam_poblacion):
+        reparar_tabla(poblacion[k], codificacion.horas, generador)
+        if k > 0:
+            plana_k = poblacion[k].reshape(-1)
+            plana_k[celdas_libres] = generador.permutation(plana_k[celdas_libres])
+    return poblacion, celdas_libres
+
+
+def muestreo_por_bloques(num_muestras, codificacion, num_mejores=3, tam_bloque=10000, generador=None):
+    """
+    Genera y evalúa tablas aleatorias por bloques, conservando solo las mejores.
+
+    Cada bloque de 'tam_bloque' tablas se crea y se evalúa de una vez, y de él solo se guardan en un montículo las
+    tablas que entran entre las 'num_mejores'. La memoria usada depende de 'tam_bloque' y 'num_mejores', no de
+    'num_muestras'. Bloques más grandes aprovechan mejor las operaciones vectorizadas a cambio de más memoria.
+
+    Args:
+    - num_muestras (int): Cantidad total de tablas a generar.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - num_mejores (int): Cantidad de mejores tablas a conservar.
+    - tam_bloque (int): Cantidad de tablas que se generan y evalúan a la vez.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - tablas (ndarray): Las mejores tablas, de forma (num_mejores, horas, días), de mayor a menor aptitud.
+    - aptitudes (ndarray): La aptitud de cada una de esas tablas.
+    """
+    generador = crear_generador(generador)
+    monticulo = []  # Montículo de mínimos con (aptitud, orden, tabla)
+    orden = 0
+    restantes = num_muestras
+
+    while restantes > 0:
+        tam = min(tam_bloque, restantes)
+        restantes -= tam
+        bloque = crear_poblacion_aleatoria(tam, codificacion, generador)
+        aptitudes = calcular_aptitud_poblacion(bloque, codificacion)
+
+        # Solo las mejores del bloque pueden entrar al montículo
+        if tam > num_mejores:
+            mejores = np.argpartition(-aptitudes, num_mejores - 1)[:num_mejores]
+        else:
+            mejores = np.arange(tam)
+
+        for k in mejores:
+            entrada = (int(aptitudes[k]), orden, bloque[k].copy())
+            orden += 1
+            if len(monticulo) < num_mejores:
+                heapq.heappush(monticulo, entrada)
+            elif entrada[0] > monticulo[0][0]:
+                heapq.heapreplace(monticulo, entrada)
+
+    monticulo.sort(key=lambda entrada: (-entrada[0], entrada[1]))
+    tablas = np.array([entrada[2] for entrada in monticulo]).reshape(-1, codificacion.num_horas, codificacion.num_dias)
+    aptitudes = np.array([entrada[0] for entrada in monticulo], dtype=np.int64)
+    return tablas, aptitudes
+
+
+def reparar_tabla(tabla, horas, generador=None):
+    """
+    Ajusta una tabla codificada para que cada clave aparezca exactamente las horas que tiene asignadas.
+
+    Después de un cruce algunas claves quedan con horas de más y otras con horas de menos. Las horas sobrantes se
+    vacían al azar y las faltantes se colocan en celdas vacías elegidas al azar, mientras queden celdas libres.
+
+    Args:
+    - tabla (ndarray): Arreglo de enteros de forma (horas, días). Se modifica en el lugar.
+    - horas (ndarray): Horas asignadas a cada código de clave.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - tabla (ndarray): La misma tabla con las horas por clave corregidas.
+    """
+    generador = crear_generador(generador)
+    plana = tabla.reshape(-1)
+    conteo = np.bincount(plana[plana != VACIO], minlength=len(horas))
+
+    # Vaciamos las horas sobrantes de cada clave
+    for codigo in np.flatnonzero(conteo > horas):
+        lugares = np.flatnonzero(plana == codigo)
+        plana[generador.choice(lugares, conteo[codigo] - horas[codigo], replace=False)] = VACIO
+
+    # Colocamos las horas faltantes en celdas vacías al azar
+    faltantes = np.repeat(np.arange(len(horas)), np.maximum(horas - conteo, 0))
+    if len(faltantes):
+        celdas_vacias = np.flatnonzero(plana == VACIO)
+        cantidad = min(len(celdas_vacias), len(faltantes))
+        lugares = generador.choice(celdas_vacias, cantidad, replace=False)
+        plana[lugares] = generador.permutation(faltantes)[:cantidad]
 
-    # Copiamos las claves disponibles para insertarlas en la tabla
-    claves_disponibles_mezcladas = claves_disponibles.copy()
-    # Insertamos las claves en la tabla de manera aleatoria con las horas correspondientes
-    for fila in tabla:
-        for i in range(len(fila)):
-            if fila[i] == "VACIO" and claves_disponibles_mezcladas:
-                # Seleccionamos una clave aleatoria de las disponibles
-                nueva_clave = random.choice(claves_disponibles_mezcladas)
-                #print("clave",nueva_clave)
-                # Verificamos las horas asignadas para esa clave
-                horas_asignadas = horas_por_clave.get(nueva_clave, 0)
-                if clave_count[nueva_clave] < horas_asignadas:
-                    fila[i] = nueva_clave
-                    clave_count[nueva_clave] += 1
-                    # Si se ha insertado la clave las veces necesarias, la eliminamos de las disponibles
-                    if clave_count[nueva_clave] == horas_asignadas:
-                        claves_disponibles_mezcladas.remove(nueva_clave)
     return tabla
 
 
-def algoritmo_genetico(num_generaciones, tabla_vacia, claves, claves_disponibles, horas_por_clave):
+def reparar_poblacion(poblacion, codificacion, generador=None):
+    """
+    Repara solo las tablas de la población cuyas horas por clave no coinciden con las asignadas.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días). Se modifica en el lugar.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - poblacion (ndarray): La misma población reparada.
+    """
+    generador = crear_generador(generador)
+    num_tablas = len(poblacion)
+    num_claves = len(codificacion.claves)
+    plana = poblacion.reshape(num_tablas, -1)
+
+    # Horas de cada clave en cada tabla, contadas para toda la población a la vez
+    ocupadas = plana != VACIO
+    indices = (np.arange(num_tablas)[:, None] * num_claves + plana)[ocupadas]
+    conteos = np.bincount(indices, minlength=num_tablas * num_claves).reshape(num_tablas, num_claves)
+
+    # Una tabla llena no puede recibir más horas, así que las horas faltantes solo cuentan si hay celdas libres
+    sobran = (conteos > codificacion.horas).any(axis=1)
+    faltan = (conteos < codificacion.horas).any(axis=1) & (~ocupadas).any(axis=1)
+    for k in np.flatnonzero(sobran | faltan):
+        reparar_tabla(poblacion[k], codificacion.horas, generador)
+
+    return poblacion
+
+
+def seleccion_torneo(aptitudes, num_padres, tam_torneo=3, generador=None):
+    """
+    Selecciona padres de la población por torneo.
+
+    Args:
+    - aptitudes (ndarray): Aptitud de cada tabla de la población.
+    - num_padres (int): Cantidad de padres a seleccionar.
+    - tam_torneo (int): Cantidad de tablas que compiten en cada torneo.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - indices (ndarray): Índices de las tablas ganadoras de cada torneo.
+    """
+    competidores = crear_generador(generador).integers(0, len(aptitudes), (num_padres, tam_torneo))
+    ganadores = np.argmax(aptitudes[competidores], axis=1)
+    return competidores[np.arange(num_padres), ganadores]
+
+
+def seleccion_ruleta(aptitudes, num_padres, tam_torneo=None, generador=None):
+    """
+    Selecciona padres de la población con probabilidad proporcional a su aptitud.
+
+    Si hay aptitudes negativas (aptitud penalizada), se desplazan para que la peor valga cero. Si todas las aptitudes
+    son cero, la selección es uniforme.
+
+    Args:
+    - aptitudes (ndarray): Aptitud de cada tabla de la población.
+    - num_padres (int): Cantidad de padres a seleccionar.
+    - tam_torneo (int): No se usa; existe para que ambas selecciones tengan la misma firma.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - indices (ndarray): Índices de las tablas seleccionadas.
+    """
+    generador = crear_generador(generador)
+    pesos = aptitudes.astype(np.float64)
+    if pesos.min() < 0:
+        pesos -= pesos.min()
+    total = pesos.sum()
+    if total <= 0:
+        return generador.integers(0, len(aptitudes), num_padres)
+    return generador.choice(len(aptitudes), num_padres, p=pesos / total)
+
+
+def cruce_columnas(padres1, padres2, codificacion, generador=None):
+    """
+    Cruza parejas de tablas intercambiando días completos (columnas) elegidos al azar.
+
+    Args:
+    - padres1 (ndarray): Primeros padres, de forma (parejas, horas, días).
+    - padres2 (ndarray): Segundos padres, de forma (parejas, horas, días).
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - hijos (ndarray): Los hijos ya reparados, de forma (2 * parejas, horas, días).
+    """
+    generador = crear_generador(generador)
+    mascara = (generador.random((len(padres1), codificacion.num_dias)) < 0.5)[:, None, :]
+    hijos = np.concatenate([np.where(mascara, padres2, padres1), np.where(mascara, padres1, padres2)])
+    return reparar_poblacion(hijos, codificacion, generador)
+
+
+def cruce_bloque(padres1, padres2, codificacion, generador=None):
+    """
+    Cruza parejas de tablas intercambiando un bloque de días consecutivos, conservando juntas las clases de esos días.
+
+    Args:
+    - padres1 (ndarray): Primeros padres, de forma (parejas, horas, días).
+    - padres2 (ndarray): Segundos padres, de forma (parejas, horas, días).
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+
+    Returns:
+    - hijos (ndarray): Los hijos ya reparados, de forma (2 * parejas, horas, días).
+    """
+    generador = crear_generador(generador)
+    # Elegimos el bloque de días [inicio, fin] que se intercambia en cada pareja
+    inicio = generador.integers(0, codificacion.num_dias, len(padres1))
+    fin = generador.integers(inicio, codificacion.num_dias)
+    dias = np.arange(codificacion.num_dias)
+    mascara = ((dias >= inicio[:, None]) & (dias <= fin[:, None]))[:, None, :]
+
+    hijos = np.concatenate([np.where(mascara, padres2, padres1), np.where(mascara, padres1, padres2)])
+    return reparar_poblacion(hijos, codificacion, generador)
+
+
+def mutacion_intercambio(poblacion, prob_mutacion, generador=None, celdas=None):
+    """
+    Muta tablas de la población intercambiando el contenido de dos celdas al azar.
+
+    Como solo se intercambian celdas, cada clave conserva la cantidad de horas que tenía.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días). Se modifica en el lugar.
+    - prob_mutacion (float): Probabilidad de mutar cada tabla.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada llamada es
+      distinta.
+    - celdas (ndarray): Índices de las celdas (en la tabla aplanada) que se pueden intercambiar. Si es None, todas.
+
+    Returns:
+    - poblacion (ndarray): La misma población mutada.
+    """
+    generador = crear_generador(generador)
+    plana = poblacion.reshape(len(poblacion), -1)
+    mutar = np.flatnonzero(generador.random(len(poblacion)) < prob_mutacion)
+    if celdas is None:
+        celda1 = generador.integers(0, plana.shape[1], len(mutar))
+        celda2 = generador.integers(0, plana.shape[1], len(mutar))
+    elif len(celdas) < 2:
+        return poblacion
+    else:
+        celda1 = celdas[generador.integers(0, len(celdas), len(mutar))]
+        celda2 = celdas[generador.integers(0, len(celdas), len(mutar))]
+
+    valores1 = plana[mutar, celda1]
+    plana[mutar, celda1] = plana[mutar, celda2]
+    plana[mutar, celda2] = valores1
+    return poblacion
+
+
+# Operadores disponibles para el algoritmo genético
+SELECCIONES = {"torneo": seleccion_torneo, "ruleta": seleccion_ruleta}
+CRUCES = {"columnas": cruce_columnas, "bloque": cruce_bloque}
+
+
+def vecino_aleatorio(estado, azar, celdas=None):
+    """
+    Elige dos celdas con contenido distinto para intercambiarlas.
+
+    Si las dos celdas tienen clase, el vecino intercambia dos clases; si una está vacía, el vecino mueve una clase a
+    una celda vacía. En ambos casos cada clave conserva sus horas.
+
+    Args:
+    - estado (EstadoAptitud): El estado de la tabla actual.
+    - azar (random.Random): Generador aleatorio de Python, más rápido que numpy para números sueltos.
+    - celdas (list): Las celdas (i, j) entre las que se elige. Si es None, cualquier celda de la tabla.
+
+    Returns:
+    - celdas (tuple): Las celdas (i1, j1, i2, j2), o None si las celdas elegidas tienen la misma clave.
+    """
+    if celdas is None:
+        i1, i2 = azar.randrange(estado.num_horas), azar.randrange(estado.num_horas)
+        j1, j2 = azar.randrange(estado.num_dias), azar.randrange(estado.num_dias)
+    else:
+        (i1, j1), (i2, j2) = azar.choice(celdas), azar.choice(celdas)
+    if estado.celdas[i1][j1] == estado.celdas[i2][j2]:
+        return None
+    return i1, j1, i2, j2
+
+
+def recocido_simulado(tabla, codificacion, tiempo_limite=1.0, max_iteraciones=None, temperatura_inicial=2.0,
+                      enfriamiento=0.9995, peso_exceso=2, peso_cambio=2, generador=None, celdas=None):
+    """
+    Mejora una tabla con recocido simulado sobre la aptitud penalizada.
+
+    En cada iteración se prueba un vecino de 'vecino_aleatorio'. Los vecinos que no empeoran la tabla se aceptan
+    siempre y los que la empeoran se aceptan con probabilidad exp(variación / temperatura), que baja poco a poco. Con
+    'EstadoAptitud' cada vecino se evalúa actualizando solo las dos claves que cambian. La búsqueda termina cuando la
+    tabla ya no tiene celdas "EXCESO" ni "CAMBIO" (los intercambios no cambian las horas colocadas, así que no puede
+    mejorar más), al pasar 'tiempo_limite' segundos o al llegar a 'max_iteraciones'.
+
+    Args:
+    - tabla (ndarray): Arreglo de enteros de forma (horas, días). No se modifica.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - tiempo_limite (float): Segundos máximos de la búsqueda.
+    - max_iteraciones (int): Cantidad máxima de vecinos a probar, o None.
+    - temperatura_inicial (float): La temperatura al inicio; con 2, empeorar en 2 se acepta con probabilidad 1/e.
+    - enfriamiento (float): Factor por el que se multiplica la temperatura en cada iteración.
+    - peso_exceso, peso_cambio (float): Penalizaciones de la aptitud penalizada.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo.
+    - celdas (list): Las celdas (i, j) que se pueden cambiar (ver 'vecino_aleatorio'). Si es None, todas.
+
+    Returns:
+    - mejor_tabla (ndarray): La mejor tabla encontrada.
+    - mejor_aptitud (float): Su aptitud penalizada.
+    """
+    azar = random.Random(int(crear_generador(generador).integers(2 ** 63)))
+    estado = EstadoAptitud(tabla, codificacion)
+    actual = estado.aptitud_penalizada(peso_exceso, peso_cambio)
+    mejor_tabla, mejor_aptitud = estado.tabla(), actual
+    temperatura = temperatura_inicial
+    fin = time.perf_counter() + tiempo_limite
+    iteracion = 0
+
+    while estado.num_excesos or estado.num_cambios:
+        if time.perf_counter() > fin or (max_iteraciones is not None and iteracion >= max_iteraciones):
+            break
+        iteracion += 1
+        temperatura = max(temperatura * enfriamiento, 1e-3)
+
+        vecino = vecino_aleatorio(estado, azar, celdas)
+        if vecino is None:
+            continue
+        estado.intercambiar(*vecino)
+        nueva = estado.aptitud_penalizada(peso_exceso, peso_cambio)
+
+        if nueva >= actual or azar.random() < math.exp((nueva - actual) / temperatura):
+            actual = nueva
+            if actual > mejor_aptitud:
+                mejor_tabla, mejor_aptitud = estado.tabla(), actual
+        else:
+            estado.intercambiar(*vecino)
+
+    return mejor_tabla, mejor_aptitud
+
+
+def busqueda_tabu(tabla, codificacion, tiempo_limite=1.0, max_iteraciones=None, tam_vecindario=50, tenencia=10,
+                  peso_exceso=2, peso_cambio=2, generador=None, celdas=None):
+    """
+    Mejora una tabla con búsqueda tabú sobre la aptitud penalizada.
+
+    En cada iteración se evalúan 'tam_vecindario' vecinos de 'vecino_aleatorio' y se aplica el mejor, aunque empeore
+    la tabla. Las celdas que se acaban de cambiar quedan prohibidas (tabú) durante 'tenencia' iteraciones para no
+    deshacer el cambio, salvo que el vecino supere la mejor tabla encontrada. Termina igual que 'recocido_simulado'.
+
+    Args:
+    - tabla (ndarray): Arreglo de enteros de forma (horas, días). No se modifica.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - tiempo_limite (float): Segundos máximos de la búsqueda.
+    - max_iteraciones (int): Cantidad máxima de iteraciones, o None.
+    - tam_vecindario (int): Cantidad de vecinos evaluados en cada iteración.
+    - tenencia (int): Iteraciones que una celda cambiada queda prohibida.
+    - peso_exceso, peso_cambio (float): Penalizaciones de la aptitud penalizada.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo.
+    - celdas (list): Las celdas (i, j) que se pueden cambiar (ver 'vecino_aleatorio'). Si es None, todas.
+
+    Returns:
+    - mejor_tabla (ndarray): La mejor tabla encontrada.
+    - mejor_aptitud (float): Su aptitud penalizada.
+    """
+    azar = random.Random(int(crear_generador(generador).integers(2 ** 63)))
+    estado = EstadoAptitud(tabla, codificacion)
+    actual = estado.aptitud_penalizada(peso_exceso, peso_cambio)
+    mejor_tabla, mejor_aptitud = estado.tabla(), actual
+    prohibidas = {}
+    fin = time.perf_counter() + tiempo_limite
+    iteracion = 0
+
+    while estado.num_excesos or estado.num_cambios:
+        if time.perf_counter() > fin or (max_iteraciones is not None and iteracion >= max_iteraciones):
+            break
+        iteracion += 1
+
+        elegido, aptitud_elegido = None, None
+        for _ in range(tam_vecindario):
+            vecino = vecino_aleatorio(estado, azar, celdas)
+            if vecino is None:
+                continue
+            estado.intercambiar(*vecino)
+            nueva = estado.aptitud_penalizada(peso_exceso, peso_cambio)
+            estado.intercambiar(*vecino)
+
+            es_tabu = (prohibidas.get(vecino[:2], 0) >= iteracion or prohibidas.get(vecino[2:], 0) >= iteracion)
+            if (not es_tabu or nueva > mejor_aptitud) and (elegido is None or nueva > aptitud_elegido):
+                elegido, aptitud_elegido = vecino, nueva
+
+        if elegido is None:
+            continue
+        estado.intercambiar(*elegido)
+        actual = aptitud_elegido
+        prohibidas[elegido[:2]] = prohibidas[elegido[2:]] = iteracion + tenencia
+        if actual > mejor_aptitud:
+            mejor_tabla, mejor_aptitud = estado.tabla(), actual
+
+    return mejor_tabla, mejor_aptitud
+
+
+# Búsquedas locales disponibles para refinar la mejor tabla del algoritmo genético
+BUSQUEDAS_LOCALES = {"recocido": recocido_simulado, "tabu": busqueda_tabu}
+
+
+class ArchivoMejores:
+    def __init__(self, num_mejores=3, distancia_minima=1):
+        """
+        Constructor de la clase ArchivoMejores.
+
+        Guarda las mejores tablas distintas encontradas durante una ejecución. Las tablas repetidas se descartan por su
+        huella (hash de su contenido) y dos tablas del archivo siempre difieren en al menos 'distancia_minima' celdas
+        (distancia de Hamming).
+
+        Args:
+            num_mejores (int): Cantidad máxima de tablas en el archivo.
+            distancia_minima (int): Cantidad mínima de celdas distintas entre dos tablas del archivo.
+        """
+        self.num_mejores = num_mejores
+        self.distancia_minima = distancia_minima
+        self.tablas = []
+        self.aptitudes = []
+        self.huellas = set()
+
+    def agregar(self, tablas, aptitudes):
+        """
+        Considera un conjunto de tablas para el archivo y conserva las mejores que cumplen la distancia mínima.
+
+        Args:
+            tablas (ndarray): Arreglo de enteros de forma (tablas, horas, días).
+            aptitudes (ndarray): La aptitud de cada tabla.
+        """
+        # Si el archivo está lleno, solo interesan las tablas mejores que la peor del archivo
+        if len(self.tablas) == self.num_mejores:
+            candidatos = np.flatnonzero(aptitudes > min(self.aptitudes))
+        else:
+            candidatos = np.arange(len(tablas))
+        candidatos = candidatos[np.argsort(-aptitudes[candidatos], kind="stable")]
+
+        # Descartamos las tablas repetidas por su huella
+        nuevas = []
+        vistas = set(self.huellas)
+        for k in candidatos:
+            huella = hash(tablas[k].tobytes())
+            if huella not in vistas:
+                vistas.add(huella)
+                nuevas.append(k)
+                if len(nuevas) == 10 * self.num_mejores:
+                    break
+        if not nuevas:
+            return
+
+        # Elegimos de mejor a peor las tablas que están lejos de las ya elegidas
+        todas = self.tablas + [tablas[k].copy() for k in nuevas]
+        todas_aptitudes = self.aptitudes + [aptitudes[k] for k in nuevas]
+        orden = sorted(range(len(todas)), key=lambda n: -todas_aptitudes[n])
+        elegidas = []
+        for n in orden:
+            if all((todas[n] != todas[m]).sum() >= self.distancia_minima for m in elegidas):
+                elegidas.append(n)
+                if len(elegidas) == self.num_mejores:
+                    break
+
+        self.tablas = [todas[n] for n in elegidas]
+        self.aptitudes = [todas_aptitudes[n] for n in elegidas]
+        self.huellas = {hash(tabla.tobytes()) for tabla in self.tablas}
+
+    def unir(self, otro):
+        """
+        Agrega al archivo las tablas de otro archivo, por ejemplo el de otra corrida.
+
+        Args:
+            otro (ArchivoMejores): El archivo cuyas tablas se consideran.
+        """
+        if otro.tablas:
+            self.agregar(np.array(otro.tablas), np.array(otro.aptitudes))
+
+
+class CriterioParada:
+    def __init__(self, tiempo_limite=None, aptitud_objetivo=None, generaciones_estancamiento=None):
+        """
+        Constructor de la clase CriterioParada.
+
+        Reúne los criterios para detener el algoritmo genético antes de completar 'num_generaciones'. Los criterios se
+        combinan: la corrida se detiene con el primero que se cumpla, y 'motivo' indica cuál fue ("cancelado",
+        "objetivo", "tiempo", "estancamiento" o "generaciones" si se completaron todas las generaciones).
+
+        Otro hilo (por ejemplo, una interfaz gráfica) puede consultar 'progreso' y 'mejor_aptitud' mientras la corrida
+        avanza, y detenerla con 'cancelar'.
+
+        Args:
+            tiempo_limite (float): Segundos máximos de la corrida, contados desde 'iniciar'. None para no limitar.
+            aptitud_objetivo (float o str): Aptitud con la que se detiene la corrida. "maxima" usa la aptitud de una
+                tabla con todas las horas colocadas y sin celdas "EXCESO" ni "CAMBIO" (ver 'Codificacion').
+            generaciones_estancamiento (int): Generaciones seguidas sin mejorar la mejor aptitud tras las que se
+                detiene la corrida. None para no usar este criterio.
+        """
+        self.tiempo_limite = tiempo_limite
+        self.aptitud_objetivo = aptitud_objetivo
+        self.generaciones_estancamiento = generaciones_estancamiento
+
+        self.inicio = None
+        self.objetivo = None
+        self.motivo = None
+        self.mejor_aptitud = None
+        self.sin_mejora = 0
+        self.generaciones = 0
+        self.duracion = None
+        self.cancelado = False
+        self.evento_cancelacion = None
+
+    def iniciar(self, codificacion):
+        """
+        Empieza a contar el tiempo y las generaciones de una corrida nueva.
+
+        Args:
+            codificacion (Codificacion): La codificación de las claves del semestre, para la aptitud "maxima".
+        """
+        self.inicio = time.time()
+        self.objetivo = codificacion.aptitud_maxima if self.aptitud_objetivo == "maxima" else self.aptitud_objetivo
+        self.motivo = None
+        self.mejor_aptitud = None
+        self.sin_mejora = 0
+        self.generaciones = 0
+        self.duracion = None
+
+    def para_islas(self):
+        """
+        Copia el criterio para las islas. El tiempo y el objetivo se revisan también dentro de cada isla; el
+        estancamiento solo se revisa en el proceso principal, con la mejor aptitud de todas las islas.
+
+        Returns:
+            CriterioParada: La copia, sin el criterio de estancamiento.
+        """
+        copia = copy.copy(self)
+        copia.generaciones_estancamiento = None
+        return copia
+
+    def cancelar(self):
+        """
+        Pide detener la corrida en la siguiente generación. Se puede llamar desde otro hilo.
+        """
+        self.cancelado = True
+        evento = self.evento_cancelacion
+        if evento is not None:
+            evento.set()
+
+    def compartir_cancelacion(self, evento):
+        """
+        Usa un evento de un proceso servidor para que 'cancelar' llegue también a las copias del criterio que se
+        enviaron a otros procesos, que lo revisan en cada generación.
+
+        Args:
+            evento (Event): Un evento de 'multiprocessing.Manager', o None para dejar de compartir la cancelación.
+        """
+        self.evento_cancelacion = evento
+        if evento is not None and self.cancelado:
+            evento.set()
+
+    def progreso(self, num_generaciones):
+        """
+        Estima qué fracción de la corrida ya se ejecutó, según el criterio más avanzado: las generaciones, el tiempo
+        límite o el estancamiento.
+
+        Args:
+            num_generaciones (int): El número máximo de generaciones de la corrida.
+
+        Returns:
+            float: Un número entre 0 y 1.
+        """
+        if self.motivo is not None:
+            return 1.0
+        fracciones = [self.generaciones / max(num_generaciones, 1)]
+        inicio = self.inicio
+        if self.tiempo_limite and inicio is not None:
+            fracciones.append((time.time() - inicio) / self.tiempo_limite)
+        if self.generaciones_estancamiento:
+            fracciones.append(self.sin_mejora / self.generaciones_estancamiento)
+        return min(1.0, max(fracciones))
+
+    @property
+    def tiempo_transcurrido(self):
+        """
+        Los segundos transcurridos desde 'iniciar'.
+        """
+        return time.time() - self.inicio
+
+    def actualizar(self, mejor_aptitud, generaciones=1):
+        """
+        Registra la mejor aptitud tras una o varias generaciones y revisa los criterios.
+
+        Args:
+            mejor_aptitud (float): La mejor aptitud encontrada hasta ahora.
+            generaciones (int): Las generaciones ejecutadas desde la última actualización.
+
+        Returns:
+            str: El criterio que se cumplió, o None si la corrida debe continuar.
+        """
+        self.generaciones += generaciones
+        if self.mejor_aptitud is None or mejor_aptitud > self.mejor_aptitud:
+            self.mejor_aptitud = mejor_aptitud
+            self.sin_mejora = 0
+        else:
+            self.sin_mejora += generaciones
+
+        if not self.cancelado and self.evento_cancelacion is not None and self.evento_cancelacion.is_set():
+            self.cancelado = True
+        if self.cancelado:
+            self.motivo = "cancelado"
+        elif self.objetivo is not None and mejor_aptitud >= self.objetivo:
+            self.motivo = "objetivo"
+        elif self.tiempo_limite is not None and self.tiempo_transcurrido >= self.tiempo_limite:
+            self.motivo = "tiempo"
+        elif self.generaciones_estancamiento is not None and self.sin_mejora >= self.generaciones_estancamiento:
+            self.motivo = "estancamiento"
+        return self.motivo
+
+    def reanudar(self):
+        """
+        Prepara el criterio para repetir la corrida dentro del mismo plazo, sin llamar a 'terminar': el tiempo sigue
+        contando desde 'iniciar' y las generaciones se acumulan, pero el objetivo y el estancamiento se revisan de nuevo.
+
+        Returns:
+            bool: False si la corrida se canceló o ya se acabó el tiempo límite; entonces no se debe repetir.
+        """
+        if self.cancelado or self.motivo == "cancelado":
+            return False
+        if self.tiempo_limite is not None and self.tiempo_transcurrido >= self.tiempo_limite:
+            return False
+        self.motivo = None
+        self.mejor_aptitud = None
+        self.sin_mejora = 0
+        return True
+
+    def terminar(self):
+        """
+        Marca el fin de la corrida y guarda su duración en 'duracion'. Si ningún criterio se cumplió, es porque se
+        completaron todas las generaciones. Después el criterio puede iniciarse de nuevo para otra corrida (una
+        cancelación solo detiene la corrida actual).
+
+        Returns:
+            str: El criterio con el que terminó la corrida.
+        """
+        if self.motivo is None:
+            self.motivo = "generaciones"
+        self.duracion = self.tiempo_transcurrido
+        self.inicio = None
+        self.cancelado = False
+        return self.motivo
+
+
+class ControlAdaptativo:
+    def __init__(self, intervalo=10, factor=1.25, diversidad_minima=0.15, diversidad_maxima=0.45,
+                 fraccion_facil=0.8, caida_factibles=0.05, limites_mutacion=(0.05, 0.9), limites_cruce=(0.5, 1.0),
+                 limites_poblacion=(20, 500)):
+        """
+        Constructor de la clase ControlAdaptativo.
+
+        Ajusta durante la ejecución la probabilidad de mutación, la de cruce y el tamaño de la población de
+        'evolucionar', cada 'intervalo' generaciones:
+
+        - Si la diversidad (fracción media de celdas en que cada tabla difiere de la mejor) es baja, la población está
+          convergiendo y se muta más; si es alta, se muta menos para aprovechar las buenas tablas.
+        - Si la fracción de tablas factibles baja, la mutación está rompiendo tablas: se muta menos y se cruza más
+          (el cruce por días de dos tablas factibles da una tabla factible).
+        - Si casi toda la población es factible, el semestre es fácil y la población se reduce; si la mejor aptitud no
+          mejoró y pocas tablas son factibles, el semestre es difícil y la población crece.
+
+        El estado se conserva entre llamadas a 'evolucionar': la primera toma los valores iniciales y las siguientes
+        (por ejemplo, las épocas de una isla) siguen desde los valores ajustados. Cada corrida necesita su propio
+        objeto.
+
+        Args:
+            intervalo (int): Generaciones entre cada ajuste.
+            factor (float): Factor por el que se multiplica o divide cada parámetro en un ajuste.
+            diversidad_minima, diversidad_maxima (float): Rango de diversidad en el que la mutación no cambia.
+            fraccion_facil (float): Fracción de tablas factibles a partir de la cual la población se reduce.
+            caida_factibles (float): Caída de la fracción de tablas factibles entre dos intervalos que reduce la
+                mutación.
+            limites_mutacion, limites_cruce (tuple): Valores mínimo y máximo de cada probabilidad.
+            limites_poblacion (tuple): Tamaño mínimo y máximo de la población.
+        """
+        self.intervalo = intervalo
+        self.factor = factor
+        self.diversidad_minima = diversidad_minima
+        self.diversidad_maxima = diversidad_maxima
+        self.fraccion_facil = fraccion_facil
+        self.caida_factibles = caida_factibles
+        self.limites_mutacion = limites_mutacion
+        self.limites_cruce = limites_cruce
+        self.limites_poblacion = limites_poblacion
+        self.historial = []
+        self.iniciado = False
+
+    def iniciar(self, prob_cruce, prob_mutacion, tam_poblacion):
+        """
+        Toma los valores iniciales de la corrida. 'evolucionar' lo llama solo si el objeto no se ha iniciado.
+        """
+        self.prob_cruce = prob_cruce
+        self.prob_mutacion = prob_mutacion
+        self.tam_poblacion = tam_poblacion
+        self.fracciones = []
+        self.mejor_anterior = None
+        self.generaciones = 0
+        self.iniciado = True
+
+    def actualizar(self, poblacion, aptitudes, factibles, mejor_aptitud):
+        """
+        Registra una generación y, cada 'intervalo' generaciones desde que se inició, ajusta los parámetros.
+
+        Args:
+            poblacion (ndarray): La población actual, de forma (población, horas, días).
+            aptitudes (ndarray): La aptitud de cada tabla.
+            factibles (ndarray): Qué tablas son factibles.
+            mejor_aptitud (float): La mejor aptitud encontrada hasta ahora.
+
+        Returns:
+            tuple: La probabilidad de cruce, la probabilidad de mutación y el tamaño de la población a usar.
+        """
+        self.generaciones += 1
+        self.fracciones.append(float(factibles.mean()))
+        if self.generaciones % self.intervalo != 0:
+            return self.prob_cruce, self.prob_mutacion, self.tam_poblacion
+
+        diversidad = float((poblacion != poblacion[np.argmax(aptitudes)]).mean())
+        reciente = float(np.mean(self.fracciones[-self.intervalo:]))
+        anterior = float(np.mean(self.fracciones[-2 * self.intervalo:-self.intervalo])) \
+            if len(self.fracciones) > self.intervalo else reciente
+        mejoro = self.mejor_anterior is None or mejor_aptitud > self.mejor_anterior
+        self.mejor_anterior = mejor_aptitud
+
+        if diversidad < self.diversidad_minima:
+            self.prob_mutacion *= self.factor
+        elif diversidad > self.diversidad_maxima:
+            self.prob_mutacion /= self.factor
+        if reciente < anterior - self.caida_factibles:
+            self.prob_mutacion /= self.factor
+            self.prob_cruce *= self.factor
+
+        if reciente >= self.fraccion_facil:
+            self.tam_poblacion = int(self.tam_poblacion / self.factor)
+        elif not mejoro:
+            self.tam_poblacion = int(math.ceil(self.tam_poblacion * self.factor))
+
+        self.prob_mutacion = min(max(self.prob_mutacion, self.limites_mutacion[0]), self.limites_mutacion[1])
+        self.prob_cruce = min(max(self.prob_cruce, self.limites_cruce[0]), self.limites_cruce[1])
+        self.tam_poblacion = min(max(self.tam_poblacion, self.limites_poblacion[0]), self.limites_poblacion[1])
+
+        self.historial.append({"generacion": self.generaciones, "diversidad": diversidad, "fraccion_factibles": reciente,
+                               "prob_cruce": self.prob_cruce, "prob_mutacion": self.prob_mutacion,
+                               "tam_poblacion": self.tam_poblacion})
+        return self.prob_cruce, self.prob_mutacion, self.tam_poblacion
+
+
+def calcular_estadisticas(generacion, aptitudes, factibles, mejor_aptitud, num_evaluaciones, tiempos, inicio):
+    """
+    Reúne las estadísticas de una generación para los observadores de 'evolucionar'.
+
+    Args:
+    - generacion (int): El número de la generación; la población inicial es la generación 0.
+    - aptitudes (ndarray): La aptitud de cada tabla de la población.
+    - factibles (ndarray): Qué tablas de la población no tienen celdas "EXCESO" ni "CAMBIO" ni choques.
+    - mejor_aptitud (float): La mejor aptitud encontrada desde la generación 0.
+    - num_evaluaciones (int): Cantidad de tablas evaluadas en esta generación.
+    - tiempos (dict): Los segundos de cada fase de la generación (por ejemplo "seleccion", "cruce", "mutacion",
+      "evaluacion").
+    - inicio (float): El momento en que empezó la ejecución, según 'time.perf_counter'.
+
+    Returns:
+    - estadisticas (dict): Un diccionario con valores de Python, listo para guardarse como JSON.
+    """
+    tiempo_generacion = sum(tiempos.values())
+    return {
+        "generacion": generacion,
+        "mejor": float(aptitudes.max()),
+        "media": float(aptitudes.mean()),
+        "peor": float(aptitudes.min()),
+        "mejor_global": float(mejor_aptitud),
+        "fraccion_factibles": float(factibles.mean()),
+        "evaluaciones": int(num_evaluaciones),
+        "evaluaciones_por_segundo": num_evaluaciones / tiempo_generacion if tiempo_generacion > 0 else 0.0,
+        "tiempo_generacion": tiempo_generacion,
+        "tiempos": dict(tiempos),
+        "tiempo_total": time.perf_counter() - inicio,
+    }
+
+
+class RegistroJSONL:
+    def __init__(self, ruta, **campos):
+        """
+        Constructor de la clase RegistroJSONL.
+
+        Observador de 'evolucionar' que guarda las estadísticas de cada generación como una línea JSON en un archivo,
+        para graficar la convergencia o comparar el rendimiento entre versiones. El archivo se abre para agregar al
+        final, por lo que varias corridas (o varios procesos) pueden escribir en el mismo archivo.
+
+        Args:
+            ruta (str): La ruta del archivo JSON lines.
+            campos: Campos fijos que se agregan a cada línea, por ejemplo carrera="IG", semestre=1.
+        """
+        self.ruta = ruta
+        self.campos = campos
+        self.archivo = None
+
+    def __call__(self, estadisticas):
+        """
+        Escribe las estadísticas de una generación como una línea del archivo.
+        """
+        if self.archivo is None:
+            self.archivo = open(self.ruta, "a", encoding="utf-8")
+        self.archivo.write(json.dumps({**self.campos, **estadisticas}) + "\n")
+        self.archivo.flush()
+
+    def cerrar(self):
+        """
+        Cierra el archivo. Se vuelve a abrir si se registran más estadísticas.
+        """
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
+
+    def __getstate__(self):
+        # El archivo abierto no se puede copiar a otro proceso; cada proceso abre el suyo
+        estado = self.__dict__.copy()
+        estado["archivo"] = None
+        return estado
+
+
+def evolucionar(poblacion, aptitudes, codificacion, num_generaciones, prob_cruce=0.9, prob_mutacion=0.3,
+                elitismo=2, seleccion="torneo", tam_torneo=3, cruce="columnas", archivo=None,
+                aptitud="penalizada", peso_exceso=2, peso_cambio=2, parada=None, generador=None, choques=None,
+                peso_choque=2, observadores=None, tiempo_creacion=None, cache=None, adaptacion=None,
+                celdas_libres=None):
+    """
+    Ejecuta generaciones del algoritmo genético sobre una población.
+
+    En cada generación se pasan las mejores tablas sin cambios (elitismo) y el resto se forma cruzando y mutando tablas
+    seleccionadas de la generación anterior.
+
+    Args:
+    - poblacion (ndarray): Arreglo de enteros de forma (población, horas, días).
+    - aptitudes (ndarray): Aptitud de cada tabla de la población, o None para evaluarla.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - num_generaciones (int): El número de generaciones a ejecutar.
+    - prob_cruce, prob_mutacion, elitismo, seleccion, tam_torneo, cruce: Ver 'algoritmo_genetico'.
+    - aptitud, peso_exceso, peso_cambio: La función de aptitud y sus penalizaciones; ver 'evaluar_poblacion'.
+    - choques, peso_choque: Los choques con otros semestres y su penalización; ver 'evaluar_poblacion'.
+    - archivo (ArchivoMejores): Si se da, recibe las tablas de cada generación para guardar las mejores distintas.
+    - parada (CriterioParada): Si se da, ya iniciado, se revisa después de cada generación y puede detener la
+      ejecución antes de 'num_generaciones'.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo. Si es None, cada ejecución es
+      distinta.
+    - observadores (list): Funciones que reciben, para la población inicial y después de cada generación, un
+      diccionario con las estadísticas de 'calcular_estadisticas' (mejor, media y peor aptitud, fracción de tablas
+      factibles, evaluaciones por segundo y segundos de cada fase). 'RegistroJSONL' las guarda en un archivo.
+    - tiempo_creacion (float): Segundos que tomó crear la población inicial, para las estadísticas de la generación 0.
+    - cache (CacheAptitud): Si se da, las tablas repetidas (por ejemplo, hijos que no se cruzaron ni mutaron) y las
+      columnas ya vistas no se vuelven a evaluar.
+    - adaptacion (ControlAdaptativo): Si se da, ajusta durante la ejecución las probabilidades de cruce y de mutación
+      y el tamaño de la población. La primera vez empieza desde 'prob_cruce', 'prob_mutacion' y el tamaño de
+      'poblacion'; si ya se usó (por ejemplo, en la época anterior de una isla), sigue con sus valores ajustados.
+    - celdas_libres (ndarray): Si se da, la mutación solo intercambia estas celdas (índices en la tabla aplanada),
+      como las regresa 'poblacion_desde_tabla'. Si todas las tablas coinciden en las demás celdas, el cruce y la
+      reparación tampoco las cambian.
+
+    Returns:
+    - poblacion (ndarray): La población de la última generación.
+    - aptitudes (ndarray): La aptitud de cada tabla de la última generación.
+    - mejor_tabla (ndarray): La mejor tabla encontrada en todas las generaciones.
+    - mejor_aptitud (int): La aptitud de la mejor tabla.
+    """
+    if seleccion not in SELECCIONES:
+        raise ValueError(f"Selección desconocida: {seleccion}")
+    if cruce not in CRUCES:
+        raise ValueError(f"Cruce desconocido: {cruce}")
+    seleccionar = SELECCIONES[seleccion]
+    cruzar = CRUCES[cruce]
+    generador = crear_generador(generador)
+    opciones_aptitud = (aptitud, peso_exceso, peso_cambio, choques, peso_choque)
+    observadores = observadores or []
+    inicio = time.perf_counter()
+
+    # Con observadores o adaptación también se lleva la cuenta de las tablas factibles de la población
+    tiempos = {} if tiempo_creacion is None else {"creacion": tiempo_creacion}
+    num_evaluaciones = 0
+    factibles = None
+    contar_factibles = bool(observadores) or adaptacion is not None
+    if aptitudes is None or contar_factibles:
+        num_evaluaciones = len(poblacion) if aptitudes is None else 0
+        aptitudes, factibles = evaluar_poblacion(poblacion, codificacion, *opciones_aptitud, con_factibles=True,
+                                                 cache=cache)
+    tiempos["evaluacion"] = time.perf_counter() - inicio
+
+    indice_mejor = np.argmax(aptitudes)
+    mejor_tabla = poblacion[indice_mejor].copy()
+    mejor_aptitud = aptitudes[indice_mejor]
+    if archivo is not None:
+        archivo.agregar(poblacion, aptitudes)
+
+    for observador in observadores:
+        observador(calcular_estadisticas(0, aptitudes, factibles, mejor_aptitud, num_evaluaciones, tiempos, inicio))
+
+    tam_poblacion = len(poblacion)
+    num_elite = min(elitismo, tam_poblacion)
+    num_hijos = tam_poblacion - num_elite
+    num_parejas = (num_hijos + 1) // 2
+    if adaptacion is not None:
+        if not adaptacion.iniciado:
+            adaptacion.iniciar(prob_cruce, prob_mutacion, tam_poblacion)
+        prob_cruce, prob_mutacion, tam_poblacion = adaptacion.prob_cruce, adaptacion.prob_mutacion, \
+            adaptacion.tam_poblacion
+        num_elite = min(elitismo, tam_poblacion)
+        num_hijos = tam_poblacion - num_elite
+        num_parejas = (num_hijos + 1) // 2
+
+    if parada is not None and parada.actualizar(mejor_aptitud, 0):
+        return poblacion, aptitudes, mejor_tabla, mejor_aptitud
+
+    for generacion in range(1, num_generaciones + 1):
+        momento = time.perf_counter()
+        tiempos = {}
+
+        # Las mejores tablas pasan directamente a la siguiente generación
+        elite = np.argsort(-aptitudes, kind="stable")[:num_elite]
+
+        # Seleccionamos las parejas de padres y cruzamos solo algunas de ellas
+        padres = seleccionar(aptitudes, 2 * num_parejas, tam_torneo, generador)
+        padres1 = poblacion[padres[:num_parejas]]
+        padres2 = poblacion[padres[num_parejas:]]
+        se_cruzan = generador.random(num_parejas) < prob_cruce
+        momento, tiempos["seleccion"] = time.perf_counter(), time.perf_counter() - momento
+
+        hijos = np.concatenate([cruzar(padres1[se_cruzan], padres2[se_cruzan], codificacion, generador),
+                                padres1[~se_cruzan], padres2[~se_cruzan]])[:num_hijos]
+        momento, tiempos["cruce"] = time.perf_counter(), time.perf_counter() - momento
+
+        mutacion_intercambio(hijos, prob_mutacion, generador, celdas_libres)
+        momento, tiempos["mutacion"] = time.perf_counter(), time.perf_counter() - momento
+
+        if contar_factibles:
+            aptitudes_hijos, factibles_hijos = evaluar_poblacion(hijos, codificacion, *opciones_aptitud,
+                                                                 con_factibles=True, cache=cache)
+            factibles = np.concatenate([factibles[elite], factibles_hijos])
+        else:
+            aptitudes_hijos = evaluar_poblacion(hijos, codificacion, *opciones_aptitud, cache=cache)
+        tiempos["evaluacion"] = time.perf_counter() - momento
+
+        if archivo is not None:
+            archivo.agregar(hijos, aptitudes_hijos)
+
+        poblacion = np.concatenate([poblacion[elite], hijos])
+        aptitudes = np.concatenate([aptitudes[elite], aptitudes_hijos])
+
+        # Si la mejor tabla de esta generación es mejor que la mejor tabla global, la actualizamos
+        indice_mejor = np.argmax(aptitudes)
+        if aptitudes[indice_mejor] > mejor_aptitud:
+            mejor_tabla = poblacion[indice_mejor].copy()
+            mejor_aptitud = aptitudes[indice_mejor]
+
+        for observador in observadores:
+            estadisticas = calcular_estadisticas(generacion, aptitudes, factibles, mejor_aptitud, num_hijos, tiempos,
+                                                 inicio)
+            if adaptacion is not None:
+                estadisticas.update(prob_cruce=prob_cruce, prob_mutacion=prob_mutacion, tam_poblacion=len(poblacion))
+            observador(estadisticas)
+
+        if adaptacion is not None:
+            prob_cruce, prob_mutacion, tam_poblacion = adaptacion.actualizar(poblacion, aptitudes, factibles,
+                                                                             mejor_aptitud)
+            num_elite = min(elitismo, tam_poblacion)
+            num_hijos = tam_poblacion - num_elite
+            num_parejas = (num_hijos + 1) // 2
+
+        if parada is not None and parada.actualizar(mejor_aptitud):
+            break
+
+    return poblacion, aptitudes, mejor_tabla, mejor_aptitud
+
+
+def evolucionar_isla(semilla, poblacion, aptitudes, codificacion, tam_poblacion, num_generaciones, opciones_ga,
+                     registrar=False, adaptacion=None):
+    """
+    Ejecuta una época de una isla del modelo de islas. Se ejecuta en un proceso aparte.
+
+    Args:
+    - semilla (SeedSequence): Semilla del generador aleatorio para esta isla y esta época.
+    - poblacion (ndarray): La población de la isla, o None para crear una población inicial aleatoria.
+    - aptitudes (ndarray): La aptitud de cada tabla de la población, o None si la población es nueva.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - tam_poblacion (int): Cantidad de tablas en la población de la isla.
+    - num_generaciones (int): El número de generaciones de la época.
+    - opciones_ga (dict): Parámetros que se pasan a 'evolucionar'.
+    - registrar (bool): Si es True, se guardan las estadísticas de cada generación para enviarlas al proceso principal.
+    - adaptacion (ControlAdaptativo): El control adaptativo de la isla, como quedó al final de la época anterior, o
+      None.
+
+    Returns:
+    - El mismo resultado que 'evolucionar', más la lista de estadísticas de cada generación (vacía si no se registran)
+      y el control adaptativo con los valores ajustados en esta época, para pasarlo a la siguiente.
+    """
+    generador = crear_generador(semilla)
+    registro = []
+    tiempo_creacion = None
+    if poblacion is None:
+        inicio = time.perf_counter()
+        poblacion = crear_poblacion_factible(tam_poblacion, codificacion, generador)
+        tiempo_creacion = time.perf_counter() - inicio
+    resultado = evolucionar(poblacion, aptitudes, codificacion, num_generaciones, generador=generador,
+                            observadores=[registro.append] if registrar else None, tiempo_creacion=tiempo_creacion,
+                            adaptacion=adaptacion, **opciones_ga)
+    return resultado + (registro, adaptacion)
+
+
+def algoritmo_genetico_islas(num_generaciones, codificacion, tam_poblacion, num_islas, intervalo_migracion=10,
+                             num_migrantes=2, num_procesos=None, semilla=None, archivo=None, parada=None,
+                             **opciones_ga):
+    """
+    Ejecuta el algoritmo genético con el modelo de islas: varias poblaciones independientes evolucionan en procesos
+    separados y cada 'intervalo_migracion' generaciones las mejores tablas de cada isla reemplazan a las peores de la
+    isla siguiente (en anillo).
+
+    Cada isla y cada época usan su propio flujo aleatorio, derivado de 'semilla' con 'derivar_semillas', por lo que
+    los flujos no se traslapan y el resultado no depende del número de procesos ni del orden en que terminan.
+
+    Args:
+    - num_generaciones (int): El número total de generaciones.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - tam_poblacion (int): Cantidad de tablas en la población de cada isla.
+    - num_islas (int): Cantidad de islas.
+    - intervalo_migracion (int): Generaciones entre cada migración.
+    - num_migrantes (int): Cantidad de tablas que migran de cada isla en cada migración.
+    - num_procesos (int): Cantidad máxima de procesos. Por omisión, uno por núcleo.
+    - semilla (int, SeedSequence o Generator): Semilla para reproducir la ejecución. Si es None, cada ejecución es
+      distinta.
+    - archivo (ArchivoMejores): Si se da, recibe la población de cada isla al final de cada época.
+    - parada (CriterioParada): Si se da, ya iniciado, se revisa al final de cada época. El tiempo y el objetivo
+      también detienen cada isla dentro de la época.
+    - opciones_ga: Parámetros que se pasan a 'evolucionar'. Las estadísticas de cada isla se envían a los
+      'observadores' desde el proceso principal, con el número de isla y el número de generación global. La 'cache'
+      solo se usa si es compartida (ver 'crear_cache_compartida').
+
+    Returns:
+    - mejor_tabla (ndarray): La mejor tabla encontrada entre todas las islas.
+    - mejor_aptitud (float): La aptitud de la mejor tabla.
+    """
+    intervalo_migracion = max(1, intervalo_migracion)
+    num_epocas = max(1, -(-num_generaciones // intervalo_migracion))
+    semillas = [semilla_isla.spawn(num_epocas) for semilla_isla in derivar_semillas(semilla, num_islas)]
+
+    poblaciones = [None] * num_islas
+    aptitudes = [None] * num_islas
+    mejor_tabla = None
+    mejor_aptitud = None
+    generaciones_restantes = num_generaciones
+    if parada is not None:
+        opciones_ga = dict(opciones_ga, parada=parada.para_islas())
+    observadores = opciones_ga.pop("observadores", None) or []
+    generaciones_previas = 0
+
+    # Cada isla ajusta su propia copia del control adaptativo, que va y viene de su proceso en cada época
+    adaptacion = opciones_ga.pop("adaptacion", None)
+    adaptaciones = [copy.deepcopy(adaptacion) for _ in range(num_islas)]
+
+    # Una caché local se copiaría a cada isla en cada época y lo que guardaran las islas se perdería al regresar
+    cache = opciones_ga.get("cache")
+    if cache is not None and not cache.es_compartida():
+        opciones_ga = dict(opciones_ga, cache=None)
+
+    with ProcessPoolExecutor(max_workers=num_procesos) as ejecutor:
+        for epoca in range(num_epocas):
+            generaciones = min(intervalo_migracion, generaciones_restantes)
+            generaciones_restantes -= generaciones
+
+            futuros = [ejecutor.submit(evolucionar_isla, semillas[isla][epoca], poblaciones[isla],
+                                       aptitudes[isla], codificacion, tam_poblacion, generaciones, opciones_ga,
+                                       bool(observadores), adaptaciones[isla])
+                       for isla in range(num_islas)]
+
+            for isla, futuro in enumerate(futuros):
+                poblaciones[isla], aptitudes[isla], tabla, aptitud, registro, adaptaciones[isla] = futuro.result()
+
+                # La generación 0 de las épocas siguientes repite la última de la época anterior
+                for estadisticas in registro[1:] if epoca > 0 else registro:
+                    estadisticas.update(isla=isla, generacion=estadisticas["generacion"] + generaciones_previas)
+                    for observador in observadores:
+                        observador(estadisticas)
+
+                # La aptitud "penalizada" puede ser negativa, así que la primera isla siempre cuenta como la mejor
+                if mejor_aptitud is None or aptitud > mejor_aptitud:
+                    mejor_tabla = tabla
+                    mejor_aptitud = aptitud
+                if archivo is not None:
+                    archivo.agregar(tabla[None], np.array([aptitud]))
+                    archivo.agregar(poblaciones[isla], aptitudes[isla])
+
+            generaciones_previas += generaciones
+            if parada is not None and parada.actualizar(mejor_aptitud, generaciones):
+                break
+
+            # Migración en anillo: las mejores de cada isla reemplazan a las peores de la siguiente
+            if epoca < num_epocas - 1 and num_islas > 1 and num_migrantes > 0:
+                migrantes = []
+                for isla in range(num_islas):
+                    mejores = np.argsort(-aptitudes[isla], kind="stable")[:num_migrantes]
+                    migrantes.append((poblaciones[isla][mejores].copy(), aptitudes[isla][mejores].copy()))
+
+                for isla in range(num_islas):
+                    tablas, aptitudes_migrantes = migrantes[isla - 1]
+                    peores = np.argsort(aptitudes[isla], kind="stable")[:len(tablas)]
+                    poblaciones[isla][peores] = tablas
+                    aptitudes[isla][peores] = aptitudes_migrantes
+
+    if adaptacion is not None:
+        adaptacion.historial.extend(dict(ajuste, isla=isla) for isla, copia in enumerate(adaptaciones)
+                                    for ajuste in copia.historial)
+    return mejor_tabla, mejor_aptitud
+
+
+def ejecutar_algoritmo_genetico(num_generaciones, codificacion, tam_poblacion=100, num_islas=1,
+                                intervalo_migracion=10, num_migrantes=2, num_procesos=None, semilla=None,
+                                archivo=None, muestras_iniciales=0, tam_bloque=10000, parada=None, busqueda_local=None,
+                                tiempo_busqueda=1.0, tabla_previa=None, **opciones_ga):
+    """
+    Ejecuta el algoritmo genético sobre una codificación, con una sola población o con el modelo de islas.
+
+    Args:
+    - num_generaciones (int): El número de generaciones para ejecutar el algoritmo genético.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - tam_poblacion, num_islas, intervalo_migracion, num_migrantes, num_procesos, semilla: Ver 'algoritmo_genetico'.
+    - archivo (ArchivoMejores): Si se da, guarda las mejores tablas distintas encontradas.
+    - muestras_iniciales (int): Si es mayor que 'tam_poblacion', la población inicial son las mejores de esta cantidad
+      de tablas aleatorias, generadas por bloques con 'muestreo_por_bloques'. Solo aplica con una sola población.
+    - tam_bloque (int): Cantidad de tablas por bloque en el muestreo inicial.
+    - parada (CriterioParada): Criterios para detener la corrida antes de 'num_generaciones'. Se inicia aquí salvo
+      que ya esté iniciado; al terminar, 'parada.motivo' indica qué criterio se cumplió.
+    - busqueda_local (str): "recocido" o "tabu" para refinar la mejor tabla al final con 'recocido_simulado' o
+      'busqueda_tabu', o None para no refinarla.
+    - tiempo_busqueda (float): Segundos máximos de la búsqueda local, aparte del tiempo límite de 'parada'.
+    - tabla_previa (ndarray): Una tabla codificada de una corrida anterior, por ejemplo de 'leer_tablas_csv'. Si se
+      da, la población inicial sale de ella con 'poblacion_desde_tabla' y solo cambian las celdas afectadas por los
+      cambios en las claves; se usa siempre una sola población. Si así no se llega a 'codificacion.aptitud_maxima'
+      (y la corrida no se canceló), las celdas fijas pueden estar impidiendo una tabla completa, y se repite la
+      corrida desde cero con las mismas opciones; se regresa la mejor de las dos. La repetición usa el tiempo que le
+      quede a 'parada', no un tiempo límite nuevo, y no se hace si ya no queda tiempo.
+    - opciones_ga: Parámetros que se pasan a 'evolucionar'.
+
+    Returns:
+    - mejor_tabla (ndarray): La mejor tabla encontrada, codificada.
+    - mejor_aptitud (int): La aptitud de la mejor tabla.
+    """
+    if parada is not None and parada.inicio is None:
+        parada.iniciar(codificacion)
+    if tabla_previa is not None:
+        # Copia sin usar del control adaptativo, por si hay que repetir la corrida desde cero
+        adaptacion_inicial = copy.deepcopy(opciones_ga.get("adaptacion"))
+
+    if num_islas > 1 and tabla_previa is None:
+        mejor_tabla, mejor_aptitud = algoritmo_genetico_islas(num_generaciones, codificacion, tam_poblacion,
+                                                              num_islas, intervalo_migracion, num_migrantes,
+                                                              num_procesos, semilla, archivo, parada, **opciones_ga)
+        # Las islas usan semillas derivadas de 'semilla'; la búsqueda local usa su propio generador
+        generador = crear_generador(semilla)
+    else:
+        generador = crear_generador(semilla)
+
+        # Generamos la población inicial, la evaluamos y la hacemos evolucionar
+        inicio = time.perf_counter()
+        if tabla_previa is not None:
+            poblacion, celdas_libres = poblacion_desde_tabla(tabla_previa, tam_poblacion, codificacion, generador)
+            opciones_ga = dict(opciones_ga, celdas_libres=celdas_libres)
+        elif muestras_iniciales > tam_poblacion:
+            poblacion, _ = muestreo_por_bloques(muestras_iniciales, codificacion, tam_poblacion, tam_bloque,
+                                                generador)
+        else:
+            poblacion = crear_poblacion_factible(tam_poblacion, codificacion, generador)
+        tiempo_creacion = time.perf_counter() - inicio
+        _, _, mejor_tabla, mejor_aptitud = evolucionar(poblacion, None, codificacion, num_generaciones,
+                                                       archivo=archivo, parada=parada, generador=generador,
+                                                       tiempo_creacion=tiempo_creacion, **opciones_ga)
+    # La repetición desde cero sigue con el mismo 'parada' sin terminarlo, para no reiniciar su tiempo límite
+    desde_cero = tabla_previa is not None and mejor_aptitud < codificacion.aptitud_maxima and \
+        (parada is None or parada.reanudar())
+    if parada is not None and not desde_cero:
+        parada.terminar()
+
+    if desde_cero:
+        opciones_ga = {opcion: valor for opcion, valor in opciones_ga.items() if opcion != "celdas_libres"}
+        opciones_ga["adaptacion"] = adaptacion_inicial
+        tabla_cero, aptitud_cero = ejecutar_algoritmo_genetico(num_generaciones, codificacion, tam_poblacion,
+                                                               num_islas, intervalo_migracion, num_migrantes,
+                                                               num_procesos, generador, archivo,
+                                                               muestras_iniciales, tam_bloque, parada,
+                                                               **opciones_ga)
+        if aptitud_cero > mejor_aptitud:
+            mejor_tabla, mejor_aptitud = tabla_cero, aptitud_cero
+        if parada is not None:
+            parada.motivo = f"{parada.motivo} (desde cero)"
+
+    if busqueda_local is not None:
+        mejor_tabla, mejor_aptitud = refinar_tabla(mejor_tabla, mejor_aptitud, codificacion, busqueda_local,
+                                                   tiempo_busqueda, archivo, generador, **opciones_ga)
+    return mejor_tabla, mejor_aptitud
+
+
+def refinar_tabla(tabla, aptitud_tabla, codificacion, busqueda_local="recocido", tiempo_busqueda=1.0, archivo=None,
+                  generador=None, aptitud="penalizada", peso_exceso=2, peso_cambio=2, choques=None, peso_choque=2,
+                  celdas_libres=None, **opciones_ga):
+    """
+    Refina la mejor tabla del algoritmo genético con una búsqueda local y se queda con el resultado si es mejor.
+
+    La búsqueda local reduce las celdas "EXCESO" y "CAMBIO" que le quedan a una tabla casi factible en milisegundos,
+    en lugar de correr muchas generaciones más. Como no considera los choques con otros semestres, la tabla refinada
+    se vuelve a evaluar con la misma aptitud que el algoritmo genético y solo se acepta si la mejora.
+
+    Args:
+    - tabla (ndarray): La mejor tabla del algoritmo genético, codificada.
+    - aptitud_tabla (float): Su aptitud.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - busqueda_local (str): Una de las llaves de 'BUSQUEDAS_LOCALES'.
+    - tiempo_busqueda (float): Segundos máximos de la búsqueda.
+    - archivo (ArchivoMejores): Si se da, la tabla refinada también se considera para el archivo.
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo.
+    - aptitud, peso_exceso, peso_cambio, choques, peso_choque: La aptitud con que se evaluó la tabla (ver
+      'evaluar_poblacion').
+    - celdas_libres (ndarray): Si se da, la búsqueda solo cambia estas celdas (índices en la tabla aplanada).
+    - opciones_ga: Los demás parámetros del algoritmo genético; se ignoran.
+
+    Returns:
+    - mejor_tabla (ndarray): La tabla refinada, o la original si no mejoró.
+    - mejor_aptitud (float): Su aptitud.
+    """
+    if busqueda_local not in BUSQUEDAS_LOCALES:
+        raise ValueError(f"Búsqueda local desconocida: {busqueda_local}")
+
+    celdas = None
+    if celdas_libres is not None:
+        celdas = [divmod(int(celda), codificacion.num_dias) for celda in celdas_libres]
+    refinada, _ = BUSQUEDAS_LOCALES[busqueda_local](tabla, codificacion, tiempo_busqueda, peso_exceso=peso_exceso,
+                                                    peso_cambio=peso_cambio, generador=generador, celdas=celdas)
+    aptitud_refinada = evaluar_poblacion(refinada[None], codificacion, aptitud, peso_exceso, peso_cambio, choques,
+                                         peso_choque)
+    if aptitud_refinada[0] <= aptitud_tabla:
+        return tabla, aptitud_tabla
+
+    if archivo is not None:
+        archivo.agregar(refinada[None], aptitud_refinada)
+    return refinada, aptitud_refinada[0]
+
+
+def algoritmo_genetico(num_generaciones, tabla_vacia, claves, claves_disponibles, horas_por_clave,
+                       tam_poblacion=100, prob_cruce=0.9, prob_mutacion=0.3, elitismo=2,
+                       seleccion="torneo", tam_torneo=3, cruce="columnas",
+                       num_islas=1, intervalo_migracion=10, num_migrantes=2, num_procesos=None, semilla=None,
+                       aptitud="penalizada", peso_exceso=2, peso_cambio=2, parada=None, observadores=None,
+                       busqueda_local=None, tiempo_busqueda=1.0, cache=None, adaptacion=None):
     """
     Ejecuta un algoritmo genético para encontrar una tabla óptima respetando las restricciones.
 
+    La población se conserva entre generaciones: en cada generación se pasan las mejores tablas sin cambios (elitismo)
+    y el resto se forma cruzando y mutando tablas seleccionadas de la generación anterior. Las tablas se guardan
+    codificadas en un solo arreglo de enteros y toda la población se evalúa a la vez. Con 'num_islas' mayor que 1 se
+    usa el modelo de islas en varios procesos (ver 'algoritmo_genetico_islas').
+
     Args:
     - num_generaciones (int): El número de generaciones para ejecutar el algoritmo genético.
     - tabla_vacia (list): Una lista de listas que representa la tabla vacía.
     - claves (list): Una lista de todas las claves de las clases posibles.
     - claves_disponibles (list): Una lista de claves disponibles para insertar en la tabla.
     - horas_por_clave (dict): Un diccionario que mapea claves a la cantidad de horas asignadas.
+    - tam_poblacion (int): Cantidad de tablas en la población (de cada isla).
+    - prob_cruce (float): Probabilidad de cruzar cada pareja de padres.
+    - prob_mutacion (float): Probabilidad de mutar cada hijo.
+    - elitismo (int): Cantidad de mejores tablas que pasan sin cambios a la siguiente generación.
+    - seleccion (str): Método de selección, "torneo" o "ruleta".
+    - tam_torneo (int): Cantidad de tablas que compiten en cada torneo.
+    - cruce (str): Tipo de cruce, "columnas" (días al azar) o "bloque" (días consecutivos).
+    - num_islas (int): Cantidad de poblaciones independientes. Con 1 no se crean procesos.
+    - intervalo_migracion (int): Generaciones entre cada migración entre islas.
+    - num_migrantes (int): Cantidad de tablas que migran de cada isla en cada migración.
+    - num_procesos (int): Cantidad máxima de procesos para las islas. Por omisión, uno por núcleo.
+    - semilla (int, SeedSequence o Generator): Semilla para reproducir la ejecución: la misma semilla da siempre la
+      misma tabla. Si es None, cada ejecución es distinta.
+    - aptitud (str): "penalizada" para distinguir las tablas casi factibles de las que tienen muchos conflictos, o
+      "binaria" para dar aptitud cero a cualquier tabla con celdas "EXCESO" o "CAMBIO".
+    - peso_exceso (float): Penalización por cada celda "EXCESO" con la aptitud "penalizada".
+    - peso_cambio (float): Penalización por cada celda "CAMBIO" con la aptitud "penalizada".
+    - parada (CriterioParada): Criterios para detener la corrida antes de 'num_generaciones' (tiempo límite, aptitud
+      objetivo, estancamiento). Al terminar, 'parada.motivo' indica qué criterio se cumplió.
+    - observadores (list): Funciones que reciben las estadísticas de cada generación, por ejemplo un 'RegistroJSONL'
+      (ver 'evolucionar').
+    - busqueda_local (str): "recocido" o "tabu" para corregir al final los conflictos que le queden a la mejor tabla
+      con una búsqueda local, o None.
+    - tiempo_busqueda (float): Segundos máximos de la búsqueda local.
+    - cache (CacheAptitud): Caché de aptitudes. Sirve también entre corridas y entre semestres. Con islas solo se usa
+      una caché de 'crear_cache_compartida', con la que todas las islas comparten las tablas evaluadas.
+    - adaptacion (ControlAdaptativo): Si se da, las probabilidades de cruce y de mutación y el tamaño de la población
+      se ajustan solos durante la corrida según la diversidad y la fracción de tablas factibles. Con islas, cada isla
+      lleva su propia copia, que pasa de una época a la siguiente; 'adaptacion.historial' reúne los ajustes de todas
+      las islas.
 
     Returns:
     - mejor_tabla (DataFrame): La mejor tabla encontrada por el algoritmo genético.
     """
-    mejor_tabla = []
-    mejor_aptitud = -1
-
-    for _ in range(num_generaciones):
-        # Generamos una población de tablas
-        poblacion = [crear_tabla_aleatoria(tabla_vacia,claves,claves_disponibles,horas_por_clave) for _ in range(30000000000)]
-
-        # Evaluamos la aptitud de cada tabla
-        aptitudes = [calcular_aptitud(tabla) for tabla in poblacion]
-
-        # Encontramos la mejor tabla de la generación
-        indice_mejor = aptitudes.index(max(aptitudes))
-        mejor_tabla_generacion = poblacion[indice_mejor]
-        aptitud_mejor_generacion = aptitudes[indice_mejor]
-        #print(aptitudes)
-        # Si la mejor tabla de esta generación es mejor que la mejor tabla global, la actualizamos
-        if aptitud_mejor_generacion < mejor_aptitud:
-            mejor_tabla = mejor_tabla_generacion
-            mejor_aptitud = aptitud_mejor_generacion
-        
-        mejor_tabla=pd.DataFrame(mejor_tabla)
-        #Tomar la primera fila como nombres de columnas
-        mejor_tabla.columns = mejor_tabla.iloc[0]
-        #Eliminar la primera fila del DataFrame
-        mejor_tabla = mejor_tabla[3:]
-        #Restablecer los índices del DataFrame
-        mejor_tabla.reset_index(drop=True, inplace=True)
-        return mejor_tabla
+    codificacion = Codificacion(tabla_vacia, claves, claves_disponibles, horas_por_clave)
+    mejor_tabla, _ = ejecutar_algoritmo_genetico(num_generaciones, codificacion, tam_poblacion, num_islas,
+                                                 intervalo_migracion, num_migrantes, num_procesos, semilla,
+                                                 prob_cruce=prob_cruce, prob_mutacion=prob_mutacion,
+                                                 elitismo=elitismo, seleccion=seleccion, tam_torneo=tam_torneo,
+                                                 cruce=cruce, aptitud=aptitud, peso_exceso=peso_exceso,
+                                                 peso_cambio=peso_cambio, parada=parada, observadores=observadores,
+                                                 busqueda_local=busqueda_local, tiempo_busqueda=tiempo_busqueda,
+                                                 cache=cache, adaptacion=adaptacion)
+    return tabla_a_dataframe(codificacion.decodificar(mejor_tabla))
 
 
 def crear_horario(horarios):
     """
     Carga un archivo CSV de horarios, filtra y procesa los datos y retorna un DataFrame de Pandas.
 
+    El archivo se lee con 'leer_materias', así que las claves se leen como texto y las lecturas repetidas del mismo
+    archivo salen de la caché binaria.
+
     Args:
     - horarios (str): La ruta del archivo CSV que contiene los horarios.
 
     Returns:
     - dataframe (DataFrame de Pandas): Un DataFrame que contiene los datos procesados de los horarios.
     """
-    dataframe = pd.read_csv(horarios, index_col=None)
+    dataframe = leer_materias(horarios)
     
     # Crear una lista vacía para almacenar los nombres que cumplan con el criterio
     claves_a_eliminar = []
@@ -257,429 +2420,99 @@ def crear_horario(horarios):
     
     return dataframe
 
-#Selcciona una Carrera 
-def seleccionar_carrera(carrera,x,dataframe):
-    if carrera == "IG":
-        return seleccionar_semestre_geologia(x,dataframe)
-    elif carrera == "IC":
-        return seleccionar_semestre_civil(x,dataframe)
-    elif carrera == "IA":
-        return seleccionar_semestre_aero(x,dataframe)
-    elif carrera == "ICC":
-        return seleccionar_semestre_cien_comp(x,dataframe)
-    elif carrera == "IMM":
-        return seleccionar_semestre_minas(x,dataframe)
-    elif carrera =="ISCH":
-        return seleccionar_semestre_hard(x,dataframe)
-    elif carrera == "IST":
-        return seleccionar_semestre_topo(x,dataframe)
-    elif carrera == "ITP":
-        return seleccionar_semestre_procesos(x,dataframe)
-    elif carrera ==  "IF":
-        return seleccionar_semestre_fisica(x,dataframe)
-    elif carrera == "IM":
-        return seleccionar_semestre_mate(x,dataframe)
-
-#De la carrera seleccionada
-#Como argumentos son el número de semestre y el dataframe
-#En cada semestre busca las claves que le corresponden
-#Retorna el semestre con las claves sin repetir
-def seleccionar_semestre_geologia(x,dataframe):
-    if x==1:
-        geologia_1 = dataframe.loc[dataframe['clave'].isin(
-            ['101','102','103','106','107','108','115','216','I101'])].reset_index(drop=True)
-        return duplicados(geologia_1)
-    elif x==2:
-        geologia_2 = dataframe.loc[dataframe['clave'].isin(
-            ['100','104','200','201','202','203','210','211','316','I201'])].reset_index(drop=True)
-        return duplicados(geologia_2)
-    elif x==3:
-        geologia_3 = dataframe.loc[dataframe['clave'].isin(
-            ['209','301','302','303','407','451','454','501','I301'])].reset_index(drop=True)
-        return duplicados(geologia_3)
-    elif x==4:
-        geologia_4 = dataframe.loc[dataframe['clave'].isin(
-            ['206','403','457','470','471','472','503','772','I401'])].reset_index(drop=True)
-        return duplicados(geologia_4)
-    elif x==5:
-        geologia_5 = dataframe.loc[dataframe['clave'].isin(
-            ['416','557','558','571','573','601','634','670','970'])].reset_index(drop=True)
-        return duplicados(geologia_5)
-    elif x==6:
-        geologia_6 = dataframe.loc[dataframe['clave'].isin(
-            ['552','676','771','775','872','873','874'])].reset_index(drop=True)
-        return duplicados(geologia_6)
-    elif x==7:
-        geologia_7 = dataframe.loc[dataframe['clave'].isin(
-            ['71','716','770','801','870','877','974','981'])].reset_index(drop=True)
-        return duplicados(geologia_7)
-    elif x==8:
-        geologia_8 = dataframe.loc[dataframe['clave'].isin(
-            ['510','773','815','856','876','956','971','976'])].reset_index(drop=True)
-        return duplicados(geologia_8)
-    elif x==9:
-        geologia_9 = dataframe.loc[dataframe['clave'].isin(
-            ['74','79','80','930','969','966','973','964','965','928','977',
-             '982','929','950'])].reset_index(drop=True)
-        return duplicados(geologia_9)
-
-def seleccionar_semestre_civil(x, dataframe):
-    if x==1:
-        civil_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CB101','CB102','CB103','I101','IB107','IB108','OC109','UN115','UN216'])].reset_index(drop=True)
-        return duplicados(civil_1)
-    elif x==2:
-        civil_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CB201','CB202','CB203','I201','IB210','IB211','OC209','UN200','UN316'])].reset_index(drop=True)
-        return duplicados(civil_2)
-    elif x==3:
-        civil_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CB217','CB301','CB303','CB305','CB503','I301','LCB217','OC309','OC407'])].reset_index(drop=True)
-        return duplicados(civil_3)
-    elif x==4:
-        civil_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CB402','CB403','CB406','CB410','CB601','CB801','I401','IA703','IB602'])].reset_index(drop=True)
-        return duplicados(civil_4)
-    elif x==5:
-        civil_5 = dataframe.loc[dataframe['clave'].isin(
-            ['IA610','IA800','IB502','IB504','IB506','IB704','IB910','IN501','OC509'])].reset_index(drop=True)
-        return duplicados(civil_5)
-    elif x==6:
-        civil_6 = dataframe.loc[dataframe['clave'].isin(
-            ['I601','IA505','IA611','IB604','IB605','IB606','IB804','IB806','IB911'])].reset_index(drop=True)
-        return duplicados(civil_6)
-    elif x==7:
-        civil_7 = dataframe.loc[dataframe['clave'].isin(
-            ['IA603','IA711','IA712','IB706','IB708','IB803','IB805','IB912','IN701'])].reset_index(drop=True)
-        return duplicados(civil_7)
-    elif x==8:
-        civil_8 = dataframe.loc[dataframe['clave'].isin(
-            ['IA612','IA613','IA705','IA706','IA808','IA809','IA811','IA906','IA921'])].reset_index(drop=True)
-        return duplicados(civil_8)
-    elif x==9:
-        civil_9 = dataframe.loc[dataframe['clave'].isin(
-            ['OC510','VT04','CU06','CU01','CU02','CU03','HH02','EST05','CU05','VT01',
-             'VT03','CU04','EST06'])].reset_index(drop=True)
-        return duplicados(civil_9)
-    elif x==10:
-        civil_10 = dataframe.loc[dataframe['clave'].isin(
-            ['OC510','VT02','EST04','EST02','EST01','EST03','HH04','HH08','HH06','HH03',
-             'HH05','EST06'])].reset_index(drop=True)
-        return duplicados(civil_10)
-
-def seleccionar_semestre_aero(x, dataframe):
-    if x==1:
-        aero_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CB101','CB102','CB103','CI112','I301','LCB103','UN115','UN216'])].reset_index(drop=True)
-        return duplicados(aero_1)
-    elif x==2:
-        aero_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CB201','CB203','CB217','CS312','I401','LCB217','UN200','UN316'])].reset_index(drop=True)
-        return duplicados(aero_2)
-    elif x==3:
-        aero_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CB301','CB302','CB303','CI209','IN501','LCB302','LCB303','OC206',
-             'OC407'])].reset_index(drop=True)
-        return duplicados(aero_3)
-    elif x==4:
-        aero_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CB401','CB406','CI405','CI408','CI409','CI417','IN601','LCB406',
-             'LCI408','LCI417'])].reset_index(drop=True)
-        return duplicados(aero_4)
-    elif x==5:
-        aero_5 = dataframe.loc[dataframe['clave'].isin(
-            ['CI509','CI512','CI531','CI550','CI580','IN701','LCI550','LCI580'])].reset_index(drop=True)
-        return duplicados(aero_5)
-    elif x==6:
-        aero_6 = dataframe.loc[dataframe['clave'].isin(
-            ['CI660','CI662','CI664','LCI660','OPAE3','OPAE1','OPAE2'])].reset_index(drop=True)
-        return duplicados(aero_6)
-    elif x==7:
-        aero_7 = dataframe.loc[dataframe['clave'].isin(
-            ['IA339','IA362','IA363','OC110','CI407','IA948','IA780'])].reset_index(drop=True)
-        return duplicados(aero_7)
-    elif x==8:
-        aero_8 = dataframe.loc[dataframe['clave'].isin(
-            ['IA364','IA419','IA424','IA439','OC112','IA790','IA862','CI764','CI581'])].reset_index(drop=True)
-        return duplicados(aero_8)
-    elif x==9:
-        aero_9 = dataframe.loc[dataframe['clave'].isin(
-            ['CI341','IA428','IA450','LIA447','CL13','IA440'])].reset_index(drop=True)
-        return duplicados(aero_9)
-
-def seleccionar_semestre_cien_comp(x, dataframe):
-    if x==1:
-        computacion_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CB170','CB171','CB172','CB173','CI174','I101','UN115','UN216'])].reset_index(drop=True)
-        return duplicados(computacion_1)
-    elif x==2:
-        computacion_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CB270','CB271','CB272','CI274','I201','UN200','UN316'])].reset_index(drop=True)
-        return duplicados(computacion_2)
-    elif x==3:
-        computacion_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CB370','CB371','CB372','CB373','CI374','I301'])].reset_index(drop=True)
-        return duplicados(computacion_3)
-    elif x==4:
-        computacion_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CB470','CB471','CB473','CI474','CI475','I401','IA478'])].reset_index(drop=True)
-        return duplicados(computacion_4)
-    elif x==5:
-        computacion_5 = dataframe.loc[dataframe['clave'].isin(
-            ['CB571','CI574','CI575','CI576','CI577','CL13','IA578','IN501'])].reset_index(drop=True)
-        return duplicados(computacion_5)
-    elif x==6:
-        computacion_6 = dataframe.loc[dataframe['clave'].isin(
-            ['CI671','CI675','CI676','CI677','CI678','CI679','CS680','IN601'])].reset_index(drop=True)
-        return duplicados(computacion_6)
-    elif x==7:
-        computacion_7 = dataframe.loc[dataframe['clave'].isin(
-            ['CI771','CI775','CI776','IA778','IN701','OC407','OPC01','OPC02',
-             'OPC03','OPC10'])].reset_index(drop=True)
-        return duplicados(computacion_7)
-    elif x==8:
-        computacion_8 = dataframe.loc[dataframe['clave'].isin(
-            ['CI871','CI872','CI876','CI877','IA878','OC206','OPC04','OPC05',
-             'OPC06','OPC11'])].reset_index(drop=True)
-        return duplicados(computacion_8)
-    elif x==9:
-        computacion_9 = dataframe.loc[dataframe['clave'].isin(
-            ['CI972','CI976','CI977','IA978','IA979','OC510','OPC13','OPC07',
-             'OPC08','OPC09'])].reset_index(drop=True)
-        return duplicados(computacion_9)
- 
-def seleccionar_semestre_minas(x, dataframe):
-    if x==1:
-        minas_1 = dataframe.loc[dataframe['clave'].isin(
-            ['101','102','103','106','107','108','115','216','I101'])].reset_index(drop=True)
-        return duplicados(minas_1)
-    elif x==2:
-        minas_2 = dataframe.loc[dataframe['clave'].isin(
-            ['100','104','200','201','202','203','210','211','316','I201'])].reset_index(drop=True)
-        return duplicados(minas_2)
-    elif x==3:
-        minas_3 = dataframe.loc[dataframe['clave'].isin(
-            ['209','301','302','303','407','454','501','I301'])].reset_index(drop=True)
-        return duplicados(minas_3)
-    elif x==4:
-        minas_4 = dataframe.loc[dataframe['clave'].isin(
-            ['206','403','406','451','457','503','555','772','I401'])].reset_index(drop=True)
-        return duplicados(minas_4)
-    elif x==5:
-        minas_5 = dataframe.loc[dataframe['clave'].isin(
-            ['322','326','502','534','601','609','610'])].reset_index(drop=True)
-        return duplicados(minas_5)
-    elif x==6:
-        minas_6 = dataframe.loc[dataframe['clave'].isin(
-            ['323','520','550','553','607','711','775'])].reset_index(drop=True)
-        return duplicados(minas_6)
-    elif x==7:
-        minas_7 = dataframe.loc[dataframe['clave'].isin(
-            ['651','710','801','873','876','914','950'])].reset_index(drop=True)
-        return duplicados(minas_7)
-    elif x==8:
-        minas_8 = dataframe.loc[dataframe['clave'].isin(
-            ['510','757','810','812','916','956'])].reset_index(drop=True)
-        return duplicados(minas_8)
-    elif x==9:
-        minas_9 = dataframe.loc[dataframe['clave'].isin(
-            ['850','917','918','920','071','752','991'])].reset_index(drop=True)
-        return duplicados(minas_9)
-
-def seleccionar_semestre_hard(x, dataframe):
-    if x==1:
-        hard_1 = dataframe.loc[dataframe['clave'].isin(
-            ['101','102','103','114','115','216','I101'])].reset_index(drop=True)
-        return duplicados(hard_1)
-    elif x==2:
-        hard_2 = dataframe.loc[dataframe['clave'].isin(
-            ['100','104','200','201','202','203','215','316','I201'])].reset_index(drop=True)
-        return duplicados(hard_2)
-    elif x==3:
-        hard_3 = dataframe.loc[dataframe['clave'].isin(
-            ['214','301','302','313','315','407','634','I301'])].reset_index(drop=True)
-        return duplicados(hard_3)
-    elif x==4:
-        hard_4 = dataframe.loc[dataframe['clave'].isin(
-            ['206','403','413','415','417','440','503','I401'])].reset_index(drop=True)
-        return duplicados(hard_4)
-    elif x==5:
-        hard_5 = dataframe.loc[dataframe['clave'].isin(
-            ['515','517','518','540','541','601','643','IC01'])].reset_index(drop=True)
-        return duplicados(hard_5)
-    elif x==6:
-        hard_6 = dataframe.loc[dataframe['clave'].isin(
-            ['519','533','615','618','640','746','747'])].reset_index(drop=True)
-        return duplicados(hard_6)
-    elif x==7:
-        hard_7 = dataframe.loc[dataframe['clave'].isin(
-            ['725','728','729','741','748','801','846'])].reset_index(drop=True)
-        return duplicados(hard_7)
-    elif x==8:
-        hard_8 = dataframe.loc[dataframe['clave'].isin(
-            ['510','727','828','832','833','842','845'])].reset_index(drop=True)
-        return duplicados(hard_8)
-    elif x==9: #Noveno semestre, optativas de tópicos
-        hard_9 = dataframe.loc[dataframe['clave'].isin(
-            ['962', '967', '923','948','961','CL13','963'])].reset_index(drop=True)
-        return duplicados(hard_9)
-    elif x==10: #Noveno semestre, optativas de ciencias 
-        hard_10 = dataframe.loc[dataframe['clave'].isin(
-            ['OPH02','938','936','OPH01','931'])].reset_index(drop=True)
-        return duplicados(hard_10)  
-    
-def seleccionar_semestre_topo(x, dataframe):
-    if x==1:
-        topo_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CB101','CB102','CB103','I101','IB107','IB108','OC109','UN115','UN216'])].reset_index(drop=True)
-        return duplicados(topo_1)
-    elif x==2:
-        topo_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CB201','CB202','CB203','I201','IB210','IB211','IB454','OC209','UN200',
-             'UN316'])].reset_index(drop=True)
-        return duplicados(topo_2)
-    elif x==3:
-        topo_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CB217','CB301','CB303','CB304','CB305','I301','IB328','IB329','LCB217',
-             'OC309'])].reset_index(drop=True)
-        return duplicados(topo_3)
-    elif x==4:
-        topo_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CB403','CB507','CS310','I401','IA421','IA431','IA432','IB304',
-             'IB330','IB508'])].reset_index(drop=True)
-        return duplicados(topo_4)
-    elif x==5:
-        topo_5 = dataframe.loc[dataframe['clave'].isin(
-            ['321','IA322','IA326','IA423','IA426','IA626','IA627','IB321',
-             'IB520','IB602'])].reset_index(drop=True)
-        return duplicados(topo_5)
-    elif x==6:
-        topo_6 = dataframe.loc[dataframe['clave'].isin(
-            ['IA722','IA723','IA724','IB405','IB433','IB629','IB805','OC207',
-             'OC407'])].reset_index(drop=True)
-        return duplicados(topo_6)
-    elif x==7:
-        topo_7 = dataframe.loc[dataframe['clave'].isin(
-            ['631','IA522','IA523','IA619','IA621','IA623','IA631','OC505',
-             'OC510'])].reset_index(drop=True)
-        return duplicados(topo_7)
-
-def seleccionar_semestre_procesos(x, dataframe):
-    if x==1:
-        procesos_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CB103','LCB103','CB102','CB101','CI112','UN216','UN115','I101'])].reset_index(drop=True)
-        return duplicados(procesos_1)
-    elif x==2:
-        procesos_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CB217','LCB217','CB201','CB203','CS312','UN316','UN200','I201'])].reset_index(drop=True)
-        return duplicados(procesos_2)
-    elif x==3:
-        procesos_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CB301','LCB303','CB303','CB302','LCB302','CI209','OC206','OC407','I301'])].reset_index(drop=True)
-        return duplicados(procesos_3)
-    elif x==4:
-        procesos_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CB401','CI409','CB406','LCB406','CB403','CI408','LCI408','CI417','LCI417',
-             'I401'])].reset_index(drop=True)
-        return duplicados(procesos_4)
-    elif x==5:
-        procesos_5 = dataframe.loc[dataframe['clave'].isin(
-            ['CI509','CI664','CI660','CI665','CI662','CI531','IN501'])].reset_index(drop=True)
-        return duplicados(procesos_5)
-    elif x==6:
-        procesos_6 = dataframe.loc[dataframe['clave'].isin(
-            ['CI764','CI762','IA604','CI631','CU01','CS610','IN601'])].reset_index(drop=True)
-        return duplicados(procesos_6)
-    elif x==7:
-        procesos_7 = dataframe.loc[dataframe['clave'].isin(
-            ['CB801','CI862','IA704','CI720','CS710','CS715','IN71'])].reset_index(drop=True)
-        return duplicados(procesos_7)
-    elif x==8:
-        procesos_8 = dataframe.loc[dataframe['clave'].isin(
-            ['IA861','IA840','IA870','IA959','IA880','IA850','IA890','IN810'])].reset_index(drop=True)
-        return duplicados(procesos_8)
-    elif x==9:
-        procesos_9 = dataframe.loc[dataframe['clave'].isin(
-            ['IA830','IA937','IA950','IA860','CL13','IA995','IA980',
-             'IA990','IA960','IA820','IA939'])].reset_index(drop=True)
-        return duplicados(procesos_9)
-
-def seleccionar_semestre_fisica(x, dataframe):
-    if x==1:
-        fisica_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CS101','CS102','CS103','CS104','I101','UN101','UN102'])].reset_index(drop=True)
-        return duplicados(fisica_1)
-    elif x==2:
-        fisica_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CS201','CS202','CS203','CS204','I201','PE201','UN201','UN202'])].reset_index(drop=True)
-        return duplicados(fisica_2)
-    elif x==3:
-        fisica_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CI301','CI302','CS301','CS303','CS304','I301','PE301'])].reset_index(drop=True)
-        return duplicados(fisica_3)
-    elif x==4:
-        fisica_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CI401','CI402','CI403','CS401','CS404','I401','PE401','SH401'])].reset_index(drop=True)
-        return duplicados(fisica_4)
-    elif x==5:
-        fisica_5 = dataframe.loc[dataframe['clave'].isin(
-            ['CI501','CI502','CI503','CS501','SH501','PE501','SH502'])].reset_index(drop=True)
-        return duplicados(fisica_5)
-    elif x==6:
-        fisica_6 = dataframe.loc[dataframe['clave'].isin(
-            ['CI601','CI602','CI603','CS601','PE601','SH602','SH601'])].reset_index(drop=True)
-        return duplicados(fisica_6)
-    elif x==7:
-        fisica_7 = dataframe.loc[dataframe['clave'].isin(
-            ['CI701','CI702','CI703','CI704','IA701','PE701','SH701'])].reset_index(drop=True)
-        return duplicados(fisica_7)
-    elif x==8:
-        fisica_8 = dataframe.loc[dataframe['clave'].isin(
-            ['IA801','SH801','OPIM01','OPIF01','OPIF04','OPIF05','OPIF06','OPIF13','OPIF13'])].reset_index(drop=True)
-        return duplicados(fisica_8)
-    elif x==9:
-        fisica_9 = dataframe.loc[dataframe['clave'].isin(
-            ['IA901','SH901','PE901','SH902','OPIM04','OPIF07','OPIF11','OPIF12','OPIF14'])].reset_index(drop=True)
-        return duplicados(fisica_9)
-
-def seleccionar_semestre_mate(x, dataframe):
-    if x==1:
-        mate_1 = dataframe.loc[dataframe['clave'].isin(
-            ['CS101','CS102','CS103','CS104','I101','UN101','UN102'])].reset_index(drop=True)
-        return duplicados(mate_1)
-    elif x==2:
-        mate_2 = dataframe.loc[dataframe['clave'].isin(
-            ['CS201','CS202','CS204','CS205','I201','PE201','UN201','UN202'])].reset_index(drop=True)
-        return duplicados(mate_2)
-    elif x==3:
-        mate_3 = dataframe.loc[dataframe['clave'].isin(
-            ['CI301','CI302','CS301','CS304','CS305','I301','PE301'])].reset_index(drop=True)
-        return duplicados(mate_3)
-    elif x==4:
-        mate_4 = dataframe.loc[dataframe['clave'].isin(
-            ['CI401','CI402','CI404','CS401','CS404','I401','PE401','SH401'])].reset_index(drop=True)
-        return duplicados(mate_4)
-    elif x==5:
-        mate_5 = dataframe.loc[dataframe['clave'].isin(
-            ['CI504','CI505','CI506','CS501','SH501','PE501','SH502'])].reset_index(drop=True)
-        return duplicados(mate_5)
-    elif x==6:
-        mate_6 = dataframe.loc[dataframe['clave'].isin(
-            ['CI604','CI605','CI606','CS601','PE601','SH603','SH601'])].reset_index(drop=True)
-        return duplicados(mate_6)
-    elif x==7:
-        mate_7 = dataframe.loc[dataframe['clave'].isin(
-            ['CI705','CI706','CI707','IA702','PE701','SH702'])].reset_index(drop=True)
-        return duplicados(mate_7)
-    elif x==8:
-        mate_8 = dataframe.loc[dataframe['clave'].isin(
-            ['IA802','IA803','SH801','OPIM01','OPIM02','OPIM07'])].reset_index(drop=True)
-        return duplicados(mate_8)
-    elif x==9:
-        mate_9 = dataframe.loc[dataframe['clave'].isin(
-            ['IA902','SH901','PE901','SH903','OPIM04','OPIM05','OPIM08'])].reset_index(drop=True)
-        return duplicados(mate_9)
-    
+# Archivo con las claves de cada semestre de cada carrera
+RUTA_PLANES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "planes_de_estudio.json")
+
+
+def cargar_planes(ruta=RUTA_PLANES):
+    """
+    Carga los planes de estudio: para cada carrera, la lista de sus semestres con su nombre y sus claves.
+
+    Para agregar una carrera o cambiar las claves de un semestre basta con editar el archivo, sin cambiar el código.
+
+    Args:
+    - ruta (str): La ruta del archivo JSON con los planes de estudio.
+
+    Returns:
+    - planes (dict): Un diccionario que mapea cada carrera a una lista de semestres; cada semestre es un diccionario
+      con su nombre ("semestre") y la lista de sus claves ("claves"). El semestre 1 es el primero de la lista.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+class IndiceCarreras:
+    def __init__(self, dataframe, planes=None):
+        """
+        Constructor de la clase IndiceCarreras.
+
+        Indexa el DataFrame de materias por 'clave' una sola vez y precalcula las filas de cada semestre de cada
+        carrera, de modo que seleccionar un semestre solo recorre las filas de sus claves en lugar de todo el
+        DataFrame. Las filas conservan el orden del DataFrame original.
+
+        Args:
+            dataframe (DataFrame de Pandas): Las materias, como las regresa 'crear_horario'.
+            planes (dict): Los planes de estudio, como los regresa 'cargar_planes'. Por omisión se cargan de
+                'RUTA_PLANES'.
+        """
+        self.dataframe = dataframe.reset_index(drop=True)
+        self.planes = cargar_planes() if planes is None else planes
+
+        # Filas de cada clave en el DataFrame
+        filas_por_clave = self.dataframe.groupby("clave", sort=False).indices
+
+        self.filas = {}
+        for carrera, semestres in self.planes.items():
+            for numero, semestre in enumerate(semestres, start=1):
+                claves = dict.fromkeys(semestre["claves"])
+                filas = [filas_por_clave[clave] for clave in claves if clave in filas_por_clave]
+                self.filas[carrera, numero] = np.sort(np.concatenate(filas)) if filas else np.array([], dtype=int)
+
+    def carreras(self):
+        """
+        Regresa las carreras de los planes de estudio, en el orden del archivo.
+        """
+        return list(self.planes)
+
+    def semestres(self, carrera):
+        """
+        Regresa los nombres de los semestres de una carrera; el semestre número 1 es el primero de la lista.
+        """
+        return [semestre["semestre"] for semestre in self.planes[carrera]]
+
+    def seleccionar(self, carrera, numero_semestre):
+        """
+        Selecciona las materias de un semestre de una carrera.
+
+        Args:
+            carrera (str): La carrera, por ejemplo "IG".
+            numero_semestre (int): El número del semestre, empezando en 1.
+
+        Returns:
+            DataFrame de Pandas: Las filas de las claves del semestre, sin filas repetidas.
+        """
+        if (carrera, numero_semestre) not in self.filas:
+            raise ValueError(f"Semestre desconocido: {carrera} {numero_semestre}")
+        semestre = self.dataframe.iloc[self.filas[carrera, numero_semestre]].reset_index(drop=True)
+        return duplicados(semestre)
+
+
+def seleccionar_carrera(carrera, x, dataframe):
+    """
+    Selecciona las materias del semestre 'x' de una carrera según los planes de estudio.
+
+    Args:
+    - carrera (str): La carrera, por ejemplo "IG".
+    - x (int): El número del semestre, empezando en 1.
+    - dataframe (DataFrame de Pandas o IndiceCarreras): Las materias. Para seleccionar varios semestres conviene pasar
+      un 'IndiceCarreras', que se construye una sola vez.
+
+    Returns:
+    - semestre (DataFrame de Pandas): Las materias del semestre sin filas repetidas.
+    """
+    indice = dataframe if isinstance(dataframe, IndiceCarreras) else IndiceCarreras(dataframe)
+    return indice.seleccionar(carrera, x)
+
 
 def variables_para_el_algoritmo(semestre):
     """
@@ -705,9 +2538,284 @@ def variables_para_el_algoritmo(semestre):
     return tabla_vacia, claves, claves_disponibles, horas_por_clave
 
 
-def obtener_tres_mejores_tablas(num_generaciones, tabla_vacia, claves, claves_disponibles, horas_por_clave):
+def unir_tablas(codificacion, tablas):
     """
-    Obtiene las tres mejores tablas de horarios generadas por el algoritmo genético.
+    Decodifica varias tablas y las une lado a lado, separadas por una columna "-", para mostrarlas o guardarlas juntas.
+
+    Args:
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - tablas (list): Las tablas codificadas, arreglos de enteros de forma (horas, días).
+
+    Returns:
+    - df_tablas (DataFrame de Pandas): Las tablas unidas.
+    """
+    tablas = [tabla_a_dataframe(codificacion.decodificar(tabla)) for tabla in tablas]
+
+    # Crear una columna vacía llamada "-"
+    columna_vacia = pd.DataFrame(columns=["-"])
+
+    # Concatenar las tablas y la columna vacía
+    df_tablas = pd.concat([tabla.join(columna_vacia) for tabla in tablas], axis=1)
+
+    return df_tablas.fillna("-")
+
+
+def leer_tablas_csv(ruta, codificacion):
+    """
+    Lee un archivo CSV con tablas unidas por 'unir_tablas' (como lo guarda 'guardar_tabla_csv' en la interfaz o
+    'horarios_lote') y las codifica.
+
+    Las claves que ya no están en la codificación se leen como celdas vacías.
+
+    Args:
+    - ruta (str): La ruta del archivo CSV.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+
+    Returns:
+    - tablas (list): Las tablas codificadas, arreglos de enteros de forma (horas, días), en el orden del archivo (la
+      mejor primero).
+    """
+    datos = pd.read_csv(ruta, header=None, dtype=str, keep_default_na=False)
+
+    # Cada tabla ocupa la columna de las horas, una columna por día y la columna "-"
+    ancho = codificacion.num_dias + 2
+    if datos.shape[0] != codificacion.num_horas + 1 or datos.shape[1] % ancho != 0:
+        raise ValueError(f"El archivo {ruta} no tiene tablas de {codificacion.num_horas} horas y "
+                         f"{codificacion.num_dias} días")
+
+    indice = {str(clave): codigo for clave, codigo in codificacion.indice.items()}
+    tablas = []
+    for inicio in range(0, datos.shape[1], ancho):
+        celdas = datos.iloc[1:, inicio + 1:inicio + 1 + codificacion.num_dias].to_numpy()
+        tablas.append(np.array([[indice.get(celda, VACIO) for celda in fila] for fila in celdas], dtype=np.int64))
+    return tablas
+
+
+def corrida_independiente(num_generaciones, codificacion, num_tablas, distancia_minima, opciones_ga):
+    """
+    Ejecuta una corrida completa del algoritmo genético y regresa sus mejores tablas distintas. Se usa para ejecutar
+    varias corridas en procesos separados.
+
+    Args:
+    - num_generaciones (int): El número de generaciones de la corrida.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - num_tablas (int): Cantidad de tablas distintas a guardar.
+    - distancia_minima (int): Cantidad mínima de celdas distintas entre dos tablas guardadas.
+    - opciones_ga (dict): Parámetros que se pasan a 'ejecutar_algoritmo_genetico'.
+
+    Returns:
+    - archivo (ArchivoMejores): Las mejores tablas distintas de la corrida.
+    - motivo (str): El criterio de parada que se cumplió, o None si la corrida no tiene 'parada'.
+    """
+    archivo = ArchivoMejores(num_tablas, distancia_minima)
+    ejecutar_algoritmo_genetico(num_generaciones, codificacion, archivo=archivo, **opciones_ga)
+    parada = opciones_ga.get("parada")
+    return archivo, parada.motivo if parada is not None else None
+
+
+def serie_luby(i):
+    """
+    Regresa el término 'i' (empezando en 1) de la serie de Luby: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+    """
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+def resolver_exacto(codificacion, max_nodos=100000, tiempo_limite=1.0, generador=None, nodos_reinicio=50,
+                    parada=None):
+    """
+    Busca una tabla óptima con búsqueda con retroceso (backtracking) y reinicios aleatorios.
+
+    Cumple las mismas reglas que 'etiquetar_cambios': cada clave usa en un día una hora o dos horas seguidas, nunca
+    más. Por eso una clave se coloca como bloques de una o dos horas en días distintos, que se eligen en orden
+    creciente para no repetir la misma solución en otro orden. Las horas libres de cada día son una máscara de bits,
+    así que revisar si un bloque cabe es una operación AND. Después de cada bloque se revisa hacia adelante (forward
+    checking) que cada clave todavía quepa en sus días restantes, y se sigue con la clave con menos holgura. Si las
+    horas no caben en la tabla, se permite dejar fuera tantas horas como sobran, de modo que la tabla se llena.
+
+    El orden de las opciones es aleatorio, y un mal orden al principio puede hacer que la búsqueda se quede explorando
+    una rama sin solución. Por eso cada intento se detiene tras unos pocos nodos y se vuelve a empezar con otro orden.
+    Los límites de los intentos son 'nodos_reinicio' por la serie de Luby (1, 1, 2, 1, 1, 2, 4, ...; ver
+    'serie_luby'): casi todos los intentos son cortos, pero de vez en cuando hay uno más largo, así que con tiempo
+    suficiente un intento recorre todo el árbol. En semestres holgados suele bastar el primer intento; en tablas casi
+    llenas la búsqueda puede agotar sus límites aunque exista una tabla óptima.
+
+    Args:
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - max_nodos (int): Cantidad máxima de bloques colocados en total, sumando todos los intentos.
+    - tiempo_limite (float): Segundos máximos de la búsqueda.
+    - generador (Generator o int): Generador aleatorio para el orden de las opciones; semillas distintas dan tablas
+      distintas.
+    - nodos_reinicio (int): Nodos de un intento corto antes de reiniciar, o None para no reiniciar.
+    - parada (CriterioParada): Si se da, ya iniciado, la búsqueda también se detiene si se cancela o si se acaba su
+      tiempo límite.
+
+    Returns:
+    - tabla (ndarray): Una tabla con aptitud 'codificacion.aptitud_maxima', o None si no existe, si se llegó al
+      límite de nodos o de tiempo o si se canceló.
+    - nodos (int): Cantidad de nodos explorados en todos los intentos.
+    """
+    azar = random.Random(int(crear_generador(generador).integers(2 ** 63)))
+    num_horas, num_dias = codificacion.num_horas, codificacion.num_dias
+    pendientes = {int(codigo): min(int(codificacion.horas[codigo]), 2 * num_dias)
+                  for codigo in np.flatnonzero(codificacion.horas > 0)}
+    ultimo_dia = dict.fromkeys(pendientes, -1)
+    libres = [(1 << num_horas) - 1] * num_dias
+    colocados = []
+    if parada is not None and parada.tiempo_limite is not None:
+        tiempo_limite = min(tiempo_limite, parada.tiempo_limite - parada.tiempo_transcurrido)
+    fin = time.perf_counter() + tiempo_limite
+    cancelado = (lambda: parada.cancelado) if parada is not None else (lambda: False)
+    nodos_reinicio = max_nodos if nodos_reinicio is None else nodos_reinicio
+    intento = 1
+    estado = {"nodos": 0, "limite": min(max_nodos, nodos_reinicio), "agotado": False,
+              "sobrantes": max(0, sum(pendientes.values()) - num_horas * num_dias)}
+
+    def capacidad(codigo):
+        # Horas que la clave aún puede usar: dos en los días con dos horas seguidas libres, una si solo hay una
+        total = 0
+        for dia in range(ultimo_dia[codigo] + 1, num_dias):
+            libre = libres[dia]
+            total += 2 if libre & (libre >> 1) else (1 if libre else 0)
+        return total
+
+    def elegir_clave():
+        # Regresa la clave con menos holgura, o False si las horas que ya no caben son más de las que pueden sobrar
+        elegida, menor_holgura, faltantes = None, None, 0
+        for codigo, horas in pendientes.items():
+            if horas == 0:
+                continue
+            holgura = capacidad(codigo) - horas
+            faltantes += max(0, -holgura)
+            if elegida is None or holgura < menor_holgura:
+                elegida, menor_holgura = codigo, holgura
+        if faltantes > estado["sobrantes"]:
+            return False
+        return elegida
+
+    def buscar():
+        codigo = elegir_clave()
+        if codigo is False:
+            return False
+        if codigo is None:
+            return True
+
+        estado["nodos"] += 1
+        if estado["nodos"] > estado["limite"] or time.perf_counter() > fin or cancelado():
+            estado["agotado"] = True
+            return False
+
+        # Bloques posibles de la clave en los días siguientes; primero los de dos horas, que usan menos días
+        horas = pendientes[codigo]
+        opciones = []
+        for dia in range(ultimo_dia[codigo] + 1, num_dias):
+            libre = libres[dia]
+            for duracion, inicios in ((2, libre & (libre >> 1)), (1, libre)):
+                if duracion <= horas:
+                    opciones += [(dia, inicio, duracion) for inicio in range(num_horas) if inicios >> inicio & 1]
+        azar.shuffle(opciones)
+        opciones.sort(key=lambda opcion: -opcion[2])
+
+        anterior = ultimo_dia[codigo]
+        for dia, inicio, duracion in opciones:
+            mascara = ((1 << duracion) - 1) << inicio
+            libres[dia] ^= mascara
+            pendientes[codigo] -= duracion
+            ultimo_dia[codigo] = dia
+            colocados.append((codigo, dia, inicio, duracion))
+            if buscar():
+                return True
+            colocados.pop()
+            libres[dia] ^= mascara
+            pendientes[codigo] += duracion
+            ultimo_dia[codigo] = anterior
+            if estado["agotado"]:
+                return False
+
+        # Como última opción, las horas que faltan de la clave se quedan fuera, si todavía pueden sobrar horas
+        if horas <= estado["sobrantes"]:
+            estado["sobrantes"] -= horas
+            pendientes[codigo] = 0
+            if buscar():
+                return True
+            pendientes[codigo] = horas
+            estado["sobrantes"] += horas
+        return False
+
+    # Al agotar un intento la búsqueda deshace todo lo colocado, así que el siguiente parte de la tabla vacía
+    while not buscar():
+        if not estado["agotado"] or estado["nodos"] > max_nodos or time.perf_counter() > fin or cancelado():
+            # Si el intento no se agotó, se recorrió todo el árbol y no hay tabla óptima
+            return None, estado["nodos"]
+        intento += 1
+        estado["limite"] = min(max_nodos, estado["nodos"] + nodos_reinicio * serie_luby(intento))
+        estado["agotado"] = False
+
+    tabla = np.full((num_horas, num_dias), VACIO, dtype=np.int64)
+    for codigo, dia, inicio, duracion in colocados:
+        tabla[inicio:inicio + duracion, dia] = codigo
+    return tabla, estado["nodos"]
+
+
+def soluciones_exactas(codificacion, archivo, max_intentos, max_nodos=100000, tiempo_limite=1.0, generador=None,
+                       parada=None):
+    """
+    Agrega al archivo tablas óptimas de 'resolver_exacto', cada una con un orden aleatorio distinto, hasta llenarlo.
+
+    Args:
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - archivo (ArchivoMejores): El archivo donde se guardan las tablas distintas.
+    - max_intentos (int): Cantidad máxima de búsquedas.
+    - max_nodos, tiempo_limite: Los límites de cada búsqueda (ver 'resolver_exacto').
+    - generador (Generator o int): Generador aleatorio de numpy, o semilla para crearlo.
+    - parada (CriterioParada): Si se da, ya iniciado, se deja de buscar si se cancela o si se acaba su tiempo límite,
+      también a media búsqueda.
+
+    Returns:
+    - completo (bool): True si el archivo quedó lleno. Si una búsqueda no encuentra tabla, se deja de intentar.
+    """
+    generador = crear_generador(generador)
+    for _ in range(max_intentos):
+        if parada is not None and (parada.cancelado or (parada.tiempo_limite is not None and
+                                                        parada.tiempo_transcurrido >= parada.tiempo_limite)):
+            break
+        tabla, _ = resolver_exacto(codificacion, max_nodos, tiempo_limite, generador, parada=parada)
+        if tabla is None:
+            break
+        archivo.agregar(tabla[None], calcular_aptitud_poblacion(tabla[None], codificacion))
+        if len(archivo.tablas) == archivo.num_mejores:
+            return True
+    return False
+
+
+def obtener_tres_mejores_tablas(num_generaciones, tabla_vacia, claves, claves_disponibles, horas_por_clave,
+                                num_tablas=3, distancia_minima=5, num_corridas=1, motor="genetico", max_nodos=100000,
+                                tiempo_exacto=1.0, tabla_previa=None, **opciones_ga):
+    """
+    Obtiene las tres mejores tablas distintas de horarios generadas por el algoritmo genético.
+
+    Las tablas salen de una sola corrida: se guardan las mejores tablas sin repetir y que difieren entre sí en al menos
+    'distancia_minima' celdas. Si se piden varias corridas, se ejecutan al mismo tiempo en procesos separados (cada una
+    con una sola población) y se juntan sus mejores tablas. Con 'parada' en 'opciones_ga' el tiempo límite es el
+    mismo para todas las corridas y 'parada.motivo' reúne los criterios con los que terminaron; 'parada.cancelar'
+    detiene todas las corridas (ver 'CriterioParada.compartir_cancelacion').
+    Los 'observadores' se copian a cada corrida, así que deben poder enviarse a otro proceso (como 'RegistroJSONL').
+
+    Con motor "exacto" las tablas se buscan primero con 'resolver_exacto', que en semestres con holgura suele
+    encontrar tablas óptimas rápidamente; en tablas casi llenas puede tardar más que el algoritmo genético. Si la
+    búsqueda llega a su límite de nodos o de tiempo antes de reunir 'num_tablas' tablas, el algoritmo genético completa
+    el resto. La búsqueda usa el mismo 'parada' que el algoritmo genético: se detiene si se cancela y no pasa de su
+    tiempo límite, que cuenta para las dos fases. Cada fase usa su propia semilla, derivada de 'semilla' con
+    'derivar_semillas'.
+
+    Con 'tabla_previa' se reprograma un semestre ya resuelto: el algoritmo genético parte de la mejor tabla del
+    archivo y solo mueve las celdas afectadas por los cambios en las claves (ver 'poblacion_desde_tabla'), así que un
+    cambio pequeño se resuelve moviendo pocas celdas y suele tardar menos que una corrida completa. Un cambio grande
+    puede tardar más, y si no se llega a la aptitud máxima se repite la corrida desde cero. Solo se puede con el motor
+    "genetico", porque la búsqueda exacta siempre parte de la tabla vacía.
 
     Args:
     - num_generaciones (int): El número de generaciones que el algoritmo genético debe ejecutar.
@@ -715,20 +2823,268 @@ def obtener_tres_mejores_tablas(num_generaciones, tabla_vacia, claves, claves_di
     - claves (lista): Una lista de las claves disponibles para asignar en el horario.
     - claves_disponibles (lista): Una copia de la lista de claves disponibles para asignar en el horario.
     - horas_por_clave (dict): Un diccionario que mapea las claves a la cantidad de horas asignadas.
+    - num_tablas (int): Cantidad de tablas distintas a mostrar.
+    - distancia_minima (int): Cantidad mínima de celdas distintas entre dos tablas mostradas.
+    - num_corridas (int): Cantidad de corridas independientes del algoritmo genético.
+    - motor (str): "genetico" o "exacto".
+    - max_nodos (int): Nodos máximos de cada búsqueda exacta.
+    - tiempo_exacto (float): Segundos máximos de cada búsqueda exacta.
+    - tabla_previa (str): La ruta de un archivo CSV guardado con 'guardar_tabla_csv' para este semestre, o None.
+    - opciones_ga: Parámetros opcionales que se pasan a 'algoritmo_genetico' (tam_poblacion, prob_cruce, etc.).
 
     Returns:
     - df_tres_mejores_tablas (DataFrame de Pandas): Un DataFrame que contiene las tres mejores tablas de horarios.
     """
-    tres_mejores_tablas = []
+    codificacion = Codificacion(tabla_vacia, claves, claves_disponibles, horas_por_clave)
+    archivo = ArchivoMejores(num_tablas, distancia_minima)
+
+    if motor not in ("genetico", "exacto"):
+        raise ValueError(f"Motor desconocido: {motor}")
+    if tabla_previa is not None and motor == "exacto":
+        raise ValueError("El motor exacto no puede partir de una tabla previa; usa el motor \"genetico\"")
+    if tabla_previa is not None:
+        opciones_ga["tabla_previa"] = leer_tablas_csv(tabla_previa, codificacion)[0]
+    if motor == "exacto":
+        parada = opciones_ga.get("parada")
+        if parada is not None:
+            parada.iniciar(codificacion)
+        # La búsqueda exacta y el algoritmo genético usan flujos aleatorios distintos
+        semilla_exacta, opciones_ga["semilla"] = derivar_semillas(opciones_ga.get("semilla"), 2)
+        completo = soluciones_exactas(codificacion, archivo, 2 * num_tablas, max_nodos, tiempo_exacto,
+                                      semilla_exacta, parada)
+        if completo:
+            if parada is not None:
+                parada.motivo = "exacto"
+                parada.terminar()
+            return unir_tablas(codificacion, archivo.tablas)
+
+    if num_corridas > 1:
+        # Cada corrida recibe su propia semilla, derivada de la semilla dada
+        semillas = derivar_semillas(opciones_ga.pop("semilla", None), num_corridas)
+        opciones_ga["num_islas"] = 1
+        if opciones_ga.get("cache") is not None and not opciones_ga["cache"].es_compartida():
+            # Igual que con las islas, una caché local no sirve en otros procesos
+            opciones_ga["cache"] = None
+        parada = opciones_ga.get("parada")
+        if parada is not None and parada.inicio is None:
+            parada.iniciar(codificacion)
+        motivos = []
+
+        # Cada corrida recibe una copia de 'parada'; la cancelación les llega por un evento en un proceso servidor
+        administrador = Manager() if parada is not None else None
+        if administrador is not None:
+            parada.compartir_cancelacion(administrador.Event())
+        try:
+            with ProcessPoolExecutor(max_workers=opciones_ga.pop("num_procesos", None)) as ejecutor:
+                futuros = [ejecutor.submit(corrida_independiente, num_generaciones, codificacion, num_tablas,
+                                           distancia_minima, dict(opciones_ga, semilla=semilla_corrida))
+                           for semilla_corrida in semillas]
+                for futuro in futuros:
+                    archivo_corrida, motivo = futuro.result()
+                    archivo.unir(archivo_corrida)
+                    motivos.append(motivo)
+        finally:
+            if administrador is not None:
+                parada.compartir_cancelacion(None)
+                administrador.shutdown()
+
+        if parada is not None:
+            parada.motivo = ", ".join(sorted(set(motivos)))
+            parada.terminar()
+    else:
+        ejecutar_algoritmo_genetico(num_generaciones, codificacion, archivo=archivo, **opciones_ga)
+
+    return unir_tablas(codificacion, archivo.tablas)
+
+
+class IndiceConflictos:
+    def __init__(self):
+        """
+        Constructor de la clase IndiceConflictos.
+
+        Índice disperso de los recursos compartidos entre semestres (profesores, salones) ocupados en cada hora. Solo
+        guarda las llaves (recurso, día, hora) que están en uso, con cuántas clases las usan, de modo que revisar si
+        un recurso está libre o registrar una clase cuesta O(1), sin recorrer los horarios de los demás semestres.
+        'num_choques' cuenta los usos de más: un recurso usado por 3 clases a la misma hora son 2 choques.
+        """
+        self.ocupacion = {}
+        self.num_choques = 0
+
+    def usos(self, recurso, dia, hora):
+        """
+        Regresa cuántas clases usan el recurso en ese día y hora.
+        """
+        return self.ocupacion.get((recurso, dia, hora), 0)
+
+    def agregar(self, recursos, dia, hora):
+        """
+        Registra una clase que usa los recursos dados en ese día y hora.
+
+        Args:
+            recursos (tuple): Los recursos de la clase, por ejemplo (("no_empleado", 1234),).
+            dia (int): El índice del día.
+            hora (int): El índice de la hora.
+        """
+        for recurso in recursos:
+            llave = (recurso, dia, hora)
+            usos = self.ocupacion.get(llave, 0)
+            if usos:
+                self.num_choques += 1
+            self.ocupacion[llave] = usos + 1
+
+    def quitar(self, recursos, dia, hora):
+        """
+        Quita una clase registrada con 'agregar'.
+        """
+        for recurso in recursos:
+            llave = (recurso, dia, hora)
+            usos = self.ocupacion[llave] - 1
+            if usos:
+                self.num_choques -= 1
+                self.ocupacion[llave] = usos
+            else:
+                del self.ocupacion[llave]
+
+    def agregar_tabla(self, tabla, recursos):
+        """
+        Registra todas las clases de una tabla codificada.
+
+        Args:
+            tabla (ndarray): Arreglo de enteros de forma (horas, días).
+            recursos (list): Los recursos de cada código de clave de la tabla.
+        """
+        for hora, dia in zip(*np.nonzero(tabla != VACIO)):
+            self.agregar(recursos[tabla[hora, dia]], int(dia), int(hora))
+
+    def quitar_tabla(self, tabla, recursos):
+        """
+        Quita todas las clases de una tabla registrada con 'agregar_tabla'.
+        """
+        for hora, dia in zip(*np.nonzero(tabla != VACIO)):
+            self.quitar(recursos[tabla[hora, dia]], int(dia), int(hora))
+
+    def matriz_choques(self, recursos, num_horas, num_dias):
+        """
+        Calcula los choques que produciría cada clave de un semestre en cada celda con las clases ya registradas.
+
+        Solo se recorren las llaves en uso del índice, no todas las combinaciones de recurso, día y hora.
+
+        Args:
+            recursos (list): Los recursos de cada código de clave del semestre.
+            num_horas (int): Número de horas de la tabla.
+            num_dias (int): Número de días de la tabla.
+
+        Returns:
+            ndarray: Arreglo de forma (claves, horas, días) para 'evaluar_poblacion'.
+        """
+        claves_por_recurso = {}
+        for codigo, recursos_clave in enumerate(recursos):
+            for recurso in recursos_clave:
+                claves_por_recurso.setdefault(recurso, []).append(codigo)
+
+        choques = np.zeros((len(recursos), num_horas, num_dias), dtype=np.int64)
+        for (recurso, dia, hora), usos in self.ocupacion.items():
+            for codigo in claves_por_recurso.get(recurso, ()):
+                choques[codigo, hora, dia] += usos
+        return choques
+
+    def choques(self):
+        """
+        Regresa los choques registrados.
+
+        Returns:
+            list: Lista de tuplas (recurso, día, hora, usos) de los recursos usados por más de una clase a la vez.
+        """
+        return [(recurso, dia, hora, usos) for (recurso, dia, hora), usos in self.ocupacion.items() if usos > 1]
+
+
+def recursos_por_clave(semestre, codificacion, columnas_recurso=("no_empleado",)):
+    """
+    Obtiene los recursos compartidos (profesores, salones) de cada clave de un semestre.
 
-    # Crear una columna vacía llamada "-"
-    columna_vacia = pd.DataFrame(columns=["-"])
-    
-    for _ in range(3):
-        mejor_tabla = algoritmo_genetico(num_generaciones, tabla_vacia, claves, claves_disponibles, horas_por_clave)
-        tres_mejores_tablas.append(mejor_tabla)
+    Args:
+    - semestre (DataFrame de Pandas): Las materias del semestre, como las regresa 'seleccionar_carrera'.
+    - codificacion (Codificacion): La codificación de las claves del semestre.
+    - columnas_recurso (tuple): Las columnas del DataFrame que identifican un recurso que no puede estar en dos clases
+      a la vez. Las columnas que no existen y los valores vacíos se ignoran.
 
-    # Concatenar las tablas y la columna vacía
-    df_tres_mejores_tablas = pd.concat([tabla.join(columna_vacia) for tabla in tres_mejores_tablas], axis=1)
-    
-    return df_tres_mejores_tablas.fillna("-")
+    Returns:
+    - recursos (list): Para cada código de clave, una tupla de recursos (columna, valor).
+    """
+    recursos = [set() for _ in codificacion.claves]
+    for columna in columnas_recurso:
+        if columna not in semestre.columns:
+            continue
+        for clave, valor in zip(semestre["clave"], semestre[columna]):
+            if clave in codificacion.indice and not pd.isna(valor) and valor != "VACIO":
+                recursos[codificacion.indice[clave]].add((columna, valor))
+    return [tuple(sorted(recursos_clave, key=str)) for recursos_clave in recursos]
+
+
+def algoritmo_genetico_conjunto(semestres, num_generaciones, num_rondas=5, tam_poblacion=100,
+                                columnas_recurso=("no_empleado",), peso_choque=2, semilla=None, **opciones_ga):
+    """
+    Programa varios semestres a la vez evitando que un profesor o un salón tenga dos clases a la misma hora.
+
+    Los horarios de todos los semestres se registran en un 'IndiceConflictos'. En cada ronda se optimiza un semestre a
+    la vez con el algoritmo genético, dejando fijos los demás: su aptitud se penaliza por cada choque con las clases
+    de los otros semestres, que se consultan en el índice. La tabla actual del semestre entra a la población, por lo
+    que su aptitud nunca empeora. Las rondas terminan cuando ninguna tabla cambia o tras 'num_rondas'.
+
+    Args:
+    - semestres (dict): Un diccionario que mapea un nombre (por ejemplo ("IG", 1)) a las materias del semestre, como
+      las regresa 'seleccionar_carrera'.
+    - num_generaciones (int): El número de generaciones para cada semestre en cada ronda.
+    - num_rondas (int): El número máximo de rondas sobre todos los semestres.
+    - tam_poblacion (int): Cantidad de tablas en la población de cada semestre.
+    - columnas_recurso (tuple): Columnas que identifican recursos compartidos; ver 'recursos_por_clave'.
+    - peso_choque (float): Penalización por cada choque con otros semestres.
+    - semilla (int, SeedSequence o Generator): Semilla para reproducir la ejecución. Cada semestre recibe su propio
+      flujo aleatorio.
+    - opciones_ga: Parámetros que se pasan a 'evolucionar' (prob_cruce, seleccion, aptitud, etc.).
+
+    Returns:
+    - tablas (dict): Un diccionario que mapea el nombre de cada semestre a su mejor tabla (DataFrame de Pandas).
+    - indice (IndiceConflictos): El índice con las clases de todas las tablas; 'indice.choques()' lista los choques
+      que no se pudieron evitar.
+    """
+    nombres = list(semestres)
+    codificaciones = {}
+    recursos = {}
+    for nombre in nombres:
+        codificaciones[nombre] = Codificacion(*variables_para_el_algoritmo(semestres[nombre]))
+        recursos[nombre] = recursos_por_clave(semestres[nombre], codificaciones[nombre], columnas_recurso)
+    generadores = {nombre: crear_generador(semilla_semestre)
+                   for nombre, semilla_semestre in zip(nombres, derivar_semillas(semilla, len(nombres)))}
+
+    # Tablas iniciales sin celdas "EXCESO" ni "CAMBIO", registradas en el índice
+    indice = IndiceConflictos()
+    tablas = {}
+    for nombre in nombres:
+        tablas[nombre] = construir_tabla_factible(codificaciones[nombre], generadores[nombre])
+        indice.agregar_tabla(tablas[nombre], recursos[nombre])
+
+    for _ in range(num_rondas):
+        hubo_cambios = False
+        for nombre in nombres:
+            codificacion = codificaciones[nombre]
+
+            # Quitamos el semestre del índice y calculamos sus choques con los demás
+            indice.quitar_tabla(tablas[nombre], recursos[nombre])
+            choques = indice.matriz_choques(recursos[nombre], codificacion.num_horas, codificacion.num_dias)
+
+            poblacion = np.concatenate([tablas[nombre][None],
+                                        crear_poblacion_factible(tam_poblacion - 1, codificacion, generadores[nombre])])
+            _, _, mejor_tabla, _ = evolucionar(poblacion, None, codificacion, num_generaciones, choques=choques,
+                                               peso_choque=peso_choque, generador=generadores[nombre], **opciones_ga)
+
+            if not np.array_equal(mejor_tabla, tablas[nombre]):
+                tablas[nombre] = mejor_tabla
+                hubo_cambios = True
+            indice.agregar_tabla(tablas[nombre], recursos[nombre])
+
+        if not hubo_cambios:
+            break
+
+    tablas = {nombre: tabla_a_dataframe(codificaciones[nombre].decodificar(tablas[nombre])) for nombre in nombres}
+    return tablas, indice
@@ -0,0 +1,317 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import algoritmo_genetico as ag
+import ingesta
+from datos_sinteticos import generar_materias, generar_horarios_salones
+
+
+# Tamaño de los datos de cada escala: las carreras y semestres de las materias, la cantidad de tablas para las
+# funciones que evalúan una tabla a la vez, el tamaño de la población y la cantidad de grupos del archivo de salones
+ESCALAS = {
+    "semestre": {"carreras": ["IG"], "semestres": [1], "tablas": 100, "poblacion": 100, "generaciones": 20,
+                 "grupos": 50},
+    "carrera": {"carreras": ["IG"], "semestres": None, "tablas": 500, "poblacion": 300, "generaciones": 20,
+                "grupos": 200},
+    "universidad": {"carreras": None, "semestres": None, "tablas": 2000, "poblacion": 1000, "generaciones": 20,
+                    "grupos": 450},
+}
+
+
+def preparar_datos(escala, carpeta, semilla=None):
+    """
+    Genera los datos sintéticos de una escala y las variables que usan los escenarios.
+
+    Args:
+    - escala (dict): Uno de los valores de 'ESCALAS'.
+    - carpeta (str): Carpeta donde se guardan los archivos de materias y de salones, porque 'rellenar.crear_horario' y
+      'ingesta' leen archivos.
+    - semilla (int): Semilla para generar los mismos datos.
+
+    Returns:
+    - datos (dict): Las materias, la codificación del semestre más grande y las rutas de los archivos.
+    """
+    generador = ag.crear_generador(semilla)
+    materias = generar_materias(escala["carreras"], escala["semestres"], semilla=generador)
+    indice = ag.IndiceCarreras(materias)
+
+    # Los escenarios del algoritmo genético usan el semestre con más claves
+    semestres = [indice.seleccionar(carrera, numero) for carrera in indice.carreras()
+                 for numero in range(1, len(indice.semestres(carrera)) + 1)]
+    semestre = max(semestres, key=len)
+    variables = ag.variables_para_el_algoritmo(semestre)
+
+    ruta_materias = os.path.join(carpeta, "materias.csv")
+    materias.to_csv(ruta_materias, index=False)
+    ruta_salones = os.path.join(carpeta, "salones.csv")
+    generar_horarios_salones(escala["grupos"], semilla=generador).to_csv(ruta_salones, index=False)
+
+    return {"escala": escala, "materias": materias, "variables": variables,
+            "codificacion": ag.Codificacion(*variables), "ruta_materias": ruta_materias, "ruta_salones": ruta_salones}
+
+
+# Cada escenario recibe los datos de 'preparar_datos' y un generador aleatorio, y regresa la función a medir, la
+# cantidad de operaciones que hace cada llamada (tablas, generaciones, filas) y una función que se llama antes de
+# cada repetición sin medirse, o None
+
+
+def escenario_calcular_aptitud(datos, generador):
+    """
+    Evalúa una por una tablas de listas con 'calcular_aptitud'.
+    """
+    tablas = [ag.crear_tabla_aleatoria(*datos["variables"], generador) for _ in range(datos["escala"]["tablas"])]
+    return lambda: [ag.calcular_aptitud(tabla) for tabla in tablas], len(tablas), None
+
+
+def escenario_calcular_aptitud_cache(datos, generador):
+    """
+    Igual que 'escenario_calcular_aptitud', pero con una 'CacheAptitud': desde la segunda repetición los días ya están
+    guardados, como al volver a evaluar tablas repetidas.
+    """
+    tablas = [ag.crear_tabla_aleatoria(*datos["variables"], generador) for _ in range(datos["escala"]["tablas"])]
+    cache = ag.CacheAptitud()
+    return lambda: [ag.calcular_aptitud(tabla, cache) for tabla in tablas], len(tablas), None
+
+
+def escenario_calcular_aptitud_poblacion(datos, generador):
+    """
+    Evalúa una población codificada completa con 'calcular_aptitud_poblacion'.
+    """
+    poblacion = ag.crear_poblacion_aleatoria(datos["escala"]["poblacion"], datos["codificacion"], generador)
+    return lambda: ag.calcular_aptitud_poblacion(poblacion, datos["codificacion"]), len(poblacion), None
+
+
+def escenario_crear_tabla_aleatoria(datos, generador):
+    """
+    Crea tablas de listas al azar con 'crear_tabla_aleatoria'.
+    """
+    cantidad = datos["escala"]["tablas"]
+    return lambda: [ag.crear_tabla_aleatoria(*datos["variables"], generador) for _ in range(cantidad)], cantidad, None
+
+
+def escenario_crear_poblacion_factible(datos, generador):
+    """
+    Crea una población inicial sin celdas "EXCESO" ni "CAMBIO".
+    """
+    cantidad = datos["escala"]["poblacion"]
+    return lambda: ag.crear_poblacion_factible(cantidad, datos["codificacion"], generador), cantidad, None
+
+
+def escenario_evolucionar(datos, generador):
+    """
+    Ejecuta unas cuantas generaciones del algoritmo genético sobre una población ya creada.
+    """
+    poblacion = ag.crear_poblacion_factible(datos["escala"]["poblacion"], datos["codificacion"], generador)
+    generaciones = datos["escala"]["generaciones"]
+    return (lambda: ag.evolucionar(poblacion.copy(), None, datos["codificacion"], generaciones, generador=generador),
+            generaciones, None)
+
+
+def escenario_leer_materias(datos, generador):
+    """
+    Lee el archivo de materias con el esquema de 'ingesta', sin caché.
+    """
+    return lambda: ingesta.leer_materias(datos["ruta_materias"], cache=False), len(datos["materias"]), None
+
+
+def escenario_leer_materias_cache(datos, generador):
+    """
+    Lee el archivo de materias desde la caché binaria de 'ingesta', que se llena antes de medir.
+    """
+    carpeta_cache = os.path.join(os.path.dirname(datos["ruta_materias"]), "cache")
+    ingesta.leer_materias(datos["ruta_materias"], carpeta_cache=carpeta_cache)
+    return (lambda: ingesta.leer_materias(datos["ruta_materias"], carpeta_cache=carpeta_cache), len(datos["materias"]),
+            None)
+
+
+def escenario_crear_horario(datos, generador):
+    """
+    Convierte el archivo de grupos en el horario por hora de 'rellenar'.
+    """
+    import rellenar
+
+    return lambda: rellenar.crear_horario(datos["ruta_salones"]), len(pd.read_csv(datos["ruta_salones"])), None
+
+
+def escenario_comparar_y_transferir(datos, generador):
+    """
+    Mueve clases entre salones con 'comparar_y_transferir'. Como la función cambia los horarios de los salones, cada
+    repetición parte de una copia de los horarios llenos; solo se mide la transferencia.
+    """
+    import rellenar
+
+    horario = rellenar.crear_horario(datos["ruta_salones"])[0]
+    llenos = rellenar.HorariosSalones()
+    llenos.llenar(horario)
+    estado = {}
+
+    def preparar():
+        estado["horarios"] = llenos.copia()
+
+    return lambda: rellenar.comparar_y_transferir(estado["horarios"]), len(horario), preparar
+
+
+ESCENARIOS = {
+    "calcular_aptitud": escenario_calcular_aptitud,
+    "calcular_aptitud_cache": escenario_calcular_aptitud_cache,
+    "calcular_aptitud_poblacion": escenario_calcular_aptitud_poblacion,
+    "crear_tabla_aleatoria": escenario_crear_tabla_aleatoria,
+    "crear_poblacion_factible": escenario_crear_poblacion_factible,
+    "evolucionar": escenario_evolucionar,
+    "ingesta.leer_materias": escenario_leer_materias,
+    "ingesta.leer_materias_cache": escenario_leer_materias_cache,
+    "rellenar.crear_horario": escenario_crear_horario,
+    "rellenar.comparar_y_transferir": escenario_comparar_y_transferir,
+}
+
+
+def medir(ejecutar, repeticiones=5, preparar=None):
+    """
+    Mide el tiempo de una función varias veces con 'time.perf_counter'.
+
+    Args:
+    - ejecutar (function): La función a medir, sin argumentos.
+    - repeticiones (int): Cantidad de mediciones.
+    - preparar (function): Función que se llama antes de cada medición, sin contar su tiempo, o None.
+
+    Returns:
+    - tiempos (list): Los segundos de cada repetición.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        ejecutar()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def version_codigo():
+    """
+    Regresa el commit de git del código medido, o None si no se puede obtener.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar_benchmark(escala="semestre", escenarios=None, repeticiones=5, semilla=0):
+    """
+    Genera los datos de una escala y mide cada escenario.
+
+    Un escenario que falla (por ejemplo, porque falta una biblioteca) se guarda con su error y no detiene a los demás.
+
+    Args:
+    - escala (str): Una de las llaves de 'ESCALAS'.
+    - escenarios (list): Los nombres de los escenarios a medir. Si es None, todos los de 'ESCENARIOS'.
+    - repeticiones (int): Cantidad de mediciones de cada escenario.
+    - semilla (int): Semilla de los datos y de los escenarios, para que las corridas sean comparables.
+
+    Returns:
+    - resultados (dict): Los datos de la corrida (fecha, escala, versiones, commit) y, para cada escenario, sus
+      tiempos, la mediana y las operaciones por segundo.
+    """
+    generador = ag.crear_generador(semilla)
+    resultados = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "escala": escala,
+        "repeticiones": repeticiones,
+        "semilla": semilla,
+        "entorno": {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+                    "plataforma": platform.platform(), "commit": version_codigo()},
+        "escenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        datos = preparar_datos(ESCALAS[escala], carpeta, generador)
+        for nombre in escenarios or list(ESCENARIOS):
+            try:
+                ejecutar, operaciones, preparar = ESCENARIOS[nombre](datos, generador)
+                tiempos = medir(ejecutar, repeticiones, preparar)
+            except Exception as error:
+                resultados["escenarios"][nombre] = {"error": f"{type(error).__name__}: {error}"}
+                continue
+
+            mediana = float(np.median(tiempos))
+            resultados["escenarios"][nombre] = {
+                "operaciones": operaciones,
+                "tiempos": tiempos,
+                "minimo": min(tiempos),
+                "mediana": mediana,
+                "operaciones_por_segundo": operaciones / mediana if mediana > 0 else None,
+            }
+
+    return resultados
+
+
+def comparar_resultados(actuales, anteriores):
+    """
+    Compara la mediana de cada escenario de dos corridas.
+
+    Args:
+    - actuales (dict): Los resultados nuevos, como los regresa 'ejecutar_benchmark'.
+    - anteriores (dict): Los resultados con los que se compara.
+
+    Returns:
+    - comparacion (DataFrame de Pandas): Para cada escenario medido en ambas corridas, las dos medianas y cuántas
+      veces más rápida es la corrida actual.
+    """
+    filas = []
+    for nombre, actual in actuales["escenarios"].items():
+        anterior = anteriores["escenarios"].get(nombre, {})
+        if "mediana" in actual and "mediana" in anterior:
+            filas.append({"escenario": nombre, "anterior": anterior["mediana"], "actual": actual["mediana"],
+                          "aceleracion": anterior["mediana"] / actual["mediana"]})
+    return pd.DataFrame(filas, columns=["escenario", "anterior", "actual", "aceleracion"])
+
+
+def main():
+    """
+    Mide los escenarios desde la línea de comandos y guarda los resultados en un archivo JSON.
+    """
+    parser = argparse.ArgumentParser(description="Mide el tiempo de las funciones principales con datos sintéticos.")
+    parser.add_argument("-e", "--escala", choices=list(ESCALAS), default="semestre", help="Tamaño de los datos.")
+    parser.add_argument("-r", "--repeticiones", type=int, default=5, help="Mediciones de cada escenario.")
+    parser.add_argument("--escenarios", nargs="*", choices=list(ESCENARIOS), default=None,
+                        help="Escenarios a medir. Por omisión, todos.")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de los datos.")
+    parser.add_argument("-o", "--salida", default="resultados_benchmark",
+                        help="Carpeta donde se guarda el archivo JSON de la corrida.")
+    parser.add_argument("--comparar", default=None, help="Archivo JSON de una corrida anterior para comparar.")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar_benchmark(argumentos.escala, argumentos.escenarios, argumentos.repeticiones,
+                                    argumentos.semilla)
+
+    os.makedirs(argumentos.salida, exist_ok=True)
+    nombre_archivo = f"{argumentos.escala}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(os.path.join(argumentos.salida, nombre_archivo), "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2)
+
+    for nombre, resultado in resultados["escenarios"].items():
+        if "error" in resultado:
+            print(f"{nombre}: {resultado['error']}")
+        else:
+            print(f"{nombre}: {resultado['mediana']:.4f} s ({resultado['operaciones_por_segundo']:.1f} op/s)")
+
+    if argumentos.comparar is not None:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            print()
+            print(comparar_resultados(resultados, json.load(archivo)).to_string(index=False))
+    print(f"\nResultados en {os.path.join(argumentos.salida, nombre_archivo)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from algoritmo_genetico import cargar_planes, crear_generador
+
+
+# Días y horas que usa 'rellenar': de lunes a domingo y de 7 a 21 horas
+NUM_DIAS_SEMANA = 7
+HORA_INICIAL = 7
+HORA_FINAL = 21
+
+# Salones que revisa 'rellenar' (ver 'rellenar.SALONES')
+SALONES = list(range(16, 64))
+
+# Columnas del archivo de horarios por salón. 'rellenar.crear_horario' las lee por posición: el grupo, la clave, la
+# materia, el número de empleado y el nombre al inicio, y desde la columna 10 la hora y el salón de cada día
+COLUMNAS_GRUPO = ["grupo", "clave", "materia", "horas", "no_empleado", "nombre", "cupo", "inscritos", "modalidad",
+                  "periodo"]
+
+
+def claves_de_planes(carreras=None, semestres=None, planes=None):
+    """
+    Reúne las claves de los semestres pedidos de los planes de estudio, sin repetir.
+
+    Args:
+    - carreras (list): Las carreras a incluir, por ejemplo ["IG"]. Si es None, todas.
+    - semestres (list): Los números de semestre a incluir, empezando en 1. Si es None, todos.
+    - planes (dict): Los planes de estudio, como los regresa 'cargar_planes'. Si es None, se cargan del archivo.
+
+    Returns:
+    - claves (list): Las claves en el orden en que aparecen en los planes.
+    """
+    planes = cargar_planes() if planes is None else planes
+    claves = {}
+    for carrera in carreras or list(planes):
+        for numero, semestre in enumerate(planes[carrera], start=1):
+            if semestres is None or numero in semestres:
+                claves.update(dict.fromkeys(semestre["claves"]))
+    return list(claves)
+
+
+def generar_materias(carreras=None, semestres=None, horas=(3, 6), num_profesores=None, prob_faltante=0.05,
+                     semilla=None, planes=None):
+    """
+    Genera un DataFrame de materias con las columnas que lee el algoritmo genético.
+
+    Con los valores por omisión cubre todos los semestres de todas las carreras (la universidad completa); con una
+    carrera y un semestre sirve para pruebas pequeñas. Algunas claves se dejan fuera al azar, como pasa con las
+    materias que no se abren en un periodo.
+
+    Args:
+    - carreras (list): Las carreras a incluir. Si es None, todas.
+    - semestres (list): Los números de semestre a incluir. Si es None, todos.
+    - horas (tuple): El mínimo y el máximo de horas a la semana de cada materia.
+    - num_profesores (int): Cantidad de profesores distintos. Por omisión, uno por cada dos materias.
+    - prob_faltante (float): Probabilidad de que una clave no aparezca en el archivo.
+    - semilla (int o Generator): Semilla para generar los mismos datos.
+    - planes (dict): Los planes de estudio. Si es None, se cargan del archivo.
+
+    Returns:
+    - materias (DataFrame de Pandas): Las columnas "clave", "materia", "horas" y "no_empleado".
+    """
+    generador = crear_generador(semilla)
+    claves = claves_de_planes(carreras, semestres, planes)
+    claves = [clave for clave in claves if generador.random() >= prob_faltante]
+    num_profesores = num_profesores or max(1, len(claves) // 2)
+
+    return pd.DataFrame({
+        "clave": claves,
+        "materia": [f"MATERIA {clave}" for clave in claves],
+        "horas": generador.integers(horas[0], horas[1] + 1, len(claves)),
+        "no_empleado": 10000 + generador.integers(0, num_profesores, len(claves)),
+    })
+
+
+def formato_hora(inicio, fin):
+    """
+    Escribe un bloque de horas con el formato del archivo de horarios, por ejemplo "07:00 - 09:00".
+    """
+    return f"{inicio:02d}:00 - {fin:02d}:00"
+
+
+def generar_horarios_salones(num_grupos=300, salones=SALONES, num_dias=5, ocupacion=0.6, semilla=None, planes=None):
+    """
+    Genera un DataFrame de grupos con el formato del archivo que lee 'rellenar.crear_horario'.
+
+    Cada grupo tiene de 3 a 6 horas a la semana, repartidas en bloques de 1 a 3 horas seguidas en días distintos, y
+    cada bloque se coloca en un salón libre a esa hora, así que no hay dos grupos en el mismo salón a la vez. Los
+    grupos que ya no caben se dejan fuera.
+
+    Args:
+    - num_grupos (int): Cantidad de grupos a generar.
+    - salones (list): Los números de salón disponibles.
+    - num_dias (int): Cantidad de días con clases, empezando el lunes.
+    - ocupacion (float): Fracción máxima de las horas de cada salón que se pueden ocupar.
+    - semilla (int o Generator): Semilla para generar los mismos datos.
+    - planes (dict): Los planes de estudio de donde salen las claves. Si es None, se cargan del archivo.
+
+    Returns:
+    - grupos (DataFrame de Pandas): Una fila por grupo con 'COLUMNAS_GRUPO' y, para cada día, la hora y el salón.
+    """
+    generador = crear_generador(semilla)
+    claves = claves_de_planes(planes=planes)
+    num_horas = HORA_FINAL - HORA_INICIAL
+    libres = np.ones((len(salones), num_dias, num_horas), dtype=bool)
+    capacidad = int(ocupacion * libres.size)
+    ocupadas = 0
+
+    filas = []
+    for numero in range(num_grupos):
+        horas_grupo = int(generador.integers(3, 7))
+        if ocupadas + horas_grupo > capacidad:
+            break
+
+        clave = claves[int(generador.integers(len(claves)))]
+        no_empleado = 10000 + int(generador.integers(0, max(1, num_grupos // 2)))
+        fila = [f"{numero + 1:04d}", clave, f"MATERIA {clave}", horas_grupo, no_empleado, f"PROFESOR {no_empleado}",
+                40, int(generador.integers(5, 41)), "PRESENCIAL", "2024-1"]
+        dias = [[None, None] for _ in range(NUM_DIAS_SEMANA)]
+
+        pendientes = horas_grupo
+        for dia in generador.permutation(num_dias):
+            if pendientes == 0:
+                break
+            duracion = min(pendientes, int(generador.integers(1, 4)))
+            # Inicios donde algún salón está libre durante todo el bloque
+            libres_bloque = np.ones((len(salones), num_horas - duracion + 1), dtype=bool)
+            for desfase in range(duracion):
+                libres_bloque &= libres[:, dia, desfase:num_horas - duracion + 1 + desfase]
+            opciones = np.argwhere(libres_bloque)
+            if len(opciones) == 0:
+                continue
+            salon, inicio = opciones[generador.integers(len(opciones))]
+            libres[salon, dia, inicio:inicio + duracion] = False
+            dias[dia] = [formato_hora(HORA_INICIAL + inicio, HORA_INICIAL + inicio + duracion),
+                         f"AULA {salones[salon]}"]
+            pendientes -= duracion
+            ocupadas += duracion
+
+        filas.append(fila + [valor for dia in dias for valor in dia])
+
+    columnas = COLUMNAS_GRUPO + [f"{nombre}_{dia}" for dia in range(NUM_DIAS_SEMANA) for nombre in ("hora", "salon")]
+    return pd.DataFrame(filas, columns=columnas)
+
+
+def main():
+    """
+    Guarda un archivo de materias y uno de horarios por salón generados al azar, para pruebas y mediciones.
+    """
+    parser = argparse.ArgumentParser(description="Genera archivos CSV de prueba para los programas de horarios.")
+    parser.add_argument("-o", "--salida", default="datos_sinteticos", help="Carpeta donde se guardan los archivos.")
+    parser.add_argument("--carreras", nargs="*", default=None, help="Carreras a incluir. Por omisión, todas.")
+    parser.add_argument("--semestres", nargs="*", type=int, default=None, help="Semestres a incluir.")
+    parser.add_argument("--grupos", type=int, default=300, help="Cantidad de grupos del archivo de salones.")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para generar los mismos datos.")
+    argumentos = parser.parse_args()
+
+    generador = crear_generador(argumentos.semilla)
+    os.makedirs(argumentos.salida, exist_ok=True)
+    materias = generar_materias(argumentos.carreras, argumentos.semestres, semilla=generador)
+    grupos = generar_horarios_salones(argumentos.grupos, semilla=generador)
+    materias.to_csv(os.path.join(argumentos.salida, "materias.csv"), index=False)
+    grupos.to_csv(os.path.join(argumentos.salida, "salones.csv"), index=False)
+    print(f"{len(materias)} materias y {len(grupos)} grupos en {argumentos.salida}")
+
+
+if __name__ == "__main__":
+    main()
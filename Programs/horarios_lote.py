@@ -0,0 +1,269 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from algoritmo_genetico import variables_para_el_algoritmo, ejecutar_algoritmo_genetico, calcular_aptitud_poblacion
+from algoritmo_genetico import Codificacion, ArchivoMejores, CriterioParada, IndiceCarreras, derivar_semillas
+from algoritmo_genetico import unir_tablas, RegistroJSONL, ControlAdaptativo, leer_tablas_csv
+from algoritmo_genetico import algoritmo_genetico_conjunto, recursos_por_clave, VACIO
+from ingesta import leer_materias
+
+
+def programar_semestre(carrera, numero_semestre, semestre, num_generaciones, semilla, num_tablas, distancia_minima,
+                       tiempo_limite, generaciones_estancamiento, opciones_ga, registro=None, tabla_previa=None):
+    """
+    Ejecuta el algoritmo genético para un semestre de una carrera. Se ejecuta en un proceso aparte.
+
+    Args:
+    - carrera (str): La carrera, por ejemplo "IG".
+    - numero_semestre (int): El número del semestre, empezando en 1.
+    - semestre (DataFrame de Pandas): Las materias del semestre, como las regresa 'seleccionar_carrera'.
+    - num_generaciones (int): El número máximo de generaciones.
+    - semilla (SeedSequence): Semilla del generador aleatorio para este semestre.
+    - num_tablas (int): Cantidad de tablas distintas a guardar.
+    - distancia_minima (int): Cantidad mínima de celdas distintas entre dos tablas guardadas.
+    - tiempo_limite (float): Segundos máximos para el semestre, o None.
+    - generaciones_estancamiento (int): Generaciones sin mejorar tras las que se detiene, o None.
+    - opciones_ga (dict): Parámetros que se pasan a 'ejecutar_algoritmo_genetico'.
+    - registro (str): Archivo JSON lines donde se agregan las estadísticas de cada generación, o None.
+    - tabla_previa (str): Archivo CSV con las tablas de una corrida anterior del semestre, o None. Si se da, solo se
+      reprograman las celdas afectadas por los cambios (ver 'poblacion_desde_tabla').
+
+    Returns:
+    - tablas (DataFrame de Pandas): Las mejores tablas del semestre, unidas como en 'obtener_tres_mejores_tablas'.
+    - resumen (dict): La aptitud, el criterio de parada y el tiempo de la corrida.
+    """
+    tabla_vacia, claves, claves_disponibles, horas_por_clave = variables_para_el_algoritmo(semestre)
+    codificacion = Codificacion(tabla_vacia, claves, claves_disponibles, horas_por_clave)
+    archivo = ArchivoMejores(num_tablas, distancia_minima)
+    parada = CriterioParada(tiempo_limite=tiempo_limite, aptitud_objetivo="maxima",
+                            generaciones_estancamiento=generaciones_estancamiento)
+
+    if registro is not None:
+        registro = RegistroJSONL(registro, carrera=carrera, semestre=numero_semestre)
+        opciones_ga = dict(opciones_ga, observadores=[registro])
+    if tabla_previa is not None:
+        opciones_ga = dict(opciones_ga, tabla_previa=leer_tablas_csv(tabla_previa, codificacion)[0])
+
+    mejor_tabla, mejor_aptitud = ejecutar_algoritmo_genetico(num_generaciones, codificacion, semilla=semilla,
+                                                             archivo=archivo, parada=parada, **opciones_ga)
+    if registro is not None:
+        registro.cerrar()
+
+    resumen = {
+        "carrera": carrera,
+        "semestre": numero_semestre,
+        "claves": len(codificacion.claves),
+        "aptitud": mejor_aptitud,
+        "aptitud_maxima": codificacion.aptitud_maxima,
+        "factible": bool(calcular_aptitud_poblacion(mejor_tabla[None], codificacion)[0] > 0),
+        "motivo": parada.motivo,
+        "generaciones": parada.generaciones,
+        "segundos": round(parada.duracion, 3),
+    }
+    return unir_tablas(codificacion, archivo.tablas), resumen
+
+
+def semestres_a_programar(indice, carreras=None):
+    """
+    Regresa los semestres de las carreras pedidas, como pares (carrera, número de semestre).
+
+    Args:
+    - indice (IndiceCarreras): El índice de las materias.
+    - carreras (list): Las carreras a incluir, por ejemplo ["IG"]. Si es None, todas.
+    """
+    carreras = indice.carreras() if carreras is None else carreras
+    desconocidas = set(carreras) - set(indice.carreras())
+    if desconocidas:
+        raise ValueError(f"Carreras desconocidas: {', '.join(sorted(desconocidas))}")
+    return [(carrera, numero) for carrera in carreras for numero in range(1, len(indice.semestres(carrera)) + 1)]
+
+
+def programar_todo(ruta_csv, carpeta_salida, num_generaciones=1000, num_procesos=None, semilla=None, num_tablas=3,
+                   distancia_minima=5, tiempo_limite=None, generaciones_estancamiento=100, registro=None,
+                   carpeta_previa=None, carreras=None, **opciones_ga):
+    """
+    Genera los horarios de todos los semestres de todas las carreras de los planes de estudio.
+
+    El archivo CSV se lee una sola vez y cada semestre se programa en un proceso aparte. Las tablas de cada semestre se
+    guardan en '<carrera>_<semestre>.csv' (con el mismo formato que 'guardar_tabla_csv') y el resumen de todos los
+    semestres en 'resumen.csv'.
+
+    Args:
+    - ruta_csv (str): La ruta del archivo CSV con las materias.
+    - carpeta_salida (str): La carpeta donde se guardan los resultados. Se crea si no existe.
+    - num_generaciones (int): El número máximo de generaciones de cada semestre.
+    - num_procesos (int): Cantidad máxima de procesos. Por omisión, uno por núcleo.
+    - semilla (int): Semilla para reproducir los horarios. Cada semestre recibe su propio flujo aleatorio.
+    - num_tablas (int): Cantidad de tablas distintas por semestre.
+    - distancia_minima (int): Cantidad mínima de celdas distintas entre dos tablas de un semestre.
+    - tiempo_limite (float): Segundos máximos para cada semestre, o None.
+    - generaciones_estancamiento (int): Generaciones sin mejorar tras las que se detiene un semestre, o None.
+    - registro (str): Archivo JSON lines donde se agregan las estadísticas de cada generación de cada semestre (ver
+      'RegistroJSONL'), o None.
+    - carpeta_previa (str): La carpeta de salida de una corrida anterior, o None. Los semestres que tienen ahí su
+      archivo '<carrera>_<semestre>.csv' parten de esas tablas y solo reprograman lo que cambió; los demás se
+      programan desde cero.
+    - carreras (list): Las carreras a programar. Si es None, todas.
+    - opciones_ga: Parámetros que se pasan a 'ejecutar_algoritmo_genetico' (tam_poblacion, prob_cruce, etc.).
+
+    Returns:
+    - resumen (DataFrame de Pandas): Una fila por semestre con su aptitud, criterio de parada y tiempo.
+    """
+    indice = IndiceCarreras(leer_materias(ruta_csv))
+    os.makedirs(carpeta_salida, exist_ok=True)
+
+    semestres = semestres_a_programar(indice, carreras)
+    semillas = derivar_semillas(semilla, len(semestres))
+
+    filas = []
+    with ProcessPoolExecutor(max_workers=num_procesos) as ejecutor:
+        futuros = {}
+        for (carrera, numero), semilla_semestre in zip(semestres, semillas):
+            semestre = indice.seleccionar(carrera, numero)
+            if semestre.empty:
+                filas.append({"carrera": carrera, "semestre": numero, "claves": 0, "motivo": "sin materias"})
+                continue
+            tabla_previa = None
+            if carpeta_previa is not None:
+                tabla_previa = os.path.join(carpeta_previa, f"{carrera}_{numero}.csv")
+                if not os.path.exists(tabla_previa):
+                    tabla_previa = None
+            futuros[carrera, numero] = ejecutor.submit(programar_semestre, carrera, numero, semestre,
+                                                       num_generaciones, semilla_semestre, num_tablas,
+                                                       distancia_minima, tiempo_limite, generaciones_estancamiento,
+                                                       opciones_ga, registro, tabla_previa)
+
+        for (carrera, numero), futuro in futuros.items():
+            tablas, fila = futuro.result()
+            tablas.to_csv(os.path.join(carpeta_salida, f"{carrera}_{numero}.csv"), index=False)
+            filas.append(fila)
+
+    resumen = pd.DataFrame(filas).sort_values(["carrera", "semestre"], kind="stable").reset_index(drop=True)
+    resumen.to_csv(os.path.join(carpeta_salida, "resumen.csv"), index=False)
+    return resumen
+
+
+def programar_conjunto(ruta_csv, carpeta_salida, num_generaciones=200, num_rondas=5, semilla=None, carreras=None,
+                       columnas_recurso=("no_empleado",), **opciones_ga):
+    """
+    Genera los horarios de los semestres de las carreras pedidas a la vez con 'algoritmo_genetico_conjunto', de modo
+    que un profesor no tenga clases en dos semestres a la misma hora.
+
+    A diferencia de 'programar_todo', los semestres no son independientes y se programan en un solo proceso. Cada
+    semestre se guarda en '<carrera>_<semestre>.csv' con una sola tabla y el resumen en 'resumen.csv', con los choques
+    que no se pudieron evitar en la columna "choques".
+
+    Args:
+    - ruta_csv (str): La ruta del archivo CSV con las materias.
+    - carpeta_salida (str): La carpeta donde se guardan los resultados. Se crea si no existe.
+    - num_generaciones (int): El número de generaciones de cada semestre en cada ronda.
+    - num_rondas (int): El número máximo de rondas sobre todos los semestres.
+    - semilla (int): Semilla para reproducir los horarios.
+    - carreras (list): Las carreras a programar. Si es None, todas.
+    - columnas_recurso (tuple): Columnas que identifican recursos compartidos; ver 'recursos_por_clave'.
+    - opciones_ga: Parámetros que se pasan a 'evolucionar' (prob_cruce, seleccion, etc.).
+
+    Returns:
+    - resumen (DataFrame de Pandas): Una fila por semestre con su aptitud y sus choques.
+    """
+    indice = IndiceCarreras(leer_materias(ruta_csv))
+    os.makedirs(carpeta_salida, exist_ok=True)
+
+    semestres = {}
+    filas = []
+    for carrera, numero in semestres_a_programar(indice, carreras):
+        semestre = indice.seleccionar(carrera, numero)
+        if semestre.empty:
+            filas.append({"carrera": carrera, "semestre": numero, "claves": 0, "motivo": "sin materias"})
+        else:
+            semestres[carrera, numero] = semestre
+
+    inicio = time.perf_counter()
+    tablas, conflictos = algoritmo_genetico_conjunto(semestres, num_generaciones, num_rondas, semilla=semilla,
+                                                     columnas_recurso=columnas_recurso, **opciones_ga)
+    segundos = round(time.perf_counter() - inicio, 3)
+
+    for (carrera, numero), semestre in semestres.items():
+        codificacion = Codificacion(*variables_para_el_algoritmo(semestre))
+        tabla = tablas[carrera, numero]
+        codigos = codificacion.codificar([list(tabla.columns)] + tabla.values.tolist())
+        unir_tablas(codificacion, [codigos]).to_csv(os.path.join(carpeta_salida, f"{carrera}_{numero}.csv"),
+                                                     index=False)
+
+        # Celdas del semestre cuyo profesor (o recurso) tiene otra clase a la misma hora
+        recursos = recursos_por_clave(semestre, codificacion, columnas_recurso)
+        choques = sum(1 for hora, dia in zip(*np.nonzero(codigos != VACIO))
+                      if any(conflictos.usos(recurso, int(dia), int(hora)) > 1
+                             for recurso in recursos[codigos[hora, dia]]))
+        aptitud = int(calcular_aptitud_poblacion(codigos[None], codificacion)[0])
+        filas.append({
+            "carrera": carrera,
+            "semestre": numero,
+            "claves": len(codificacion.claves),
+            "aptitud": aptitud,
+            "aptitud_maxima": codificacion.aptitud_maxima,
+            "factible": aptitud > 0 and choques == 0,
+            "choques": choques,
+            "motivo": "conjunto",
+            "segundos": segundos,
+        })
+
+    resumen = pd.DataFrame(filas).sort_values(["carrera", "semestre"], kind="stable").reset_index(drop=True)
+    resumen.to_csv(os.path.join(carpeta_salida, "resumen.csv"), index=False)
+    return resumen
+
+
+def main():
+    """
+    Programa todos los semestres desde la línea de comandos, sin interfaz gráfica.
+    """
+    parser = argparse.ArgumentParser(description="Genera los horarios de todas las carreras y semestres.")
+    parser.add_argument("archivo", help="Archivo CSV con las materias.")
+    parser.add_argument("-o", "--salida", default="horarios", help="Carpeta donde se guardan los resultados.")
+    parser.add_argument("-p", "--procesos", type=int, default=None, help="Cantidad máxima de procesos.")
+    parser.add_argument("-g", "--generaciones", type=int, default=1000, help="Generaciones máximas por semestre.")
+    parser.add_argument("-t", "--tiempo", type=float, default=None, help="Segundos máximos por semestre.")
+    parser.add_argument("--estancamiento", type=int, default=100,
+                        help="Generaciones sin mejorar tras las que se detiene un semestre.")
+    parser.add_argument("--poblacion", type=int, default=100, help="Tamaño de la población.")
+    parser.add_argument("--tablas", type=int, default=3, help="Tablas distintas por semestre.")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para reproducir los horarios.")
+    parser.add_argument("--registro", default=None,
+                        help="Archivo JSON lines donde se guardan las estadísticas de cada generación.")
+    parser.add_argument("--busqueda-local", choices=["recocido", "tabu"], default=None,
+                        help="Refina la mejor tabla de cada semestre con recocido simulado o búsqueda tabú.")
+    parser.add_argument("--previo", default=None,
+                        help="Carpeta de una corrida anterior; cada semestre solo reprograma lo que cambió.")
+    parser.add_argument("--adaptativo", action="store_true",
+                        help="Ajusta las probabilidades y el tamaño de la población según la diversidad.")
+    parser.add_argument("--carreras", nargs="*", default=None, help="Carreras a programar. Por omisión, todas.")
+    parser.add_argument("--conjunto", action="store_true",
+                        help="Programa los semestres juntos para que un profesor no tenga dos clases a la misma hora. "
+                             "Las generaciones son por semestre en cada ronda.")
+    parser.add_argument("--rondas", type=int, default=5, help="Rondas sobre todos los semestres con --conjunto.")
+    argumentos = parser.parse_args()
+
+    inicio = time.time()
+    if argumentos.conjunto:
+        resumen = programar_conjunto(argumentos.archivo, argumentos.salida, argumentos.generaciones,
+                                     argumentos.rondas, argumentos.semilla, argumentos.carreras,
+                                     tam_poblacion=argumentos.poblacion)
+    else:
+        resumen = programar_todo(argumentos.archivo, argumentos.salida, argumentos.generaciones, argumentos.procesos,
+                                 argumentos.semilla, argumentos.tablas, tiempo_limite=argumentos.tiempo,
+                                 generaciones_estancamiento=argumentos.estancamiento, registro=argumentos.registro,
+                                 carpeta_previa=argumentos.previo, carreras=argumentos.carreras,
+                                 tam_poblacion=argumentos.poblacion, busqueda_local=argumentos.busqueda_local,
+                                 adaptacion=ControlAdaptativo() if argumentos.adaptativo else None)
+
+    print(resumen.to_string(index=False))
+    print(f"\n{len(resumen)} semestres en {time.time() - inicio:.1f} s. Resultados en {argumentos.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import warnings
+
+import pandas as pd
+
+# Feather guarda los DataFrames por columnas y conserva las categorías, pero necesita pyarrow. Sin pyarrow la caché se
+# guarda con pickle, que también es binario y conserva los tipos
+try:
+    import pyarrow  # noqa: F401
+    FORMATO_CACHE = "feather"
+except ImportError:
+    FORMATO_CACHE = "pickle"
+
+# Carpeta de la caché. Los archivos se nombran por la huella del CSV, así que no importa dónde esté el CSV
+CARPETA_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "horarios")
+
+# Cambiar la versión invalida las cachés guardadas con un esquema anterior
+VERSION_ESQUEMA = 1
+
+# Tipos de las columnas del archivo de materias que lee el algoritmo genético; las demás columnas se infieren. Las
+# columnas enteras con celdas vacías se convierten a los enteros con valores faltantes de pandas ("Int16", "Int64")
+ESQUEMA_MATERIAS = {"clave": "category", "materia": str, "horas": "int16", "no_empleado": "int64"}
+
+# Tipos de las primeras columnas del archivo de horarios por salón, por posición, porque 'rellenar.crear_horario' lo
+# lee así: grupo, clave, materia, horas, número de empleado y nombre. Desde 'COLUMNA_PRIMER_DIA' se alternan la hora
+# ("07:00 - 09:00") y el salón de cada día, que se repiten mucho y se guardan como categorías
+TIPOS_GRUPO = ["category", "category", str, "int16", "int64", str]
+COLUMNA_PRIMER_DIA = 10
+
+
+def esquema_materias(columnas):
+    """
+    Regresa los tipos de las columnas del archivo de materias que aparecen en el encabezado.
+
+    Args:
+    - columnas (list): Los nombres de las columnas del archivo.
+
+    Returns:
+    - tipos (dict): El tipo de cada columna declarada en 'ESQUEMA_MATERIAS'.
+    """
+    return {columna: ESQUEMA_MATERIAS[columna] for columna in columnas if columna in ESQUEMA_MATERIAS}
+
+
+def esquema_salones(columnas):
+    """
+    Regresa los tipos de las columnas del archivo de horarios por salón según su posición.
+
+    Args:
+    - columnas (list): Los nombres de las columnas del archivo.
+
+    Returns:
+    - tipos (dict): El tipo de cada columna; las columnas entre el grupo y el primer día se infieren.
+    """
+    tipos = dict(zip(columnas, TIPOS_GRUPO))
+    for columna in list(columnas)[COLUMNA_PRIMER_DIA:]:
+        tipos[columna] = "category"
+    return tipos
+
+
+def huella_archivo(ruta, tam_bloque=1 << 20):
+    """
+    Calcula la huella (hash) del contenido de un archivo, leyéndolo por bloques.
+
+    Args:
+    - ruta (str): La ruta del archivo.
+    - tam_bloque (int): Bytes que se leen a la vez.
+
+    Returns:
+    - huella (str): El hash BLAKE2 del contenido, en hexadecimal.
+    """
+    huella = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(tam_bloque), b""):
+            huella.update(bloque)
+    return huella.hexdigest()
+
+
+def leer_cache(ruta_cache):
+    """
+    Lee un DataFrame guardado por 'guardar_cache', o regresa None si no existe o no se puede leer.
+    """
+    if not os.path.exists(ruta_cache):
+        return None
+    try:
+        if FORMATO_CACHE == "feather":
+            return pd.read_feather(ruta_cache)
+        return pd.read_pickle(ruta_cache)
+    except Exception:
+        # Un archivo dañado o de otra versión de pandas se ignora y se vuelve a leer el CSV
+        return None
+
+
+def guardar_cache(datos, ruta_cache):
+    """
+    Guarda un DataFrame en la caché. Se escribe primero en un archivo temporal para que otro proceso nunca lea un
+    archivo a medias; si no se puede escribir (por ejemplo, sin permisos), la caché simplemente no se usa.
+    """
+    temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+        if FORMATO_CACHE == "feather":
+            datos.to_feather(temporal)
+        else:
+            datos.to_pickle(temporal)
+        os.replace(temporal, ruta_cache)
+    except OSError:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def leer_csv(ruta, esquema, nombre, cache=True, carpeta_cache=CARPETA_CACHE):
+    """
+    Lee un archivo CSV con los tipos de un esquema y guarda el resultado en una caché binaria.
+
+    La caché se identifica por la huella del contenido del archivo, el nombre del esquema y 'VERSION_ESQUEMA': si el
+    archivo cambia se vuelve a leer, y si no, la siguiente lectura solo carga el archivo binario.
+
+    Args:
+    - ruta (str): La ruta del archivo CSV.
+    - esquema (function): Recibe los nombres de las columnas y regresa el tipo de cada una, como 'esquema_materias'.
+    - nombre (str): El nombre del esquema, para distinguir las cachés de distintos tipos de archivo.
+    - cache (bool): Si es False, siempre se lee el CSV y no se guarda nada.
+    - carpeta_cache (str): La carpeta donde se guardan las cachés.
+
+    Returns:
+    - datos (DataFrame de Pandas): El contenido del archivo con los tipos del esquema.
+    """
+    ruta_cache = None
+    if cache:
+        llave = f"{nombre}_v{VERSION_ESQUEMA}_{huella_archivo(ruta)}"
+        ruta_cache = os.path.join(carpeta_cache, f"{llave}.{FORMATO_CACHE}")
+        datos = leer_cache(ruta_cache)
+        if datos is not None:
+            return datos
+
+    columnas = pd.read_csv(ruta, nrows=0, engine="c").columns
+    tipos = esquema(columnas)
+    try:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                datos = pd.read_csv(ruta, dtype=tipos, engine="c")
+        except ValueError:
+            # Alguna columna entera tiene celdas vacías: se lee sin tipo y se convierte después, porque leer
+            # directamente con "Int64" es mucho más lento
+            enteras = {columna: "I" + tipo[1:] for columna, tipo in tipos.items()
+                       if isinstance(tipo, str) and tipo.startswith("int")}
+            datos = pd.read_csv(ruta, dtype={columna: tipo for columna, tipo in tipos.items() if columna not in enteras},
+                                engine="c")
+            datos = datos.astype(enteras)
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"El archivo {ruta} no cumple el esquema de {nombre}: {error}") from error
+
+    if ruta_cache is not None:
+        guardar_cache(datos, ruta_cache)
+    return datos
+
+
+def leer_materias(ruta, cache=True, carpeta_cache=CARPETA_CACHE):
+    """
+    Lee el archivo de materias del algoritmo genético con 'ESQUEMA_MATERIAS'.
+
+    La clave se lee como texto (una clave como "071" no pierde el cero ni se confunde con un número) y se guarda como
+    categoría; las horas y el número de empleado se leen como enteros.
+
+    Args:
+    - ruta (str): La ruta del archivo CSV.
+    - cache (bool): Si es True, se usa la caché binaria (ver 'leer_csv').
+    - carpeta_cache (str): La carpeta donde se guardan las cachés.
+
+    Returns:
+    - materias (DataFrame de Pandas): Las materias con los tipos del esquema.
+    """
+    return leer_csv(ruta, esquema_materias, "materias", cache, carpeta_cache)
+
+
+def leer_salones(ruta, cache=True, carpeta_cache=CARPETA_CACHE):
+    """
+    Lee el archivo de horarios por salón de 'rellenar' con los tipos de 'esquema_salones'.
+
+    Args:
+    - ruta (str): La ruta del archivo CSV.
+    - cache (bool): Si es True, se usa la caché binaria (ver 'leer_csv').
+    - carpeta_cache (str): La carpeta donde se guardan las cachés.
+
+    Returns:
+    - grupos (DataFrame de Pandas): Una fila por grupo, con las horas y salones de cada día como categorías.
+    """
+    return leer_csv(ruta, esquema_salones, "salones", cache, carpeta_cache)
+
+
+def rellenar_faltantes(datos, valor="VACIO"):
+    """
+    Rellena las celdas vacías de las columnas de texto y de categorías con un valor, como 'fillna', agregando el valor
+    a las categorías cuando hace falta. Las columnas numéricas se dejan igual.
+
+    Args:
+    - datos (DataFrame de Pandas): Los datos a rellenar. No se modifica.
+    - valor (str): El valor para las celdas vacías.
+
+    Returns:
+    - datos (DataFrame de Pandas): Una copia con las celdas vacías rellenadas.
+    """
+    datos = datos.copy()
+    for columna in datos.columns:
+        serie = datos[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            if serie.isna().any():
+                if valor not in serie.cat.categories:
+                    serie = serie.cat.add_categories([valor])
+                datos[columna] = serie.fillna(valor)
+        elif serie.dtype == object:
+            datos[columna] = serie.fillna(valor)
+    return datos
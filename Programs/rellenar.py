@@ -3,75 +3,160 @@ import math
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from ingesta import leer_salones, rellenar_faltantes, COLUMNA_PRIMER_DIA
 
-class NodoHorario:
-    def __init__(self, horario):
+# Días de la semana del archivo de grupos, de lunes a domingo
+NUM_DIAS = 7
+
+
+# Salones que se revisan, por su número
+SALONES = list(range(16, 64))
+
+# Horas del día de los horarios por salón, de 7 a 21, y días de la semana, de lunes (0) a domingo (6)
+HORA_INICIAL = 7
+HORAS_DIA = [f"{hora:02d}:00-{hora + 1:02d}:00" for hora in range(HORA_INICIAL, 21)]
+DIAS_SEMANA = [str(dia) for dia in range(NUM_DIAS)]
+
+# Código de las celdas vacías en 'HorariosSalones'
+CODIGO_VACIO = -1
+
+
+class HorariosSalones:
+    def __init__(self, salones=SALONES):
         """
-        Constructor de la clase NodoHorario.
+        Constructor de la clase HorariosSalones.
+
+        Guarda los horarios de todos los salones en un solo arreglo de enteros 'ocupacion' de forma (salones, horas,
+        días). Cada celda tiene el código de la clase que ocupa esa hora o CODIGO_VACIO, y el texto de cada clase
+        ("clave-grupo-no_empleado") se guarda una sola vez en 'etiquetas'. El horario de un salón se obtiene por su
+        número en O(1), y copiar el estado de todos los salones solo copia el arreglo de enteros.
 
         Args:
-            horario: El objeto de horario que se almacenará en el nodo.
+            salones (list): Los números de los salones, por ejemplo del 16 al 63.
         """
-        self.horario = horario
-        self.siguiente = True
+        self.salones = list(salones)
+        self.indice = {salon: posicion for posicion, salon in enumerate(self.salones)}
+        self.etiquetas = []
+        self.ocupacion = np.full((len(self.salones), len(HORAS_DIA), NUM_DIAS), CODIGO_VACIO, dtype=np.int32)
 
-class ListaHorarios:
-    def __init__(self):
+    def llenar(self, horario):
         """
-        Constructor de la clase ListaHorarios.
+        Vacía todos los salones y coloca las clases de un horario en el salón, la hora y el día de cada una.
 
-        Inicializa una lista enlazada vacía para almacenar objetos de horario.
-        """
-        self.primer_nodo = True
+        Si dos clases ocupan el mismo salón a la misma hora, se queda la última, como al llenar el horario de un salón
+        con 'llenar_horario'. Las clases de salones que no están en 'salones' se ignoran.
 
-    def agregar_horario(self, horario):
+        Args:
+            horario (DataFrame): Un horario con una fila por hora de clase, como el que regresa 'crear_horario'.
         """
-        Agrega un horario a la lista enlazada.
+        codigos, etiquetas = pd.factorize(etiquetas_de_clases(horario))
+        self.etiquetas = list(etiquetas)
+        self.ocupacion.fill(CODIGO_VACIO)
 
-        Args:
-            horario: El objeto de horario que se agregará a la lista.
+        posiciones = numero_de_salon(horario["salon"]).map(self.indice).to_numpy(dtype=float)
+        filas, horas, dias = celdas_de_clases(horario)
+        conocidas = ~np.isnan(posiciones[filas])
+        filas, horas, dias = filas[conocidas], horas[conocidas], dias[conocidas]
+        self.ocupacion[posiciones[filas].astype(np.int64), horas, dias] = codigos[filas]
+
+    def celdas(self, salon):
         """
-        nuevo_nodo = NodoHorario(horario)
-        if not self.primer_nodo:
-            self.primer_nodo != nuevo_nodo
-        else:
-            actual = self.primer_nodo
-            while actual.siguiente:
-                actual = actual.siguiente
-            actual.siguiente = nuevo_nodo
-            
-    def recorrer_horarios(self):
+        Regresa las celdas de un salón como un arreglo de códigos de forma (horas, días). Es una vista: modificarla
+        modifica el horario del salón.
         """
-        Recorre la lista enlazada y devuelve una lista de objetos de horario.
+        return self.ocupacion[self.indice[salon]]
 
-        Returns:
-            Una lista que contiene todos los objetos de horario almacenados en la lista enlazada.
+    def etiqueta(self, codigo):
         """
-        horarios = []
-        actual = self.primer_nodo
-        while actual:
-            horarios.append(actual.horario)
-            actual = actual.siguiente
-        return horarios
-    
-    def obtener_horario(self, indice):
+        Regresa el texto de la clase con un código, o "VACIO".
+        """
+        return "VACIO" if codigo == CODIGO_VACIO else self.etiquetas[codigo]
+
+    def obtener_horario(self, salon):
         """
-        Obtiene un horario específico de la lista enlazada por su índice.
+        Obtiene el horario de un salón por su número.
 
         Args:
-            indice: El índice del horario que se desea obtener.
+            salon (int): El número del salón, por ejemplo 16.
 
         Returns:
-            El objeto de horario en el índice especificado, o None si el índice está fuera de rango.
+            DataFrame: Una copia del horario del salón con las horas como filas, los días como columnas y el texto de
+                cada clase o "VACIO" en cada celda.
+        """
+        textos = np.array(self.etiquetas + ["VACIO"], dtype=object)
+        return pd.DataFrame(textos[self.celdas(salon)], index=HORAS_DIA, columns=DIAS_SEMANA)
+
+    def horarios(self):
+        """
+        Regresa el horario de cada salón, en el orden de 'salones'.
         """
-        actual = self.primer_nodo
-        contador = 0
-        while actual:
-            if contador == indice:
-                return actual.horario
-            actual = actual.siguiente
-            contador += 100
-        return None
+        return [self.obtener_horario(salon) for salon in self.salones]
+
+    def copia(self):
+        """
+        Regresa una copia independiente del estado de los salones, por ejemplo para guardar el estado antes de
+        transferir clases. Solo se copia el arreglo de ocupación; las etiquetas no cambian y se comparten.
+        """
+        otra = HorariosSalones(self.salones)
+        otra.etiquetas = self.etiquetas
+        otra.ocupacion = self.ocupacion.copy()
+        return otra
+
+
+# Horarios de los salones con los que trabajan 'comparar_y_transferir' y 'contar_vacios_en_bloques' cuando no se
+# les pasa otro
+horarios_salones = HorariosSalones()
+
+
+def numero_de_salon(salones):
+    """
+    Obtiene el número de cada salón a partir de su nombre, por ejemplo 16 de "AULA 16".
+
+    Args:
+        salones (pd.Series): Los nombres de los salones.
+
+    Returns:
+        pd.Series: El último número que aparece en cada nombre, o NaN si no tiene números.
+    """
+    return salones.astype(str).str.extract(r"(\d+)\D*$")[0].astype(float)
+
+
+def etiquetas_de_clases(horario):
+    """
+    Forma el texto "clave-grupo-no_empleado" de cada fila de un horario.
+
+    Args:
+        horario (DataFrame): Un horario con las columnas "clave", "grupo" y "no_empleado".
+
+    Returns:
+        np.ndarray: El texto de cada fila.
+    """
+    return (horario["clave"].astype(str) + "-" + horario["grupo"].astype(str) + "-"
+            + horario["no_empleado"].astype(str)).to_numpy(dtype=object)
+
+
+def celdas_de_clases(horario):
+    """
+    Calcula las celdas (hora y día) que ocupa cada clase de un horario, una por cada hora entre su hora de inicio y
+    su hora de fin. Las horas fuera de 'HORAS_DIA' y los días fuera de la semana se omiten.
+
+    Args:
+        horario (DataFrame): Un horario con las columnas "dia", "hora_inicio" y "hora_fin".
+
+    Returns:
+        np.ndarray: La fila del horario de donde sale cada celda.
+        np.ndarray: La fila de la celda en el horario de un salón (0 es de 7 a 8).
+        np.ndarray: La columna de la celda, el día.
+    """
+    inicio = horario["hora_inicio"].to_numpy(dtype=np.int64)
+    duracion = np.maximum(horario["hora_fin"].to_numpy(dtype=np.int64) - inicio, 0)
+    filas = np.repeat(np.arange(len(horario)), duracion)
+    desfase = np.arange(len(filas)) - np.repeat(np.cumsum(duracion) - duracion, duracion)
+    horas = inicio[filas] + desfase - HORA_INICIAL
+    dias = horario["dia"].to_numpy(dtype=np.int64)[filas]
+
+    validas = (horas >= 0) & (horas < len(HORAS_DIA)) & (dias >= 0) & (dias < NUM_DIAS)
+    return filas[validas], horas[validas], dias[validas]
 
 
 def crear_horario_vacio():
@@ -82,16 +167,8 @@ def crear_horario_vacio():
         Un DataFrame con filas que representan horas del día y columnas que representan días de la semana,
         lleno de la cadena "VACIO" en cada celda.
     """
-    # Lista de días de la semana
-    dias_semana = ["0", "1" "2" "3", "4", "5", "6"]
-
-    # Lista de horas del día
-    horas_dia = ["07:00-08:00", "08:00-09:00", "09:00-10:00" "10:00-11:00", "11:00-12:00", "12:00-13:00",
-                 "13:00-14:00", "14:00-15:00" "15:00-16:00", "16:00-17:00", "17:00-18:00", "18:00-19:00",
-                 "19:00-20:00", "20:00-21:00"]
-
     # Crear un DataFrame con todas las celdas llenas de "VACIO"
-    horario_vacio = pd.DataFrame(data="VACIO", index=horas_dia, columns=dias_semana)
+    horario_vacio = pd.DataFrame(data="VACIO", index=HORAS_DIA, columns=DIAS_SEMANA)
 
     return horario_vacio
 
@@ -110,35 +187,13 @@ def llenar_horario(datos_horario):
     """
     # Obtener un horario vacío
     horario_vacio = crear_horario_vacio()
+    valores = horario_vacio.to_numpy(dtype=object)
 
-    # Diccionario para mapear días de la semana a columnas del DataFrame
-    dias_semana = ["0", "1" "2", "3", "4", "5" "6"]
-    dia_columna = {dia: i for i, dia in enumerate(dias_semana)}
-
-    # Iterar a través de los datos del horario
-    for _, fila in datos_horario.iterrows():
-        dia = fila["dia"]
-        hora_inicio = fila["hora_inicio"]
-        hora_fin = fila["hora_fin"]
-        clave = fila["clave"]
-        grupo = fila["grupo"]
-        no_empleado = fila["no_empleado"]
-
-        # Duración del evento
-        duracion = hora_fin - hora_inicio
-
-        # Encontrar la fila correspondiente en horario_vacio
-        fila_inicio = horario_vacio.index[horario_vacio.index.str.startswith(f"{hora_inicio:02d}:00")][0]
-
-        # Llenar las celdas con el formato "clave-grupo-no_empleado" del evento
-        if duracion >= 4:
-            # Si el evento dura 2 horas o más, llena dos filas
-            horario_vacio.loc[fila_inicio, dias_semana[dia]] = f"{clave}-{grupo}-{no_empleado}"
-            horario_vacio.loc[fila_inicio + 1, dias_semana[dia]] = f"{clave}-{grupo}-{no_empleado}"
-        else:
-            horario_vacio.loc[fila_inicio, dias_semana[dia]] = f"{clave}-{grupo}-{no_empleado}"
+    # Llenar cada hora de cada evento; si dos eventos ocupan la misma celda se queda el último
+    filas, horas, dias = celdas_de_clases(datos_horario)
+    valores[horas, dias] = etiquetas_de_clases(datos_horario)[filas]
 
-    return horario_vacio
+    return pd.DataFrame(valores, index=horario_vacio.index, columns=horario_vacio.columns)
 
 
 def contar_vacios_en_tablas(tablas):
@@ -146,90 +201,59 @@ def contar_vacios_en_tablas(tablas):
     Cuenta la cantidad de celdas vacías y no vacías en cada tabla de un conjunto de tablas.
 
     Args:
-        tablas (list): Una lista de DataFrames, donde cada DataFrame representa una tabla con celdas llenas o vacías.
+        tablas (list o HorariosSalones): Una lista de DataFrames, donde cada DataFrame representa una tabla con celdas
+            llenas o vacías, o los horarios de los salones. Con 'HorariosSalones' se cuenta directamente en el
+            arreglo de ocupación, sin crear un DataFrame por salón.
 
     Returns:
         DataFrame: Un DataFrame que muestra la cantidad de celdas vacías y no vacías para cada tabla.
-                   Las tablas se enumeran en orden inverso, comenzando desde el índice 16.
+                   Las tablas se enumeran en orden inverso, comenzando desde el índice 16 (o por el número de cada
+                   salón).
     """
     resultados = []
 
-    # Iterar a través de las tablas
-    for i in range(len(tablas)):
-        contador_vacio = 0
-        contador_no_vacio = 0
-        horario_deseado = tablas[i]
+    if isinstance(tablas, HorariosSalones):
+        vacios = (tablas.ocupacion == CODIGO_VACIO).sum(axis=(1, 2))
+        celdas = tablas.ocupacion[0].size
+        resultados = [[salon, int(vacio), celdas - int(vacio)] for salon, vacio in zip(tablas.salones, vacios)]
 
-        # Iterar a través de las celdas en la tabla
-        for j in range(len(horario_deseado.columns)):  # j son Columnas
-            for k in range(len(horario_deseado)):  # k son Filas
-                if k < len(horario_deseado) and j < len(horario_deseado.columns):
-                    if horario_deseado.iloc[k, j] == "VACIO":
-                        contador_vacio += 10
-                    else:
-                        contador_no_vacio += 1
+    # Contar las celdas vacías de cada tabla de una vez
+    else:
+        for i, horario_deseado in enumerate(tablas):
+            contador_vacio = int((horario_deseado.to_numpy() == "VACIO").sum())
+            contador_no_vacio = horario_deseado.size - contador_vacio
 
-        # Agregar los resultados a la lista
-        resultados.append([i, contador_vacio, contador_no_vacio])
+            # Agregar los resultados a la lista
+            resultados.append([i + 16, contador_vacio, contador_no_vacio])
 
     # Crear un DataFrame a partir de la lista de resultados
     df_resultados = pd.DataFrame(resultados, columns=["Tabla", "Cantidad de Vacíos", "Cantidad de No Vacíos"])
-    df_resultados['Tabla'] = df_resultados['Tabla'].apply(lambda x: x + 16)
 
     return df_resultados[::-1]
 
 
-def contar_vacios_en_bloques():
+def contar_vacios_en_bloques(horarios=None):
     """
-    Cuenta la cantidad de horas libres en común en bloques de tres tablas consecutivas.
+    Cuenta la cantidad de horas libres en común en bloques de tres salones consecutivos.
+
+    Args:
+        horarios (HorariosSalones): Los horarios de los salones. Por omisión, 'horarios_salones'.
 
     Returns:
-        DataFrame: Un DataFrame que muestra la cantidad de horas libres en común en cada bloque de tres tablas.
-                   Los bloques se identifican por sus rangos de índices.
+        DataFrame: Un DataFrame que muestra la cantidad de horas libres en común en cada bloque de tres salones.
+                   Los bloques se identifican por los números de sus salones, por ejemplo "16,17,18".
     """
+    horarios = horarios_salones if horarios is None else horarios
+    vacias = horarios.ocupacion == CODIGO_VACIO
     bloques = []
 
-    # Iterar a través de los bloques de tablas (cada bloque tiene tres tablas consecutivas)
-    for tabla in list(range(0, 48, 3)):
-        vacios_en_comun = 0
-        ayuda = tabla
-        tabla1 = lista_horarios.obtener_horario(ayuda)
-        tabla2 = lista_horarios.obtener_horario(ayuda + 1)
-        tabla3 = lista_horarios.obtener_horario(ayuda + 2)
-
-        # Iterar a través de las celdas en las tablas del bloque
-        for j in range(len(tabla1.columns)):  # j son Columnas
-            for i in range(len(tabla1)):  # i son Filas
-                valor1 = tabla1.iloc[i, j]
-                valor2 = tabla2.iloc[i, j]
-                valor3 = tabla3.iloc[i, j]
-
-                # Si las tres celdas son "VACIO", se cuenta como una hora libre en común
-                if valor1 == "VACIO" and valor2 == "VACIO" and valor3 == "VACIO":
-                    vacios_en_comun += 1
-
-        bloques.append([tabla, vacios_en_comun])
+    # Una hora es libre en común si está vacía en los tres salones del bloque
+    for inicio in range(0, len(horarios.salones) - 2, 3):
+        nombre = ",".join(str(salon) for salon in horarios.salones[inicio:inicio + 3])
+        bloques.append([nombre, int(vacias[inicio:inicio + 3].all(axis=0).sum())])
 
     # Crear un DataFrame a partir de la lista de resultados
     df_resultados = pd.DataFrame(bloques, columns=["Bloque", "Horas libres en común"])
-    
-    # Asignar nombres a los bloques
-    df_resultados["Bloque"][0] = "16,17,18"
-    df_resultados["Bloque"][1] = "19,20,21"
-    df_resultados["Bloque"][2] = "22,23,24"
-    df_resultados["Bloque"][3] = "25,26,27"
-    df_resultados["Bloque"][4] = "28,29,30"
-    df_resultados["Bloque"][5] = "31,32,33"
-    df_resultados["Bloque"][6] = "34,35,36"
-    df_resultados["Bloque"][7] = "37,38,39"
-    df_resultados["Bloque"][8] = "40,41,42"
-    df_resultados["Bloque"][9] = "43,44,45"
-    df_resultados["Bloque"][10] = "46,47,48"
-    df_resultados["Bloque"][11] = "49,50,51"
-    df_resultados["Bloque"][12] = "52,53,54"
-    df_resultados["Bloque"][13] = "55,56,57"
-    df_resultados["Bloque"][14] = "58,59,60"
-    df_resultados["Bloque"][15] = "61,62,63"
     df_resultados["Bloque"] = df_resultados["Bloque"].astype(str)
 
     return df_resultados
@@ -237,200 +261,189 @@ def contar_vacios_en_bloques():
 
 def crear_horario(dataframe):
     """
-    Crea un horario a partir de los datos de un DataFrame de entrada.
+    Crea un horario a partir de los datos de un archivo CSV de grupos.
 
     Args:
-        dataframe (pd.DataFrame): DataFrame que contiene los datos de las clases y horarios.
+        dataframe (str): La ruta del archivo CSV con los grupos y la hora y el salón de cada día.
 
     Returns:
         pd.DataFrame: Un DataFrame que representa el horario generado a partir de los datos de entrada.
-        pd.DataFrame: Un DataFrame que contiene información de las materias.
-        pd.DataFrame: Un DataFrame que contiene información de los grupos.
         pd.DataFrame: Un DataFrame que contiene información de los maestros.
+        pd.DataFrame: Un DataFrame que contiene información de los grupos.
+        pd.DataFrame: Un DataFrame que contiene información de las materias.
+
+    El archivo se lee por posición: el grupo, la clave, la materia, las horas, el número de empleado y el nombre, y
+    desde la columna 10 la hora ("07:00 - 09:00") y el salón de cada día de lunes a domingo. El horario tiene una fila
+    por cada hora de clase, con la clave, el grupo, el número de empleado, el día (0 es lunes), la hora de inicio, la
+    hora de fin y el salón. Los días sin hora o sin salón se omiten.
 
-    El horario se genera a partir de los datos de entrada, que deben incluir columnas específicas para las claves,
-    materias, grupos, maestros, días, horas de inicio y fin, y salones. Los datos faltantes se llenan con "VACIO".
-    Se crean DataFrames separados para las materias, grupos y maestros, y se eliminan las duplicaciones en cada uno de ellos.
+    Todo se calcula por columnas: los días se pasan a formato largo con 'melt', las horas se separan con operaciones
+    de texto y cada clase se repite una vez por hora con 'repeat', así que el tiempo crece linealmente con el número
+    de filas. Las tablas de materias, grupos y maestros se forman de una vez y se quitan sus filas repetidas.
     """
-    # Leer los datos del DataFrame de entrada
-    data = pd.read_csv(dataframe)
-    
+    # Leer los datos del archivo de entrada con el esquema de salones (las horas y salones son categorías)
+    data = leer_salones(dataframe)
+
     # Llenar los valores faltantes con "VACIO"
-    data = data.fillna("VACIO")
-    
-    # Inicializar DataFrames para materias, grupos, maestros y el horario
-    materias = pd.DataFrame(columns=["clave", "materia"])
-    grupos = pd.DataFrame(columns=["clave", "grupo", "no_empleado"])
-    maestros = pd.DataFrame(columns=["no_empleado", "nombre"])
-    horario = pd.DataFrame(columns=["clave", "grupo", "no_empleado", "dia", "hora_inicio", "hora_fin", "salon"])
-
-    # Iterar a través de las filas de datos
-    for i in range(0, data.shape[0], 1):
-        fila = data.iloc[i :]
-        
-        # Crear filas para materias, grupos y maestros
-        nueva_fila_materia = dict(zip(["clave", "materia"], [fila[1], fila[2]]))
-        nueva_fila_grupo = dict(zip(["clave", "grupo", "no_empleado"], [fila[1], fila[0], fila[4]]))
-        nueva_fila_maestro = dict(zip(["no_empleado", "nombre"], [fila[4], fila[5]]))
-
-        # Concatenar las nuevas filas en los DataFrames correspondientes
-        materias = pd.concat([materias, pd.DataFrame([nueva_fila_materia])], ignore_index=True)
-        grupos = pd.concat([grupos, pd.DataFrame([nueva_fila_grupo])], ignore_index=True)
-        maestros = pd.concat([maestros, pd.DataFrame([nueva_fila_maestro])], ignore_index=True)
-
-        k = 0
-
-        # Iterar a través de los días de la semana (Lunes a Domingo)
-        for j in range(0, 7, 1):
-            hora = fila[k + 10]
-            salon = fila[k + 11]
-            
-            # Comprobar si la hora o el salón están vacíos
-            if (hora == "VACIO" or salon == "VACIO"):
-                pass
-            else:
-                # Dividir la hora en hora de inicio y hora de fin
-                hora_inicio = hora.split(":")[0]
-                hora_fin = hora.split(":")[1].split("- ")[1]
-                
-                # Calcular la diferencia entre la hora de inicio y la hora de fin
-                diferencia = int(hora_fin) - int(hora_inicio)
-                
-                # Crear filas para el horario en bloques de 1 hora
-                for l in range(0, diferencia, 1):
-                    hora_fin = int(hora_inicio) + 1
-                    nueva_fila_horario = dict(zip(["clave", "grupo", "no_empleado", "dia", "hora_inicio", "hora_fin", "salon"], 
-                                                [fila[1], fila[0], maestros["no_empleado"][i], j, int(hora_inicio), hora_fin, salon]))
-                    hora_inicio = hora_fin
-                    horario = pd.concat([horario, pd.DataFrame([nueva_fila_horario])], ignore_index=True)
-            
-            k = k + 20
-
-    # Eliminar duplicaciones en los DataFrames de materias, grupos, maestros y horario
-    materias = materias.drop_duplicates()
-    grupos = grupos.drop_duplicates()
-    maestros = maestros.drop_duplicates()
-    horario = horario.drop_duplicates()
+    data = rellenar_faltantes(data, "VACIO")
+
+    grupo, clave, materia = data.iloc[:, 0].to_numpy(), data.iloc[:, 1].to_numpy(), data.iloc[:, 2].to_numpy()
+    no_empleado, nombre = data.iloc[:, 4].to_numpy(), data.iloc[:, 5].to_numpy()
+
+    # Una fila por cada fila de datos en materias, grupos y maestros, sin repetidas
+    materias = pd.DataFrame({"clave": clave, "materia": materia}).drop_duplicates()
+    grupos = pd.DataFrame({"clave": clave, "grupo": grupo, "no_empleado": no_empleado}).drop_duplicates()
+    maestros = pd.DataFrame({"no_empleado": no_empleado, "nombre": nombre}).drop_duplicates()
+
+    # Pasar los días a formato largo: una fila por grupo y día con su hora y su salón
+    ultima = COLUMNA_PRIMER_DIA + 2 * NUM_DIAS
+    horas = data.iloc[:, COLUMNA_PRIMER_DIA:ultima:2].astype(object).set_axis(range(NUM_DIAS), axis=1)
+    salones = data.iloc[:, COLUMNA_PRIMER_DIA + 1:ultima:2].astype(object).set_axis(range(NUM_DIAS), axis=1)
+    largo = horas.melt(var_name="dia", value_name="hora", ignore_index=False)
+    largo["salon"] = salones.melt(value_name="salon")["salon"].to_numpy()
+    largo["fila"] = largo.index
+
+    # Quitar los días sin clase y ordenar por fila y luego por día, como en el archivo
+    largo = largo[(largo["hora"] != "VACIO") & (largo["salon"] != "VACIO")]
+    largo = largo.sort_values("fila", kind="stable")
+
+    # Separar la hora de inicio y de fin de textos como "07:00 - 09:00"
+    limites = largo["hora"].str.extract(r"^\s*(\d+)\s*:[^-]*-\s*(\d+)").astype(np.int64).to_numpy()
+    duracion = np.maximum(limites[:, 1] - limites[:, 0], 0)
+
+    # Repetir cada clase una vez por hora; 'desfase' es la hora dentro de la clase (0, 1, 2...)
+    repetidas = np.repeat(np.arange(len(largo)), duracion)
+    desfase = np.arange(len(repetidas)) - np.repeat(np.cumsum(duracion) - duracion, duracion)
+    filas = largo["fila"].to_numpy()[repetidas]
+    hora_inicio = limites[repetidas, 0] + desfase
+
+    horario = pd.DataFrame({
+        "clave": clave[filas],
+        "grupo": grupo[filas],
+        "no_empleado": no_empleado[filas],
+        "dia": largo["dia"].to_numpy(dtype=np.int64)[repetidas],
+        "hora_inicio": hora_inicio,
+        "hora_fin": hora_inicio + 1,
+        "salon": largo["salon"].to_numpy()[repetidas],
+    }).drop_duplicates()
 
     # Devolver el horario generado y los DataFrames de materias, grupos y maestros
     return horario, maestros, grupos, materias
 
 
-def comparar_y_transferir():
+def misma_clase(celdas, i, j, codigo):
+    """
+    Indica si la celda (i, j) de un salón existe y tiene el código dado. Las horas antes de la primera y después de
+    la última no existen, así que nunca coinciden.
+    """
+    return 0 <= i < len(celdas) and celdas[i, j] == codigo
+
+
+def transferir_clases(horarios=None):
     """
     Compara los horarios de diferentes salones y transfiere clases disponibles entre ellos si es posible.
 
+    Args:
+        horarios (HorariosSalones): Los horarios de los salones; se modifican en el lugar. Por omisión,
+            'horarios_salones'. Para conservar el estado anterior, se puede guardar antes 'horarios.copia()'.
+
     Returns:
         list: Una lista de tuplas que contienen información sobre los cambios realizados.
-        list: Una lista de DataFrames que representan los horarios después de los cambios.
 
     La función compara los horarios de diferentes salones y transfiere clases disponibles desde el salón de origen
-    al salón de llegada si la celda correspondiente en el salón de llegada está vacía ("VACIO"). Se realizan varios
-    chequeos para determinar si las clases se pueden transferir, como la disponibilidad de bloques de tres clases seguidas
-    y la verificación de horas libres en el salón de llegada. Los cambios se registran en una lista de tuplas que contiene
-    información sobre los salones involucrados, las filas y columnas afectadas y el valor transferido.
+    al salón de llegada si la celda correspondiente en el salón de llegada está vacía. Se realizan varios chequeos
+    para determinar si las clases se pueden transferir, como la disponibilidad de bloques de tres clases seguidas y la
+    verificación de horas libres en el salón de llegada. Los cambios se registran en una lista de tuplas con los
+    números de los salones involucrados, las filas y la columna afectadas y la clase transferida.
     """
+    horarios = horarios_salones if horarios is None else horarios
     cambios = []  # Lista para registrar los cambios realizados
-    horarios_despues = []  # Lista para almacenar los horarios actualizados
-
-    for salon in list(range(0, 48)):
-        df1 = lista_horarios.obtener_horario(salon)  # Obtener el horario del salón de origen
-        
-        for salon_siguiente in list(range(0, 48))[]:
-            if salon_siguiente > salon and salon != salon_siguiente:
-                df2 = lista_horarios.obtener_horario(salon_siguiente)  # Obtener el horario del salón de llegada
-
-                for j in range(len(df1.columns)):  # Iterar a través de las columnas (días)
-                    for i in range(len(df1)):  # Iterar a través de las filas (horas)
-                        valor_df1 = df1.iloc[i, j]  # Valor en el salón de origen
-                        valor_df2 = df2.iloc[i, j]  # Valor en el salón de llegada
-                        
+
+    for salon in horarios.salones:
+        df1 = horarios.celdas(salon)  # Celdas del salón de origen
+
+        for salon_siguiente in horarios.salones:
+            if salon_siguiente > salon:
+                df2 = horarios.celdas(salon_siguiente)  # Celdas del salón de llegada
+
+                for j in range(df1.shape[1]):  # Iterar a través de las columnas (días)
+                    for i in range(df1.shape[0]):  # Iterar a través de las filas (horas)
+                        valor_df1 = df1[i, j]  # Valor en el salón de origen
+                        valor_df2 = df2[i, j]  # Valor en el salón de llegada
+
                         # Solo si la celda en df2 está vacía y hay datos en df1, se realiza la transferencia
-                        if valor_df2 == "VACIO" and valor_df1 != "VACIO":
+                        if valor_df2 == CODIGO_VACIO and valor_df1 != CODIGO_VACIO:
                             l = i
-                            
+
                             # Tres clases seguidas
-                            if l + 2 < len(df1) and df1.iloc[l + 1, j] == valor_df1 and df1.iloc[l + 2, j] == valor_df1:
-                                
+                            if misma_clase(df1, l + 1, j, valor_df1) and misma_clase(df1, l + 2, j, valor_df1):
+
                                 # Tres horas libres
-                                if l + 2 < len(df2) and df2.iloc[l + 1, j] == valor_df2 and df2.iloc[l + 2, j] == valor_df2:
+                                if misma_clase(df2, l + 1, j, valor_df2) and misma_clase(df2, l + 2, j, valor_df2):
                                     for l in range(l, l + 3):  # l, l+1, l+2
-                                        df2.iloc[l, j] = valor_df1
-                                        df1.iloc[l, j] = "VACIO"
-                                    cambios.append((salon, salon_siguiente, i, l, j, valor_df1))
-                                    i = l
-                                else:
-                                    i = l + 2
-                            
+                                        df2[l, j] = valor_df1
+                                        df1[l, j] = CODIGO_VACIO
+                                    cambios.append((salon, salon_siguiente, i, l, j, horarios.etiqueta(valor_df1)))
+
                             # Dos horas seguidas, se comprueba si la anterior no es una clase seguida
-                            elif l + 1 < len(df1) and df1.iloc[l + 1, j] == valor_df1 and df1.iloc[l - 1, j] != valor_df1:
-                                if l + 1 < len(df2) and df2.iloc[l + 1, j] == valor_df2:
+                            elif misma_clase(df1, l + 1, j, valor_df1) and not misma_clase(df1, l - 1, j, valor_df1):
+                                if misma_clase(df2, l + 1, j, valor_df2):
                                     for l in range(l, l + 2):  # l, l+1
-                                        df2.iloc[l, j] = valor_df1
-                                        df1.iloc[l, j] = "VACIO"
-                                    cambios.append((salon, salon_siguiente, i, l, j, valor_df1))
-                                    i = l
-                                else:
-                                    i = l + 1
-                            else:  # l
-                                if (l + 2 < len(df1) and 
-                                    (df1.iloc[l - 1, j] == valor_df1 or df1.iloc[l + 1, j] == valor_df1) and 
-                                    (df1.iloc[l + 2, j] == valor_df1 or df1.iloc[l - 2, j] == valor_df1)):
-                                    break
-                                elif l + 1 < len(df1) and df1.iloc[l - 1, j] == valor_df1 and df1.iloc[l + 1, j] == valor_df1:
-                                    break
-                                elif l == 10 and df1.iloc[l - 1, j] == valor_df1 and df1.iloc[l - 2, j] == valor_df1:
-                                    break
-                                elif l + 1 < len(df1) and (df1.iloc[l - 1, j] == valor_df1 or df1.iloc[l + 1, j] == valor_df1):
-                                    break
-                                elif l == 10 and df1.iloc[l - 1, j] == valor_df1:
-                                    break
-                                #Una clase y una hora libre
-                                elif df1.iloc[l, j] == valor_df1:
-                                    df2.iloc[l, j] = valor_df1
-                                    df1.iloc[l, j] = "VACIO"
-                                    cambios.append((salon, salon_siguiente, i, l, j, valor_df1))
-                                    i = l
-
-            lista_horarios.agregar_horario(df1)
-
-    # Actualizar la lista de horarios después de los cambios
-    for j in range(0, 48):
-        variable_apoyo = lista_horarios.obtener_horario(j)
-        horarios_despues.append(variable_apoyo)
+                                        df2[l, j] = valor_df1
+                                        df1[l, j] = CODIGO_VACIO
+                                    cambios.append((salon, salon_siguiente, i, l, j, horarios.etiqueta(valor_df1)))
 
-    # Devolver la lista de cambios y la lista de horarios después de los cambios
-    return cambios, horarios_despues
+                            # La hora es parte de un bloque que empezó antes: no se parte el bloque
+                            elif misma_clase(df1, l - 1, j, valor_df1) or misma_clase(df1, l + 1, j, valor_df1):
+                                break
+
+                            # Una clase y una hora libre
+                            else:
+                                df2[l, j] = valor_df1
+                                df1[l, j] = CODIGO_VACIO
+                                cambios.append((salon, salon_siguiente, i, l, j, horarios.etiqueta(valor_df1)))
+
+    return cambios
 
 
-def llenar_lista_enlazada(horario):
+def comparar_y_transferir(horarios=None):
     """
-    Llena una lista enlazada de horarios a partir de un horario dado.
+    Transfiere clases entre salones con 'transferir_clases' y regresa también los horarios resultantes.
 
     Args:
-        horario (DataFrame): Un DataFrame que representa un horario.
+        horarios (HorariosSalones): Los horarios de los salones; se modifican en el lugar. Por omisión,
+            'horarios_salones'.
 
     Returns:
-        list: Una lista de DataFrames que representan horarios antes de realizar modificaciones.
+        list: Una lista de tuplas que contienen información sobre los cambios realizados.
+        list: Una lista de DataFrames que representan los horarios después de los cambios.
+    """
+    horarios = horarios_salones if horarios is None else horarios
+    cambios = transferir_clases(horarios)
+
+    # Devolver la lista de cambios y la lista de horarios después de los cambios
+    return cambios, horarios.horarios()
+
 
-    Esta función toma un horario y, para cada sala en un rango de 16 a 63, filtra el horario original
-    para obtener el horario de esa sala. Luego, llena los valores faltantes con "VACIO" y llama a la función
-    'llenar_horario()' para realizar posibles llenados de clases contiguas. Los horarios antes de cualquier
-    modificación se almacenan en una lista 'horarios_antes' y se agregan a la lista enlazada 'lista_horarios'.
-    Finalmente, se devuelve la lista 'horarios_antes'.
+def llenar_horarios_salones(horario, horarios=None):
     """
-    horarios_antes = []  # Lista para almacenar horarios antes de realizar modificaciones
+    Llena los horarios de los salones a partir de un horario dado.
 
-    for j in range(16, 64):
-        horario_salon = horario[horario["salon"].str.contains(str(j))]  # Filtrar el horario por sala
-        horario_salon = pd.DataFrame(horario_salon)
-        horario_salon = horario_salon.reset_index(drop=True).fillna("VACIO")  # Rellenar valores faltantes con "VACIO"
-        horario_salon = llenar_horario(horario_salon)  # Llenar clases contiguas si es posible
-        horarios_antes.append(horario_salon)  # Agregar el horario antes de modificaciones a la lista
-        lista_horarios.agregar_horario(horario_salon)  # Agregar el horario a la lista enlazada 'lista_horarios'
+    Args:
+        horario (DataFrame): Un DataFrame que representa un horario, como el que regresa 'crear_horario'.
+        horarios (HorariosSalones): Los horarios que se llenan. Por omisión, 'horarios_salones'.
+
+    Returns:
+        list: Una lista de DataFrames que representan los horarios de los salones antes de realizar modificaciones.
+
+    Cada clase se coloca en el salón cuyo número aparece al final del nombre de su salón ("AULA 16" es el salón 16).
+    Los DataFrames que se regresan son copias, así que no cambian cuando después se transfieren clases.
+    """
+    horarios = horarios_salones if horarios is None else horarios
+    horarios.llenar(horario)
 
-    # Devolver la lista de horarios antes de modificaciones
-    return horarios_antes
+    # Devolver los horarios antes de modificaciones
+    return horarios.horarios()
 
 
 def grafica_no_vacios(antes, despues):
@@ -591,9 +604,8 @@ def guardar_cambios(data, nombre_archivo):
         0: "LUNES", 1: "MARTES", 2: "MIÉRCOLES", 3: "JUEVES", 4: "VIERNES", 5: "SÁBADO", 6: "DOMINGO"
     }
 
-    # Modificar las columnas para tener nombres legibles
-    cambios[['Salon_origen', 'Salon_llegada']] = cambios[['Salon_origen', 'Salon_llegada']].apply(lambda x: x + 16)
-    cambios["Dia"].replace(dia_columna, inplace=True)
+    # Modificar las columnas para tener nombres legibles; los salones ya vienen con su número
+    cambios["Dia"] = cambios["Dia"].replace(dia_columna)
 
     # Guardar los cambios en un archivo CSV sin índice
     cambios.to_csv(nombre_archivo, index=False)
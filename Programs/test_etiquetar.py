@@ -0,0 +1,161 @@
+import random
+import unittest
+
+import pandas as pd
+
+from algoritmo_genetico import crear_tabla_vacia, etiquetar_cambios, etiquetar_codigos, calcular_aptitud
+from algoritmo_genetico import calcular_aptitud_poblacion, Codificacion, VACIO, EXCESO, CAMBIO
+
+
+def etiquetar_cambios_referencia(tabla):
+    """
+    Versión original de 'etiquetar_cambios', con un DataFrame de pandas. Se conserva como referencia para comprobar
+    que la versión con listas etiqueta exactamente igual.
+    """
+    valores_repetidos = []  # Almacenar valores repetidos que ya se han etiquetado
+
+    # Crear un DataFrame a partir de la tabla
+    df = pd.DataFrame(tabla)
+
+    # Recorrer cada columna del DataFrame (excepto la primera)
+    for col in df.columns[1:]:
+        celdas_columna = df[col]
+        celdas_unicas = {}  # Diccionario para almacenar celdas únicas y sus ubicaciones
+
+        # Recorrer las celdas de la columna
+        for i, celda in enumerate(celdas_columna):
+            if celda != "VACIO":
+                if celda not in celdas_unicas:
+                    celdas_unicas[celda] = [i]
+                else:
+                    celdas_unicas[celda].append(i)
+
+        # Etiquetar como "EXCESO" si hay 3 o más repeticiones de una clave en la misma columna
+        for celda, indices in celdas_unicas.items():
+            if len(indices) >= 3:
+                for i in indices:
+                    df.at[i, col] = "EXCESO"
+
+        # Etiquetar celdas con múltiples repeticiones como "CAMBIO"
+        for celda, indices in celdas_unicas.items():
+            if len(indices) > 1:
+                # Verificar si la celda se repite en la fila siguiente
+                repeticion_en_fila_siguiente = False
+                for i in range(1, len(indices)):
+                    fila_idx = indices[i]
+                    fila_anterior_idx = indices[i - 1]
+                    if df.at[fila_idx, col] == df.at[fila_anterior_idx + 1, col]:
+                        repeticion_en_fila_siguiente = True
+                        break
+
+                # Mantener una y cambiar las demás a "CAMBIO" solo si no se repite en la fila siguiente
+                if not repeticion_en_fila_siguiente:
+                    for i in range(1, len(indices)):
+                        fila_idx = indices[i]
+                        if celda not in valores_repetidos:
+                            valores_repetidos.append(celda)
+                        df.at[fila_idx, col] = "CAMBIO"
+
+    # Convertir el DataFrame modificado de nuevo a una tabla (lista de listas)
+    return df.values.tolist()
+
+
+def calcular_aptitud_referencia(tabla):
+    """
+    Versión original de 'calcular_aptitud', con 'etiquetar_cambios_referencia'.
+    """
+    tabla = etiquetar_cambios_referencia(tabla)
+    espacios_llenos = 0
+    espacios_vacios = 0
+    for fila in tabla:
+        for celda in fila:
+            if celda == "EXCESO" or celda == "CAMBIO":
+                espacios_vacios += 1
+            if celda != "VACIO":
+                espacios_llenos += 1
+    return 0 if espacios_vacios > 0 else espacios_llenos
+
+
+CLAVES = ["101", "102", "103", "104", "105"]
+
+
+def tabla_con_columnas(columnas):
+    """
+    Crea una tabla con encabezados cuyos días tienen las claves dadas, de arriba hacia abajo. Los días que no se dan
+    quedan vacíos.
+    """
+    tabla = crear_tabla_vacia()
+    for j, columna in enumerate(columnas):
+        for i, celda in enumerate(columna):
+            tabla[i + 1][j + 1] = celda
+    return tabla
+
+
+def tabla_aleatoria(generador, prob_vacio):
+    """
+    Crea una tabla con encabezados y claves al azar.
+    """
+    tabla = crear_tabla_vacia()
+    for fila in tabla[1:]:
+        for j in range(1, len(fila)):
+            if generador.random() >= prob_vacio:
+                fila[j] = generador.choice(CLAVES)
+    return tabla
+
+
+class PruebaEtiquetar(unittest.TestCase):
+    def setUp(self):
+        tabla_vacia = crear_tabla_vacia()
+        self.codificacion = Codificacion(tabla_vacia, CLAVES, CLAVES, {clave: 4 for clave in CLAVES})
+        self.num_horas = len(tabla_vacia) - 1
+
+    def comprobar(self, tabla):
+        """
+        Compara las etiquetas, la aptitud y las etiquetas de la tabla codificada con la versión de referencia.
+        """
+        esperada = etiquetar_cambios_referencia(tabla)
+        self.assertEqual(etiquetar_cambios(tabla), esperada)
+        self.assertEqual(calcular_aptitud(tabla), calcular_aptitud_referencia(tabla))
+
+        codigos = self.codificacion.codificar(tabla)
+        etiquetas = etiquetar_codigos(codigos)
+        nombres = {VACIO: "VACIO", EXCESO: "EXCESO", CAMBIO: "CAMBIO"}
+        obtenida = [[nombres[codigo] if codigo < 0 else self.codificacion.claves[codigo] for codigo in fila]
+                    for fila in etiquetas]
+        self.assertEqual(obtenida, [fila[1:] for fila in esperada[1:]])
+
+        aptitud = calcular_aptitud_poblacion(codigos[None], self.codificacion)[0]
+        self.assertEqual(aptitud, calcular_aptitud_referencia(tabla))
+
+    def test_tabla_vacia(self):
+        self.comprobar(crear_tabla_vacia())
+
+    def test_dos_horas_seguidas(self):
+        self.comprobar(tabla_con_columnas([["101", "101"], ["VACIO", "102", "102"]]))
+
+    def test_dos_horas_separadas(self):
+        self.comprobar(tabla_con_columnas([["101", "VACIO", "101"], ["102"] + ["VACIO"] * 9 + ["102"]]))
+
+    def test_tres_o_mas_horas(self):
+        self.comprobar(tabla_con_columnas([
+            ["101", "101", "101"],
+            ["101", "VACIO", "101", "VACIO", "101"],
+            ["102", "102", "VACIO", "102", "102", "102"],
+            ["103"] * self.num_horas,
+        ]))
+
+    def test_claves_mezcladas(self):
+        self.comprobar(tabla_con_columnas([
+            ["101", "102", "101", "102"],
+            ["101", "101", "102", "VACIO", "102"],
+            ["103", "103", "103", "104", "105", "104"],
+        ]))
+
+    def test_tablas_aleatorias(self):
+        generador = random.Random(0)
+        for _ in range(2000):
+            self.comprobar(tabla_aleatoria(generador, generador.choice([0.0, 0.3, 0.6, 0.9])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import time
+import unittest
+
+import numpy as np
+
+from algoritmo_genetico import crear_tabla_vacia, ejecutar_algoritmo_genetico, Codificacion, CriterioParada
+
+CLAVES = ["101", "102", "103", "104"]
+HORAS = {"101": 4, "102": 3, "103": 5, "104": 2}
+
+
+class PruebaTablaPrevia(unittest.TestCase):
+    def setUp(self):
+        self.codificacion = Codificacion(crear_tabla_vacia(), CLAVES, CLAVES, HORAS)
+        parada = CriterioParada(aptitud_objetivo="maxima")
+        self.tabla_previa, aptitud = ejecutar_algoritmo_genetico(300, self.codificacion, semilla=0, parada=parada)
+        self.assertEqual(aptitud, self.codificacion.aptitud_maxima)
+
+        # Con un choque en cada celda ninguna tabla llega a la aptitud máxima, así que siempre se intenta repetir la
+        # corrida desde cero
+        self.choques = np.ones((len(self.codificacion.claves), self.codificacion.num_horas,
+                                self.codificacion.num_dias), dtype=np.int64)
+
+    def ejecutar(self, parada):
+        inicio = time.perf_counter()
+        ejecutar_algoritmo_genetico(10 ** 6, self.codificacion, tam_poblacion=20, semilla=0, parada=parada,
+                                    tabla_previa=self.tabla_previa, choques=self.choques)
+        return time.perf_counter() - inicio
+
+    def test_sin_tiempo_no_repite(self):
+        parada = CriterioParada(tiempo_limite=0.5, aptitud_objetivo="maxima")
+        duracion = self.ejecutar(parada)
+        self.assertEqual(parada.motivo, "tiempo")
+        self.assertLess(duracion, 0.75)
+        self.assertLess(parada.duracion, 0.75)
+
+    def test_repeticion_dentro_del_tiempo(self):
+        parada = CriterioParada(tiempo_limite=0.5, aptitud_objetivo="maxima", generaciones_estancamiento=10)
+        duracion = self.ejecutar(parada)
+        self.assertTrue(parada.motivo.endswith("(desde cero)"))
+        self.assertLess(duracion, 0.75)
+        self.assertLessEqual(parada.duracion, duracion)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,22 @@
 import tkinter as tk
 from tkinter import font
 from tkinter import filedialog
-import pandas as pd
 from algoritmo_genetico import variables_para_el_algoritmo,seleccionar_carrera,obtener_tres_mejores_tablas
+from algoritmo_genetico import CriterioParada, IndiceCarreras
+from tk_progreso import VentanaProgreso
+from ingesta import leer_materias
+
+# Límites de cada corrida desde la interfaz: se detiene al colocar todas las horas sin conflictos, al pasar el tiempo
+# límite o tras varias generaciones sin mejorar, lo que ocurra primero
+MAX_GENERACIONES = 1000
+TIEMPO_LIMITE = 10
+GENERACIONES_ESTANCAMIENTO = 100
 
 
 def seleccionar_archivo():
     """
     Abre una ventana de selección de archivo para cargar un archivo CSV, y luego llama a la función 'abrir_ventana_carrera' 
-    con el DataFrame cargado.
+    con el índice de carreras del DataFrame cargado.
 
     Args:
     Ninguno.
@@ -19,9 +27,9 @@ def seleccionar_archivo():
     archivo = filedialog.askopenfilename(filetypes=[("Archivos CSV", "*.csv")])
 
     if archivo:
-        # El archivo es un archivo CSV
-        dataframe = pd.read_csv(archivo)
-        abrir_ventana_carrera(archivo=dataframe)
+        # El archivo es un archivo CSV; se lee con el esquema de materias y la caché binaria
+        dataframe = leer_materias(archivo)
+        abrir_ventana_carrera(archivo=IndiceCarreras(dataframe))
 
 
 
@@ -30,7 +38,7 @@ def abrir_ventana_carrera(archivo):
     Abre una ventana secundaria para que el usuario seleccione una carrera de una lista de opciones y confirme su selección.
 
     Args:
-    archivo (DataFrame de Pandas): El DataFrame cargado desde el archivo CSV.
+    archivo (IndiceCarreras): El índice de carreras del DataFrame cargado desde el archivo CSV.
 
     Returns:
     Ninguno.
@@ -44,8 +52,8 @@ def abrir_ventana_carrera(archivo):
     etiqueta = tk.Label(ventana_carrera, text="Selecciona la carrera:")
     etiqueta.pack(pady=10)
 
-    # Opciones de carrera como cadenas de texto
-    opciones_carrera = ["IG", "IC", "IA", "ICC", "IMM", "ISCH", "IST", "ITP", "IF", "IM"]
+    # Opciones de carrera como cadenas de texto, según los planes de estudio
+    opciones_carrera = archivo.carreras()
 
     var_carrera = tk.StringVar()
     var_carrera.set(opciones_carrera[0])  # Valor predeterminado
@@ -67,7 +75,7 @@ def mostrar_menu_semestre(carrera,archivo):
 
     Args:
     carrera (str): La carrera seleccionada por el usuario.
-    archivo (DataFrame de Pandas): El DataFrame cargado desde el archivo CSV.
+    archivo (IndiceCarreras): El índice de carreras del DataFrame cargado desde el archivo CSV.
 
     Returns:
     Ninguno.
@@ -80,37 +88,7 @@ def mostrar_menu_semestre(carrera,archivo):
     etiqueta.pack(pady=10)
 
     # Definir las opciones de semestre según la carrera seleccionada
-
-    if carrera == "IG":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre","Noveno Semestre"]
-    elif carrera == "IC":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre V1","Noveno Semestre V2"]
-    elif carrera == "IST":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
-    elif carrera == "IA":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
-    elif carrera == "ICC":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
-    elif carrera == "IMM":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
-    elif carrera == "ISCH":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre Topicos", "Noveno Semestre Ciencias"]
-    elif carrera == "ITP":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
-    elif carrera == "IF":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
-    elif carrera == "IM":
-        opciones_semestre = ["Primer Semestre", "Segundo Semestre", "Tercer Semestre", "Cuarto Semestre", "Quinto Semestre", "Sexto Semestre", 
-                             "Séptimo Semestre", "Octavo Semestre", "Noveno Semestre"]
+    opciones_semestre = archivo.semestres(carrera)
 
     var_semestre = tk.StringVar()
     var_semestre.set(opciones_semestre[0])  # Valor predeterminado
@@ -124,16 +102,44 @@ def mostrar_menu_semestre(carrera,archivo):
                                 command=lambda: ejecutar_algoritmo(carrera, opciones_semestre.index(var_semestre.get()) + 1,archivo))
     boton_confirmar.pack(pady=20)
 
+    # Botón para reprogramar el semestre a partir de tablas guardadas antes con 'guardar_tabla_csv'
+    boton_previo = tk.Button(ventana_semestre, text="Reprogramar desde tabla guardada",
+                             command=lambda: reprogramar_desde_csv(carrera, opciones_semestre.index(var_semestre.get()) + 1, archivo))
+    boton_previo.pack(pady=10)
+
+
+def reprogramar_desde_csv(carrera, numero_semestre, archivo):
+    """
+    Pide un archivo CSV guardado con 'guardar_tabla_csv' y vuelve a ejecutar el algoritmo genético a partir de esa tabla,
+    moviendo solo las celdas afectadas por los cambios en las materias del semestre.
+
+    Args:
+    carrera (str): La carrera seleccionada por el usuario.
+    numero_semestre (int): El número del semestre seleccionado por el usuario.
+    archivo (IndiceCarreras): El índice de carreras del DataFrame cargado desde el archivo CSV.
+
+    Returns:
+    Ninguno.
+    """
+    tabla_previa = filedialog.askopenfilename(filetypes=[("Archivos CSV", "*.csv")])
+
+    if tabla_previa:
+        ejecutar_algoritmo(carrera, numero_semestre, archivo, tabla_previa)
+
 
 
-def ejecutar_algoritmo(carrera, numero_semestre, archivo):
+def ejecutar_algoritmo(carrera, numero_semestre, archivo, tabla_previa=None):
     """
     Abre un archivo CSV, selecciona una carrera y un semestre, ejecuta el algoritmo genético en función de los datos del semestre seleccionado y muestra los resultados en una ventana.
 
+    El algoritmo se ejecuta en un hilo aparte para que la interfaz no se congele; mientras tanto se muestra una ventana con el progreso,
+    la mejor aptitud encontrada y un botón para cancelar. Si se cancela, se muestran las mejores tablas encontradas hasta ese momento.
+
     Args:
     carrera (str): La carrera seleccionada por el usuario.
     numero_semestre (int): El número del semestre seleccionado por el usuario.
-    archivo (DataFrame de Pandas): El DataFrame cargado desde el archivo CSV.
+    archivo (IndiceCarreras): El índice de carreras del DataFrame cargado desde el archivo CSV.
+    tabla_previa (str): La ruta de un archivo CSV guardado con 'guardar_tabla_csv' del que parte el algoritmo, o None.
 
     Returns:
     Ninguno.
@@ -143,9 +149,39 @@ def ejecutar_algoritmo(carrera, numero_semestre, archivo):
     semestre = seleccionar_carrera(carrera, numero_semestre, archivo)
     tabla_vacia, claves, claves_disponibles, horas_por_clave = variables_para_el_algoritmo(semestre)
 
-    # Ejecutar el algoritmo genético para obtener tres mejores tablas
-    resultado = obtener_tres_mejores_tablas(50, tabla_vacia, claves, claves_disponibles, horas_por_clave)
+    # Ejecutar el algoritmo genético en un hilo aparte para obtener tres mejores tablas
+    parada = CriterioParada(tiempo_limite=TIEMPO_LIMITE, aptitud_objetivo="maxima",
+                            generaciones_estancamiento=GENERACIONES_ESTANCAMIENTO)
+
+    def trabajo():
+        return obtener_tres_mejores_tablas(MAX_GENERACIONES, tabla_vacia, claves, claves_disponibles,
+                                           horas_por_clave, parada=parada, tabla_previa=tabla_previa)
+
+    def estado():
+        if parada.mejor_aptitud is None:
+            return "Creando la población inicial..."
+        return f"Generación {parada.generaciones}: mejor aptitud {parada.mejor_aptitud} de {parada.objetivo}"
+
+    VentanaProgreso(ventana_principal, "Ejecutando el Algoritmo Genético", trabajo,
+                    lambda resultado: mostrar_resultado(carrera, numero_semestre, archivo, resultado, parada),
+                    progreso=lambda: parada.progreso(MAX_GENERACIONES), estado=estado, cancelar=parada.cancelar)
 
+
+def mostrar_resultado(carrera, numero_semestre, archivo, resultado, parada):
+    """
+    Muestra en una ventana las tablas obtenidas por el algoritmo genético, con botones para volver a correrlo, cambiar de semestre o
+    de carrera y guardar el resultado.
+
+    Args:
+    carrera (str): La carrera seleccionada por el usuario.
+    numero_semestre (int): El número del semestre seleccionado por el usuario.
+    archivo (IndiceCarreras): El índice de carreras del DataFrame cargado desde el archivo CSV.
+    resultado (DataFrame de Pandas): Las tablas que regresa 'obtener_tres_mejores_tablas'.
+    parada (CriterioParada): El criterio de parada de la corrida, para mostrar por qué se detuvo.
+
+    Returns:
+    Ninguno.
+    """
     # Crear una ventana para mostrar el resultado
     ventana_resultado = tk.Toplevel(ventana_principal)
     ventana_resultado.title("Resultado del Algoritmo Genético")
@@ -163,6 +199,11 @@ def ejecutar_algoritmo(carrera, numero_semestre, archivo):
     # Mostrar la tabla resultado en el Text widget
     texto_resultado.insert(tk.END, tabla_resultado.to_string(index=False))
 
+    # Mostrar por qué se detuvo el algoritmo
+    etiqueta_parada = tk.Label(ventana_resultado, text=f"Criterio de parada: {parada.motivo} "
+                                                       f"({parada.generaciones} generaciones, {parada.duracion:.1f} s)")
+    etiqueta_parada.pack()
+
     # Botón para volver a correr el programa
     boton_volver_a_correr = tk.Button(ventana_resultado, text="Volver a Correr",
                                       command=lambda: ejecutar_algoritmo(carrera, numero_semestre, archivo))
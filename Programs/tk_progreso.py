@@ -0,0 +1,96 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+
+
+class VentanaProgreso:
+    def __init__(self, padre, titulo, trabajo, al_terminar, progreso=None, estado=None, cancelar=None,
+                 intervalo=100):
+        """
+        Constructor de la clase VentanaProgreso.
+
+        Ejecuta 'trabajo' en un hilo aparte para que la interfaz no se congele, y muestra una ventana con una barra de
+        progreso, un texto de estado y un botón para cancelar. Tk solo se puede usar desde el hilo principal, así que
+        el hilo no toca la interfaz: la ventana consulta 'progreso' y 'estado' cada 'intervalo' milisegundos y, cuando
+        el hilo termina, se cierra y llama a 'al_terminar' desde el hilo principal.
+
+        Args:
+            padre (tk.Tk o tk.Toplevel): La ventana a la que pertenece la ventana de progreso.
+            titulo (str): El título de la ventana de progreso.
+            trabajo (callable): La función que se ejecuta en el hilo, sin argumentos. Su resultado se pasa a
+                'al_terminar'.
+            al_terminar (callable): La función que recibe el resultado de 'trabajo'. Si 'trabajo' lanza una excepción,
+                no se llama y se muestra el error.
+            progreso (callable): Regresa la fracción completada, entre 0 y 1. Si es None, la barra solo indica que el
+                trabajo sigue en curso.
+            estado (callable): Regresa el texto que se muestra sobre la barra, por ejemplo la mejor aptitud.
+            cancelar (callable): Pide al trabajo que se detenga. Si es None, el botón "Cancelar" está deshabilitado.
+            intervalo (int): Milisegundos entre cada actualización de la ventana.
+        """
+        self.trabajo = trabajo
+        self.al_terminar = al_terminar
+        self.progreso = progreso
+        self.estado = estado
+        self.funcion_cancelar = cancelar
+        self.intervalo = intervalo
+        self.resultado = None
+        self.error = None
+
+        self.ventana = tk.Toplevel(padre)
+        self.ventana.title(titulo)
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cancelar)
+
+        self.etiqueta = tk.Label(self.ventana, text="Procesando...")
+        self.etiqueta.pack(padx=20, pady=10)
+
+        modo = "determinate" if progreso is not None else "indeterminate"
+        self.barra = ttk.Progressbar(self.ventana, length=300, maximum=1.0, mode=modo)
+        self.barra.pack(padx=20, pady=10)
+
+        estado_boton = tk.NORMAL if cancelar is not None else tk.DISABLED
+        self.boton_cancelar = tk.Button(self.ventana, text="Cancelar", command=self.cancelar, state=estado_boton)
+        self.boton_cancelar.pack(pady=10)
+
+        if progreso is None:
+            self.barra.start()
+
+        self.hilo = threading.Thread(target=self._ejecutar, daemon=True)
+        self.hilo.start()
+        self.ventana.after(self.intervalo, self._revisar)
+
+    def _ejecutar(self):
+        """
+        Ejecuta el trabajo en el hilo aparte y guarda su resultado o su error.
+        """
+        try:
+            self.resultado = self.trabajo()
+        except Exception as error:
+            self.error = error
+
+    def cancelar(self):
+        """
+        Pide al trabajo que se detenga. La ventana se cierra cuando el hilo termina.
+        """
+        if self.funcion_cancelar is not None:
+            self.funcion_cancelar()
+            self.boton_cancelar.config(text="Cancelando...", state=tk.DISABLED)
+
+    def _revisar(self):
+        """
+        Actualiza la barra y el estado; si el hilo ya terminó, cierra la ventana y entrega el resultado.
+        """
+        if self.progreso is not None:
+            self.barra["value"] = self.progreso()
+        if self.estado is not None:
+            self.etiqueta.config(text=self.estado())
+
+        if self.hilo.is_alive():
+            self.ventana.after(self.intervalo, self._revisar)
+            return
+
+        self.ventana.destroy()
+        if self.error is not None:
+            messagebox.showerror("Error", str(self.error))
+        else:
+            self.al_terminar(self.resultado)
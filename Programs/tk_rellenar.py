@@ -1,3 +1,4 @@
+import threading
 import tkinter as tk
 from tkinter import filedialog
 import pandas as pd
@@ -5,32 +6,81 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 
-from rellenar import crear_horario, llenar_lista_enlazada, contar_vacios_en_tablas, guardar_cambios, bloques
-from rellenar import contar_vacios_en_bloques, comparar_y_transferir, grafica_no_vacios, grafica_vacios
+from rellenar import crear_horario, horarios_salones, contar_vacios_en_tablas, guardar_cambios, bloques
+from rellenar import contar_vacios_en_bloques, transferir_clases, grafica_no_vacios, grafica_vacios
+from tk_progreso import VentanaProgreso
+
+# Número de pasos de 'procesar_horarios', para la barra de progreso
+PASOS_PROCESO = 7
 
 
 def seleccionar_archivo():
     """
     Abre una ventana de selección de archivo y realiza operaciones en función del archivo seleccionado.
 
-    Esta función abre una ventana de selección de archivo que permite al usuario elegir un archivo CSV. Una vez seleccionado el archivo, se realizan las siguientes operaciones:
-    - Se llama a la función crear_horario() para crear un horario a partir del archivo CSV.
-    - Se llama a la función llenar_lista_enlazada() para llenar una lista enlazada con el horario.
-    - Se llama a la función actualizar_graficas() para actualizar las gráficas con el nuevo horario.
-
-    Nota: Esta función asume que existen las funciones crear_horario(), llenar_lista_enlazada() y actualizar_graficas() definidas en otro lugar del código.
+    Esta función abre una ventana de selección de archivo que permite al usuario elegir un archivo CSV. Una vez seleccionado el archivo,
+    se llama a la función procesar_horarios() en un hilo aparte, para que la interfaz no se congele, mientras una ventana muestra el
+    avance y permite cancelar. Al terminar se llama a la función actualizar_graficas() con los resultados.
     """
     archivo = filedialog.askopenfilename(filetypes=[("Archivos CSV", "*.csv")])
 
     if archivo:
-        # Llamar a la función crear_horario() con el nombre del archivo
-        horario, maestros, grupos, materias = crear_horario(archivo)
-        
-        # Llamar a la función llenar_lista_enlazada() con el horario
-        ayuda = llenar_lista_enlazada(horario)
-        
-        # Llamar a la función actualizar_graficas() con la ayuda
-        actualizar_graficas(ayuda)
+        avance = {"paso": 0, "descripcion": "Leyendo el archivo..."}
+        cancelado = threading.Event()
+
+        def al_terminar(resultados):
+            if resultados is not None:
+                actualizar_graficas(resultados)
+
+        VentanaProgreso(root, "Procesando Horarios", lambda: procesar_horarios(archivo, avance, cancelado), al_terminar,
+                        progreso=lambda: avance["paso"] / PASOS_PROCESO, estado=lambda: avance["descripcion"],
+                        cancelar=cancelado.set)
+
+
+def procesar_horarios(archivo, avance, cancelado):
+    """
+    Crea los horarios de los salones a partir del archivo CSV, transfiere las clases entre salones y cuenta las horas vacías antes y
+    después del cambio. Se ejecuta en un hilo aparte y no toca la interfaz.
+
+    El estado antes del cambio se guarda con 'horarios_salones.copia()' y las horas se cuentan en los arreglos de ocupación, así que
+    no se crea un DataFrame por salón.
+
+    Args:
+    - archivo (str): La ruta del archivo CSV.
+    - avance (dict): Se actualiza con el número de pasos terminados ("paso") y el paso actual ("descripcion").
+    - cancelado (threading.Event): Si se activa, el proceso se detiene antes del siguiente paso.
+
+    Returns:
+    - resultados (dict): Los datos para las gráficas y la lista de cambios, o None si se canceló.
+    """
+    resultados = {}
+
+    def llenar_salones():
+        horarios_salones.llenar(resultados["horario"])
+        resultados["antes"] = horarios_salones.copia()
+
+    pasos = [
+        ("Leyendo el archivo...", lambda: resultados.update(horario=crear_horario(archivo)[0])),
+        ("Llenando los horarios de los salones...", llenar_salones),
+        ("Contando horas vacías...",
+         lambda: resultados.update(horarios_antes_del_cambio=contar_vacios_en_tablas(resultados["antes"]))),
+        ("Contando horas libres en bloques...",
+         lambda: resultados.update(bloques_antes=contar_vacios_en_bloques(resultados["antes"]))),
+        ("Transfiriendo clases entre salones...", lambda: resultados.update(cam=transferir_clases())),
+        ("Contando horas vacías después del cambio...",
+         lambda: resultados.update(horarios_despues_del_cambio=contar_vacios_en_tablas(horarios_salones))),
+        ("Contando horas libres en bloques después del cambio...",
+         lambda: resultados.update(bloques_despues=contar_vacios_en_bloques())),
+    ]
+
+    for numero, (descripcion, paso) in enumerate(pasos):
+        if cancelado.is_set():
+            return None
+        avance["descripcion"] = descripcion
+        paso()
+        avance["paso"] = numero + 1
+
+    return resultados
 
 
 def salir():
@@ -92,21 +142,21 @@ def mostrar_grafica_bloques(bloques_antes, bloques_despues):
     """
     bloques(bloques_antes, bloques_despues)
 
-def actualizar_graficas(ayuda):
+def actualizar_graficas(resultados):
     """
     Actualiza las gráficas en ventanas separadas después de realizar una comparación y transferencia de horarios.
 
     Esta función toma como entrada el resultado de la comparación y transferencia de horarios y crea una ventana separada para mostrar las gráficas antes y después del cambio, así como un botón para guardar los cambios en un archivo CSV.
 
     Args:
-    - ayuda (list): Resultado de la comparación y transferencia de horarios.
-    """
-    # Contar horas vacías en tablas antes y después del cambio
-    horarios_antes_del_cambio = contar_vacios_en_tablas(ayuda)
-    bloques_antes = contar_vacios_en_bloques()
-    cam,horarios_despues = comparar_y_transferir()
-    horarios_despues_del_cambio = contar_vacios_en_tablas(horarios_despues)
-    bloques_despues = contar_vacios_en_bloques()
+    - resultados (dict): Resultado de la comparación y transferencia de horarios, calculado por procesar_horarios().
+    """
+    # Horas vacías en tablas antes y después del cambio
+    horarios_antes_del_cambio = resultados["horarios_antes_del_cambio"]
+    bloques_antes = resultados["bloques_antes"]
+    cam = resultados["cam"]
+    horarios_despues_del_cambio = resultados["horarios_despues_del_cambio"]
+    bloques_despues = resultados["bloques_despues"]
 
     # Crear una nueva ventana para mostrar las gráficas
     ventana_graficas = tk.Toplevel(root)